@@ -0,0 +1,353 @@
+from cachesimulator.cache import Cache, get_stored_address
+from cachesimulator import MSI
+from array import array
+import numpy as np
+
+import cachesimulator.Logger
+import logging
+
+logger = logging.getLogger('cachesimulator.Logger')
+
+class ArrayCache(Cache):
+    """Cache which keeps the tag, state, valid and dirty bit of its lines in dense
+        typed arrays rather than Line objects. It behaves exactly like Cache, the
+        lines are only turned into objects when cachelines is asked for.
+    """
+
+    def __init__(self, id, directory=None, config=None, statistic=None, optimizer=None):
+        super().__init__(id, directory=directory, config=config, statistic=statistic, optimizer=optimizer)
+        self._TAG_SHIFT = self._INDEX_BITS + self._OFFSET_BITS
+        self._INDEX_MASK = (1 << self._INDEX_BITS) - 1
+
+    def _initialise_lines(self):
+        self._tags = array('q', [-1]) * self._CACHE_SIZE
+        self._states = array('b', [MSI.INVALID]) * self._CACHE_SIZE
+        self._valid = array('B', [False]) * self._CACHE_SIZE
+        self._dirty = array('B', [False]) * self._CACHE_SIZE
+
+    def _address_parameters(self, address):
+        """Gets the tag and index of the address without going through numpy
+
+        Args:
+            address (int): Address of the word
+
+        Returns:
+            tag (int): The tag
+            index (int): The index
+        """
+        return address >> self._TAG_SHIFT, (address >> self._OFFSET_BITS) & self._INDEX_MASK
+
+    # -- Line operations -- #
+    def _fill_shared(self, index, tag):
+        """Same as Line.read"""
+        self._tags[index] = tag
+        self._states[index] = MSI.SHARED
+        self._valid[index] = True
+        self._dirty[index] = False
+        self.statistic.cache_access()
+
+    def _fill_modified(self, index, tag):
+        """Same as Line.write"""
+        self._tags[index] = tag
+        self._dirty[index] = True
+        self._valid[index] = True
+        self._states[index] = MSI.MODIFIED
+        self.statistic.cache_access()
+
+    def _set_state(self, index, state):
+        """Same as Line.set_state"""
+        self._states[index] = state
+        self.statistic.cache_probe()
+
+    # -- Writes -- #
+    def write(self, address, tag=None, index=None):
+        """Perfroms a write operation to the cache
+
+        Args:
+            address (int): Address of the word
+            tag (int): Tag of the address, computed from the address if not given
+            index (int): Index of the address, computed from the address if not given
+
+        Returns:
+            hit (bool): True if there is a write hit, else false
+        """
+        if (tag is None):
+            tag, index = self._address_parameters(address)
+        line_tag = self._tags[index]
+        valid = self._valid[index]
+        state = self._states[index]
+
+        self.statistic.cache_probe() # checking tag and state
+        if (tag == line_tag and valid):
+            if (state == MSI.SHARED):
+                # we need to tell directory to send invalidates for this address
+                self._write_miss(index, tag, address, False)
+                return False
+            elif(state == MSI.INVALID):
+                self.statistic.coherence_miss()
+                self._write_miss(index, tag, address, True)
+                return False
+            elif(state == MSI.MODIFIED):
+                self._write_hit(index, tag, address)
+                return True
+            elif(self.optimizer.OPTIMIZE and state==MSI.EXCLUSIVE):
+                self._write_hit(index, tag, address)
+                return True
+        else:
+            # block not in cache so get block from directory,
+            if (not valid):
+                self.statistic.compulsory_miss()
+
+            if (state == MSI.MODIFIED):
+                self.statistic.replacement_writeback()
+
+            if (valid):
+                stored_address = get_stored_address(line_tag, index, self._INDEX_BITS, self._OFFSET_BITS)
+            else:
+                stored_address = None
+            self._write_miss(index, tag, address, True, stored_address=stored_address)
+            return False
+
+    def _write_miss(self, index, tag, address, need_data, stored_address=None):
+        """This is when a write happens but the state of the line is Invalid
+
+        Args:
+            index (int): The index of the cacheline
+            tag  (int): The value of the tag
+            address (int): Address of the new word
+            need_data (bool): Flag that determines whether the cache needs the data
+            stored_address (int): The address that is stored in the cache currently but is about to be overwritten
+                it is none if the tags match.
+        """
+        self.pending_address = address
+        self.statistic.directory_request()
+        self.directory.write_miss(self, address, need_data, stored_address)
+        self.statistic.cache_probe()
+        self._fill_modified(index, tag)
+
+    def _write_hit(self, index, tag, address):
+        """This is when a write happens and the state of the line is Modified
+
+        Args:
+            index (int): The index of the cacheline
+            tag  (int): The value of the tag
+            address (int): Address of the word
+        """
+        self._fill_modified(index, tag)
+        self.statistic.private_access()
+
+    # -- Reads -- #
+    def read(self, address, tag=None, index=None):
+        """Perfroms a read operation to the cache, if there is no hit then
+            it asks the directory for the information
+
+        Args:
+            address (int): Address of the word
+            tag (int): Tag of the address, computed from the address if not given
+            index (int): Index of the address, computed from the address if not given
+
+        Returns:
+            hit (bool): True if there is a cache hit, else false
+        """
+        if (tag is None):
+            tag, index = self._address_parameters(address)
+        line_tag = self._tags[index]
+        valid = self._valid[index]
+
+        self.statistic.cache_probe()
+        if (tag == line_tag and valid):
+            if (self._states[index] == MSI.INVALID):
+                self.statistic.coherence_miss()
+                self._read_miss(index, tag, address)
+                return False
+            else:
+                self._read_hit(index, tag, address)
+                return True
+        else:
+            # it is either compulsory or conflict
+            if (not valid):
+                self.statistic.compulsory_miss()
+            else:
+                self.statistic.conflic_miss()
+
+            if (self._states[index] == MSI.MODIFIED):
+                self.statistic.replacement_writeback()
+
+            # for optimization
+            if (valid):
+                stored_address = get_stored_address(line_tag, index, self._INDEX_BITS, self._OFFSET_BITS)
+            else:
+                stored_address = None
+            self._read_miss(index, tag, address, stored_address=stored_address)
+            return False
+
+    def _read_miss(self, index, tag, address, stored_address=None):
+        """This is when a read happens when there is a read miss eithee because the
+            state is invalid or tag miss
+
+        Args:
+            index (int): The index of the cacheline
+            tag  (int): The value of the tag
+            address (int): Address of the word
+        """
+        self.statistic.directory_request()
+        num_sharers = self.directory.read_miss(self, address, stored_address)
+        # set cache state
+        if (self.optimizer.OPTIMIZE and num_sharers==0):
+            self._fill_shared(index, tag)
+            self._set_state(index, MSI.EXCLUSIVE)
+        else:
+            self._set_state(index, MSI.SHARED)
+            self._fill_shared(index, tag)
+
+    def _read_hit(self, index, tag, address):
+        """This is when a read happens and the state of either Shared or Modified
+
+        Args:
+            index (int): The index of the cacheline
+            tag  (int): The value of the tag
+            address (int): Address of the word
+        """
+        self.statistic.cache_access()
+        self.statistic.private_access()
+
+    # -- Remote Operations -- #
+    def remote_read_miss(self, address):
+        """Another cache has issued a read miss. Thus we need to set the state to shared if
+            we are in modified state. Perfroms cache probe and coherence writeback if line is
+            in state M.
+
+        Args:
+            address (int): Address of the word
+        """
+        tag, index = self._address_parameters(address)
+
+        if (tag == self._tags[index] and self._valid[index]):
+            state = self._states[index]
+            if (state == MSI.MODIFIED):
+                self._states[index] = MSI.SHARED
+                self.statistic.coherence_writeback()
+            elif(state == MSI.EXCLUSIVE and self.optimizer.OPTIMIZE):
+                self._states[index] = MSI.SHARED
+
+    def send_line(self, cache, address):
+        """Sends the data of the line to the desired cache. We don't actaully
+            send data so this method is a placeholder.
+
+        Args:
+            cache (Cache): Cache to send data to
+            address (int): Address of the word
+        """
+
+    def alert_last_sharer(self, address, cache):
+        """This method is called when this cache is the last sharer for an address
+
+        Args:
+            int: Address of the word
+            Cache: cache that has just been removed as a sharer
+        """
+        if (self.optimizer.OPTIMIZE):
+            tag, index = self._address_parameters(address)
+            if (self._tags[index] == tag and self._valid[index]):
+                # change state to exlusive since it is last sharer but dont probe as this will overlap
+                self._states[index] = MSI.EXCLUSIVE
+
+    # -- Invalidations -- #
+    def invalidate_line(self, address, cache):
+        """Invalidates the cache line. Probes the cache
+
+        Args:
+            address (int): Address of the word
+            cache (Cache): The cache that asked for invalidation
+        """
+        tag, index = self._address_parameters(address)
+        if (tag == self._tags[index] and self._valid[index]):
+            self._states[index] = MSI.INVALID
+            cache.confirm_invalidation(address)
+
+    def contains_address(self, address):
+        """Checks if the given address is valid within the cache
+
+        Args:
+            address (int): Address of the word
+
+        Returns:
+            bool: True if the address is valid in the cache
+        """
+        tag, index = self._address_parameters(address)
+        return (self._tags[index] == tag and self._valid[index] and self._states[index] != MSI.INVALID)
+
+    # -- Cache contents -- #
+    def cache_contents(self):
+        contents = ""
+        for idx in np.flatnonzero(self.valid).tolist():
+            contents += str(LineView(self, idx))
+            contents += "\n"
+        contents += "Other lines are invalid"
+        return contents
+
+    @property
+    def cachelines(self):
+        return [LineView(self, idx) for idx in range(self._CACHE_SIZE)]
+
+    @property
+    def tags(self):
+        return np.frombuffer(self._tags, dtype=np.int64)
+
+    @property
+    def states(self):
+        return np.frombuffer(self._states, dtype=np.int8)
+
+    @property
+    def valid(self):
+        return np.frombuffer(self._valid, dtype=np.bool_)
+
+    @property
+    def dirty(self):
+        return np.frombuffer(self._dirty, dtype=np.bool_)
+
+
+class LineView():
+    """A cacheline of an ArrayCache, reads and writes go straight to the arrays
+    """
+
+    def __init__(self, cache, idx):
+        self._cache = cache
+        self.idx = idx
+
+    def __repr__(self):
+        string = f"Cachline {self.idx}: State ({self.state}), Tag ({self.tag}), Valid ({self.valid}), dirty ({self.dirty}) "
+        return string
+
+    # -- Setters and Getters --
+    @property
+    def state(self):
+        return self._cache._states[self.idx]
+
+    @state.setter
+    def state(self, val):
+        self._cache._states[self.idx] = val
+
+    @property
+    def tag(self):
+        return self._cache._tags[self.idx]
+
+    @tag.setter
+    def tag(self, val):
+        self._cache._tags[self.idx] = val
+
+    @property
+    def dirty(self):
+        return bool(self._cache._dirty[self.idx])
+
+    @dirty.setter
+    def dirty(self, val):
+        self._cache._dirty[self.idx] = val
+
+    @property
+    def valid(self):
+        return bool(self._cache._valid[self.idx])
+
+    @valid.setter
+    def valid(self, val):
+        self._cache._valid[self.idx] = val
@@ -0,0 +1,211 @@
+from cachesimulator.workloads import WORKLOADS, stream_workload, write_text, write_binary
+from cachesimulator.binary_trace import stream_binary, BINARY_EXTENSION
+from cachesimulator.config import SimulatorConfig
+from cachesimulator.simulator import create_system, run_trace, simulate
+from cachesimulator.trace_parser import parse
+from itertools import product
+import platform
+import tempfile
+import json
+import time
+import os
+import sys
+import logging
+
+logger = logging.getLogger('cachesimulator.Logger')
+
+# the grid of a benchmark, every workload is timed on every system
+BENCHMARK_GRID = {
+    'workload': list(WORKLOADS),
+    'accesses': [10 ** 5],
+    'number_of_caches': [2, 4, 8],
+    'optimize': [False, True],
+}
+# parameters which identify a benchmark point across runs
+POINT_PARAMETERS = ['workload', 'accesses', 'number_of_caches', 'optimize']
+# phases timed at each point
+PHASES = ['parse', 'simulate', 'end_to_end']
+# percentage a phase may be slower than the baseline before it is a regression
+THRESHOLD = 10.0
+
+
+def time_point(point, trace_directory, seed=0):
+    """Times the phases of a benchmark point on a generated workload. The workload is
+        written as a text and binary trace so no phase holds it in memory:
+        parse decodes the text trace, simulate runs the binary trace through the
+        caches and end_to_end simulates the text trace.
+
+    Args:
+        point (dict): workload, accesses, number_of_caches and optimize
+        trace_directory (string): where the traces are written
+        seed (int): seed of the workload
+
+    Returns:
+        dict: The point followed by the seconds and accesses per second of each phase
+    """
+    config = SimulatorConfig(number_of_caches=point['number_of_caches'])
+    accesses = point['accesses']
+    name = '{}_{}_{}'.format(point['workload'], accesses, point['number_of_caches'])
+    text_path = os.path.join(trace_directory, name + '.txt')
+    binary_path = os.path.join(trace_directory, name + BINARY_EXTENSION)
+    write_text(stream_workload(point['workload'], accesses, config, seed), text_path)
+    write_binary(stream_workload(point['workload'], accesses, config, seed), binary_path, accesses)
+
+    seconds = {}
+    start = time.perf_counter()
+    for entry in parse(text_path, stream=True):
+        pass
+    seconds['parse'] = time.perf_counter() - start
+
+    directory, caches = create_system(config, point['optimize'])
+    start = time.perf_counter()
+    run_trace(stream_binary(binary_path), caches)
+    seconds['simulate'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    simulate(text_path, point['optimize'], config=config)
+    seconds['end_to_end'] = time.perf_counter() - start
+
+    os.remove(text_path)
+    os.remove(binary_path)
+    row = dict(point)
+    for phase in PHASES:
+        row[phase + '_seconds'] = seconds[phase]
+        row[phase + '_accesses_per_second'] = accesses / seconds[phase] if (seconds[phase] != 0) else 0
+    return row
+
+
+def run_benchmark(grid=None, seed=0):
+    """Times every point of the grid
+
+    Args:
+        grid (dict): parameter -> list of values of POINT_PARAMETERS, missing
+            parameters take the values of BENCHMARK_GRID
+        seed (int): seed of the workloads
+
+    Returns:
+        dict: The run, when and where it ran and a row for each point
+    """
+    grid = dict(BENCHMARK_GRID, **(grid or {}))
+    for name in grid:
+        if (name not in POINT_PARAMETERS):
+            raise Exception('Unknown benchmark parameter {}, expected one of ({})'.format(name, ', '.join(POINT_PARAMETERS)))
+    points = [dict(zip(POINT_PARAMETERS, values)) for values in product(*(grid[name] for name in POINT_PARAMETERS))]
+    with tempfile.TemporaryDirectory() as trace_directory:
+        rows = [time_point(point, trace_directory, seed) for point in points]
+    return {
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': rows,
+    }
+
+
+def load_history(file_path):
+    """Loads the history of benchmark runs
+
+    Args:
+        file_path (string): Path of the json history
+
+    Returns:
+        dict: The baseline run, None if there is none, and every run in order
+    """
+    if (not os.path.exists(file_path)):
+        return {'baseline': None, 'runs': []}
+    with open(file_path) as f:
+        return json.load(f)
+
+
+def save_history(history, file_path):
+    with open(file_path, 'w') as f:
+        json.dump(history, f, indent=2)
+
+
+def _point_key(row):
+    return tuple(row[name] for name in POINT_PARAMETERS)
+
+
+def find_regressions(run, baseline, threshold=THRESHOLD):
+    """Compares the phases of a run with the same points of the baseline
+
+    Args:
+        run (dict): The run
+        baseline (dict): The baseline run
+        threshold (float): percentage a phase may be slower than the baseline
+
+    Returns:
+        list(dict): The point, phase, baseline and run seconds and the percentage
+            slower of each phase beyond the threshold
+    """
+    baseline_rows = {_point_key(row): row for row in baseline['results']}
+    regressions = []
+    for row in run['results']:
+        baseline_row = baseline_rows.get(_point_key(row))
+        if (baseline_row is None):
+            continue
+        for phase in PHASES:
+            expected = baseline_row[phase + '_seconds']
+            actual = row[phase + '_seconds']
+            if (expected > 0 and actual > expected * (1 + threshold / 100)):
+                regression = {name: row[name] for name in POINT_PARAMETERS}
+                regression.update({'phase': phase, 'baseline_seconds': expected, 'seconds': actual,
+                                   'slower': (actual / expected - 1) * 100})
+                regressions.append(regression)
+    return regressions
+
+
+def record_run(run, file_path, threshold=THRESHOLD, rebaseline=False):
+    """Adds the run to the history and compares it with the baseline, the first
+        run of a history is its baseline
+
+    Args:
+        run (dict): The run
+        file_path (string): Path of the json history
+        threshold (float): percentage a phase may be slower than the baseline
+        rebaseline (bool): Make the run the new baseline
+
+    Returns:
+        list(dict): The regressions of the run, see find_regressions
+    """
+    history = load_history(file_path)
+    regressions = []
+    if (history['baseline'] is None or rebaseline):
+        history['baseline'] = run
+    else:
+        regressions = find_regressions(run, history['baseline'], threshold)
+    history['runs'].append(run)
+    save_history(history, file_path)
+    return regressions
+
+
+def format_run(run):
+    """Gets a table of the accesses per second of every phase of the run"""
+    lines = ['{:<18}{:>10}{:>8}{:>10}'.format('Workload', 'Accesses', 'Caches', 'Optimize')
+             + ''.join('{:>14}'.format(phase) for phase in PHASES)]
+    for row in run['results']:
+        lines.append('{:<18}{:>10}{:>8}{:>10}'.format(row['workload'], row['accesses'], row['number_of_caches'], str(row['optimize']))
+                     + ''.join('{:>14.0f}'.format(row[phase + '_accesses_per_second']) for phase in PHASES))
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+
+    args = sys.argv[1:]
+    # the json history, optionally a json file of the grid, the threshold in percent
+    # and rebaseline to make this run the baseline
+    history_path = args[0]
+    grid = None
+    if (len(args) > 1 and args[1] != 'None'):
+        with open(args[1]) as f:
+            grid = json.load(f)
+    threshold = float(args[2]) if (len(args) > 2) else THRESHOLD
+    rebaseline = len(args) > 3 and args[3] == 'rebaseline'
+
+    run = run_benchmark(grid)
+    print('Accesses per second')
+    print(format_run(run))
+    regressions = record_run(run, history_path, threshold, rebaseline)
+    for regression in regressions:
+        print('Regression: {workload} accesses={accesses} caches={number_of_caches} optimize={optimize} '
+              '{phase} {seconds:.3f}s vs {baseline_seconds:.3f}s, {slower:.1f}% slower'.format(**regression))
+    sys.exit(1 if (len(regressions) != 0) else 0)
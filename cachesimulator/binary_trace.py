@@ -0,0 +1,390 @@
+from cachesimulator.trace_parser import parse_line, open_trace, is_compressed, strip_compression, COMMANDS, COMMAND_CODES
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import numpy as np
+import sys
+import os
+
+# fixed width record of a decoded trace line, control commands (p, v, h)
+# use -1 for the processor id and address just like the text parser
+TRACE_DTYPE = np.dtype([('uid', np.int16), ('command', np.int8), ('address', np.int64)])
+BINARY_EXTENSION = '.npy'
+# number of records decoded at a time
+CHUNK_SIZE = 1 << 16
+# number of bytes of text decoded at a time
+BLOCK_SIZE = 1 << 24
+# number of chunks each worker decodes when parsing in parallel, more chunks
+# than workers balances the load when some chunks decode slower
+CHUNKS_PER_WORKER = 4
+# addresses with more digits might not fit in an int64 so take the slow path
+MAX_ADDRESS_DIGITS = 18
+
+_NEWLINE = ord('\n')
+_CARRIAGE_RETURN = ord('\r')
+_SPACE = ord(' ')
+_PROCESSOR = ord('P')
+_ZERO = ord('0')
+
+
+def convert_to_binary(file_path, binary_path=None, block_size=BLOCK_SIZE):
+    """Converts a text trace into the binary trace format. The text is decoded
+        a block at a time so the trace is never held in memory.
+
+    Args:
+        file_path (string): path to the text trace
+        binary_path (string): path of the binary trace, defaults to the text trace
+            path with the binary extension
+        block_size (int): number of bytes of text decoded at a time
+
+    Returns:
+        string: path to the binary trace
+    """
+    if (binary_path is None):
+        binary_path = os.path.splitext(strip_compression(file_path))[0] + BINARY_EXTENSION
+
+    # count the lines first so the records can be written straight into the file
+    length = count_lines(file_path, block_size)
+    records = np.lib.format.open_memmap(binary_path, mode='w+', dtype=TRACE_DTYPE, shape=(length,))
+
+    position = 0
+    for uids, commands, addresses in stream_decoded_blocks(file_path, block_size):
+        end = position + len(uids)
+        chunk = records[position:end]
+        chunk['uid'] = uids
+        chunk['command'] = commands
+        chunk['address'] = addresses
+        position = end
+    records.flush()
+    del records
+    return binary_path
+
+def load_binary(binary_path):
+    """Memory maps a binary trace, nothing is read until the records are used
+
+    Args:
+        binary_path (string): path to the binary trace
+
+    Returns:
+        np.memmap: The records of the trace with dtype TRACE_DTYPE
+    """
+    records = np.load(binary_path, mmap_mode='r')
+    if (records.dtype != TRACE_DTYPE):
+        raise Exception('Binary trace {} has dtype {}, expected {}'.format(binary_path, records.dtype, TRACE_DTYPE))
+    return records
+
+def stream_binary(binary_path, chunk_size=CHUNK_SIZE):
+    """Replays a binary trace straight from the memory map
+
+    Args:
+        binary_path (string): path to the binary trace
+        chunk_size (int): number of records decoded at a time
+
+    Returns:
+        generator: The entries [cache.id, command, address]
+    """
+    return stream_records(load_binary(binary_path), chunk_size)
+
+def stream_records(records, chunk_size=CHUNK_SIZE):
+    """Lazily decodes the records into entries
+
+    Args:
+        records (np.ndarray): records with dtype TRACE_DTYPE
+        chunk_size (int): number of records decoded at a time
+
+    Returns:
+        generator: The entries [cache.id, command, address]
+    """
+    return stream_columns(records['uid'], records['command'], records['address'], chunk_size)
+
+def stream_columns(uids, commands, addresses, chunk_size=CHUNK_SIZE):
+    """Lazily decodes the column arrays into entries, only a chunk of
+        the columns is turned into python objects at a time
+
+    Args:
+        uids (np.ndarray): processor id of each entry
+        commands (np.ndarray): opcode of each entry
+        addresses (np.ndarray): address of each entry
+        chunk_size (int): number of entries decoded at a time
+
+    Yields:
+        list: [cache.id, command, address]
+    """
+    for start in range(0, len(uids), chunk_size):
+        end = start + chunk_size
+        chunk_uids = uids[start:end].tolist()
+        chunk_commands = commands[start:end].tolist()
+        chunk_addresses = addresses[start:end].tolist()
+        for uid, command, address in zip(chunk_uids, chunk_commands, chunk_addresses):
+            yield [uid, COMMANDS[command], address]
+
+def is_path(trace):
+    """Checks if the trace is a path to a trace file rather than a trace in memory
+
+    Args:
+        trace (string, os.PathLike or iterable): path or column arrays or chunks of them
+
+    Returns:
+        bool: True if the trace is a path
+    """
+    return isinstance(trace, (str, os.PathLike))
+
+def is_columns(trace):
+    """Checks if the trace is the column arrays of a trace rather than chunks of them
+
+    Args:
+        trace (tuple or iterable): uids, commands and addresses or chunks of them
+
+    Returns:
+        bool: True if the trace is uids, commands and addresses
+    """
+    return isinstance(trace, tuple) and len(trace) == 3 and all(isinstance(column, np.ndarray) for column in trace)
+
+def stream_chunks(trace, chunk_size=CHUNK_SIZE):
+    """Lazily decodes column arrays, or an iterable of chunks of them, into entries.
+        Chunks are only generated as the entries are needed, so a generated trace
+        is simulated without ever being written to disk or held in memory.
+
+    Args:
+        trace (tuple or iterable): uids, commands and addresses or chunks of them
+        chunk_size (int): number of entries decoded at a time
+
+    Yields:
+        list: [cache.id, command, address]
+    """
+    if (is_columns(trace)):
+        trace = [trace]
+    for uids, commands, addresses in trace:
+        yield from stream_columns(uids, commands, addresses, chunk_size)
+
+# -- Vectorised text decoding -- #
+def decode_text(file_path, block_size=BLOCK_SIZE):
+    """Decodes a text trace into column arrays, a block of text at a time
+        with vectorised numpy passes. The entries are identical to parse.
+
+    Args:
+        file_path (string): path to the text trace
+        block_size (int): number of bytes of text decoded at a time
+
+    Returns:
+        uids (np.ndarray): processor id of each entry, -1 for (p, v, h)
+        commands (np.ndarray): opcode of each entry, see COMMANDS
+        addresses (np.ndarray): address of each entry, -1 for (p, v, h)
+    """
+    return concatenate_columns(list(stream_decoded_blocks(file_path, block_size)))
+
+def parallel_decode_text(file_path, workers=None, chunk_size=None, block_size=BLOCK_SIZE):
+    """Decodes a text trace into column arrays with a pool of processes. The file is
+        split into chunks at newlines, each chunk is decoded by a worker and the
+        chunks are joined in order so the columns are identical to decode_text.
+
+    Args:
+        file_path (string): path to the text trace
+        workers (int): number of processes, defaults to the number of cpus
+        chunk_size (int): number of bytes in each chunk, defaults to splitting the
+            file into CHUNKS_PER_WORKER chunks for each worker
+        block_size (int): number of bytes of text decoded at a time by a worker
+
+    Returns:
+        tuple(np.ndarray): uids, commands and addresses
+    """
+    # a compressed stream can not be split so it is decoded in one go
+    if (is_compressed(file_path)):
+        return decode_text(file_path, block_size)
+    if (workers is None):
+        workers = os.cpu_count()
+    if (chunk_size is None):
+        chunk_size = -(-os.path.getsize(file_path) // (workers * CHUNKS_PER_WORKER))
+    offsets = split_file(file_path, chunk_size)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        blocks = list(executor.map(_decode_range, repeat(file_path), offsets[:-1], offsets[1:], repeat(block_size)))
+    return concatenate_columns(blocks)
+
+def split_file(file_path, chunk_size):
+    """Splits a file into chunks which start at the beginning of a line
+
+    Args:
+        file_path (string): path to the text trace
+        chunk_size (int): approximate number of bytes in each chunk
+
+    Returns:
+        list(int): byte offsets of the chunks, the last offset is the file size
+    """
+    size = os.path.getsize(file_path)
+    offsets = [0]
+    with open(file_path, 'rb') as f:
+        while (offsets[-1] + chunk_size < size):
+            # finish the line that the chunk boundary falls in
+            f.seek(offsets[-1] + chunk_size - 1)
+            f.readline()
+            if (f.tell() >= size):
+                break
+            offsets.append(f.tell())
+    offsets.append(size)
+    return offsets
+
+def _decode_range(file_path, start, end, block_size):
+    """Decodes the lines between two byte offsets, used by the workers
+
+    Returns:
+        tuple(np.ndarray): uids, commands and addresses of the lines
+    """
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        return concatenate_columns(list(_decode_file(f, block_size, end - start)))
+
+def stream_decoded_blocks(file_path, block_size=BLOCK_SIZE):
+    """Decodes a text trace a block at a time
+
+    Args:
+        file_path (string): path to the text trace
+        block_size (int): number of bytes of text decoded at a time
+
+    Yields:
+        tuple(np.ndarray): uids, commands and addresses of the lines in the block
+    """
+    with open_trace(file_path, 'rb') as f:
+        yield from _decode_file(f, block_size)
+
+def _decode_file(f, block_size, size=None):
+    """Decodes the lines of an opened binary file. Blocks are cut after their last
+        newline and the rest of the block is carried into the next one.
+
+    Args:
+        f (file): file opened in binary mode
+        block_size (int): number of bytes of text decoded at a time
+        size (int): number of bytes to decode, defaults to the rest of the file
+
+    Yields:
+        tuple(np.ndarray): uids, commands and addresses of the lines in the block
+    """
+    remainder = b''
+    while (size is None or size > 0):
+        data = f.read(block_size if (size is None) else min(block_size, size))
+        if (not data):
+            break
+        if (size is not None):
+            size -= len(data)
+        data = remainder + data
+        end = data.rfind(b'\n') + 1
+        remainder = data[end:]
+        if (end != 0):
+            yield decode_buffer(data[:end])
+    if (remainder):
+        # last line of the file has no newline
+        yield decode_buffer(remainder)
+
+def decode_buffer(data):
+    """Decodes whole lines of text into column arrays. Lines which follow the
+        'P<n> R|W <addr>' or (p, v, h) formats are decoded with vectorised passes,
+        any other line is handed to parse_line so it is validated the same way.
+
+    Args:
+        data (bytes): lines of the trace, the last newline is optional
+
+    Returns:
+        tuple(np.ndarray): uids, commands and addresses of the lines
+    """
+    buf = np.frombuffer(data, dtype=np.uint8)
+    ends = np.flatnonzero(buf == _NEWLINE)
+    if (len(buf) != 0 and buf[-1] != _NEWLINE):
+        ends = np.append(ends, len(buf))
+    starts = np.empty_like(ends)
+    starts[:1] = 0
+    starts[1:] = ends[:-1] + 1
+    # drop the carriage return of windows line endings
+    stops = ends.copy()
+    has_return = (stops > starts)
+    has_return[has_return] = buf[stops[has_return] - 1] == _CARRIAGE_RETURN
+    stops -= has_return
+    lengths = stops - starts
+
+    uids = np.full(len(starts), -1, dtype=TRACE_DTYPE['uid'])
+    commands = np.empty(len(starts), dtype=TRACE_DTYPE['command'])
+    addresses = np.full(len(starts), -1, dtype=TRACE_DTYPE['address'])
+    if (len(starts) == 0):
+        return uids, commands, addresses
+
+    # pad the text so every character looked at by the fast path is in bounds
+    padded = np.frombuffer(data + bytes(MAX_ADDRESS_DIGITS + 5), dtype=np.uint8)
+    def char(offset):
+        return padded[starts + offset]
+
+    first = char(0)
+    # (p, v, h) commands
+    control = (lengths == 1)
+    for command in ('p', 'h', 'v'):
+        is_command = control & (first == ord(command))
+        commands[is_command] = COMMAND_CODES[command]
+    control &= (first == ord('p')) | (first == ord('h')) | (first == ord('v'))
+
+    # 'P<n> R|W <addr>' commands
+    digit = char(1) - _ZERO
+    method = char(3)
+    address_lengths = lengths - 5
+    access = ((first == _PROCESSOR) & (digit <= 9) & (char(2) == _SPACE) & (char(4) == _SPACE)
+        & ((method == ord('R')) | (method == ord('W')))
+        & (address_lengths >= 1) & (address_lengths <= MAX_ADDRESS_DIGITS))
+    value = np.zeros(len(starts), dtype=np.int64)
+    width = int(address_lengths[access].max()) if access.any() else 0
+    for position in range(width):
+        in_address = access & (position < address_lengths)
+        address_digit = char(5 + position) - _ZERO
+        access &= ~in_address | (address_digit <= 9)
+        value = np.where(in_address, value * 10 + address_digit, value)
+    uids[access] = digit[access]
+    commands[access] = np.where(method[access] == ord('R'), COMMAND_CODES['R'], COMMAND_CODES['W'])
+    addresses[access] = value[access]
+
+    # everything else goes through the reference parser
+    for idx in np.flatnonzero(~(control | access)).tolist():
+        line = data[starts[idx]:ends[idx]].decode().strip()
+        uid, method, address = parse_line(line)
+        uids[idx] = uid
+        commands[idx] = COMMAND_CODES[method]
+        addresses[idx] = address
+    return uids, commands, addresses
+
+def concatenate_columns(blocks):
+    """Joins decoded blocks into single column arrays
+
+    Args:
+        blocks (list(tuple(np.ndarray))): uids, commands and addresses of each block
+
+    Returns:
+        tuple(np.ndarray): uids, commands and addresses
+    """
+    if (len(blocks) == 0):
+        return (np.empty(0, dtype=TRACE_DTYPE['uid']), np.empty(0, dtype=TRACE_DTYPE['command']),
+            np.empty(0, dtype=TRACE_DTYPE['address']))
+    return tuple(np.concatenate(column) for column in zip(*blocks))
+
+def count_lines(file_path, block_size=BLOCK_SIZE):
+    """Counts the lines of a text trace without decoding them
+
+    Args:
+        file_path (string): path to the text trace
+        block_size (int): number of bytes read at a time
+
+    Returns:
+        int: number of lines
+    """
+    lines = 0
+    last = b'\n'
+    with open_trace(file_path, 'rb') as f:
+        for data in iter(lambda: f.read(block_size), b''):
+            lines += data.count(b'\n')
+            last = data[-1:]
+    # the last line of the file has no newline
+    if (last != b'\n'):
+        lines += 1
+    return lines
+
+
+if __name__ == '__main__':
+
+    args = sys.argv[1:]
+    # first arg should be the text trace, second optionally the binary trace
+    file_path = args[0]
+    binary_path = args[1] if (len(args) > 1) else None
+
+    print(convert_to_binary(file_path, binary_path))
@@ -0,0 +1,122 @@
+from cachesimulator.directory import Directory
+import logging
+logger = logging.getLogger('cachesimulator.Logger')
+
+class BitVectorDirectory(Directory):
+    """Full map directory which keeps a bitmask of the caches holding each block,
+        bit n is set when cache n has a valid copy. Finding the sharers of an address
+        no longer polls every cache, so a miss costs the same however many caches
+        there are. The statistics are identical to Directory.
+    """
+
+    def __init__(self, config=None, statistic=None, optimizer=None):
+        super().__init__(config=config, statistic=statistic, optimizer=optimizer)
+        self._OFFSET_BITS = self.config.offset_bits
+        # block address -> bitmask of the caches holding it
+        self._presence = {}
+        self._caches = {}
+
+    def append_sharer(self, sharer):
+        super().append_sharer(sharer)
+        self._caches[sharer.id] = sharer
+
+    def read_miss(self, cache, address, stored_address):
+        num_sharers = super().read_miss(cache, address, stored_address)
+        # the cache replaces the stored address with the address
+        self._remove_sharer(cache, stored_address)
+        self._add_sharer(cache, address)
+        return num_sharers
+
+    def write_miss(self, cache, address, need_data, stored_address):
+        num_invalidates = super().write_miss(cache, address, need_data, stored_address)
+        # every other copy has been invalidated
+        self._remove_sharer(cache, stored_address)
+        self._set_only_sharer(cache, address)
+        return num_invalidates
+
+    def _add_sharer(self, cache, address):
+        """Sets the bit of the cache for the block of the address"""
+        block = address >> self._OFFSET_BITS
+        self._presence[block] = self._presence.get(block, 0) | (1 << cache.id)
+
+    def _set_only_sharer(self, cache, address):
+        """Makes the cache the only holder of the block of the address"""
+        self._presence[address >> self._OFFSET_BITS] = 1 << cache.id
+
+    def _remove_sharer(self, cache, address):
+        """Clears the bit of the cache for the block of the address, blocks
+            which are no longer held by any cache are forgotten
+        """
+        if (address is None):
+            return
+        block = address >> self._OFFSET_BITS
+        mask = self._presence.get(block, 0) & ~(1 << cache.id)
+        if (mask):
+            self._presence[block] = mask
+        else:
+            self._presence.pop(block, None)
+
+    def _sharer_mask(self, cache, address):
+        """Gets the bitmask of the other caches holding the address
+
+        Returns:
+            int: bitmask of the caches
+        """
+        return self._presence.get(address >> self._OFFSET_BITS, 0) & ~(1 << cache.id)
+
+    def _get_sharers(self, cache, address, no_latency=False):
+        """Gets the caches which contain a valid copy of the address. Performs a directory access
+
+        Args:
+            cache (Cache): The cache issuing the read miss
+            address (int): Address of the word
+
+        Returns:
+            list(Cache): list of caches which contain the address
+        """
+        mask = self._sharer_mask(cache, address)
+        cache_containers = []
+        while (mask):
+            # lowest set bit first so the caches are in order of id
+            lowest = mask & -mask
+            cache_containers.append(self._caches[lowest.bit_length() - 1])
+            mask ^= lowest
+        if (no_latency == False):
+            self.statistic.directory_access()
+        return cache_containers
+
+    def _optimize_check(self, stored_address, cache):
+        """Checks if we have to process the optimization
+
+        Args:
+            stored_address (int): Address that is being kicked out of the cache
+            cache (Cache): cache who had a tag miss
+        """
+        if ((stored_address != None) and self.optimizer.OPTIMIZE):
+            mask = self._sharer_mask(cache, stored_address)
+            if (popcount(mask) == 1):
+                last_sharer = self._caches[mask.bit_length() - 1]
+                last_sharer.alert_last_sharer(stored_address, cache)
+
+    def sharer_count(self, address):
+        """Gets the number of caches holding the address
+
+        Args:
+            address (int): Address of the word
+
+        Returns:
+            int: number of caches
+        """
+        return popcount(self._presence.get(address >> self._OFFSET_BITS, 0))
+
+
+def popcount(mask):
+    """Counts the set bits of the mask
+
+    Args:
+        mask (int): The bitmask
+
+    Returns:
+        int: number of set bits
+    """
+    return bin(mask).count('1')
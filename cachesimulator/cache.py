@@ -1,5 +1,5 @@
 from cachesimulator.cacheline import Line
-from cachesimulator.config import CACHE_SIZE, LINE_SIZE
+from cachesimulator.config import SimulatorConfig
 from cachesimulator import MSI
 from cachesimulator.statistics import Statistic
 import numpy as np
@@ -11,12 +11,25 @@ import logging
 logger = logging.getLogger('cachesimulator.Logger')
 
 class Cache():
+    # number of lines in each set, a line per set is direct mapped
+    _WAYS = 1
 
-    def __init__(self, id, directory=None):
+    def __init__(self, id, directory=None, config=None, statistic=None, optimizer=None):
         self.id = id
-        self._CACHE_SIZE = CACHE_SIZE
-        self._OFFSET_BITS = int(np.log2(LINE_SIZE))
-        self._INDEX_BITS = int(np.log2(CACHE_SIZE))
+        # the cache shares the geometry, counters and protocol of its directory unless given its own
+        if (config is None):
+            config = directory.config if (directory is not None) else SimulatorConfig()
+        if (statistic is None):
+            statistic = directory.statistic if (directory is not None) else Statistic()
+        if (optimizer is None):
+            optimizer = directory.optimizer if (directory is not None) else Optimizer()
+        self.config = config
+        self.statistic = statistic
+        self.optimizer = optimizer
+        self._CACHE_SIZE = config.cache_size
+        self._SETS = config.cache_size // self._WAYS
+        self._OFFSET_BITS = config.offset_bits
+        self._INDEX_BITS = int(np.log2(self._SETS))
         self._TAG_BITS = 32 - self._INDEX_BITS - self._OFFSET_BITS
         self._initialise_lines()
         self.directory = directory
@@ -27,55 +40,76 @@ class Cache():
     def _initialise_lines(self):
         self._cachelines = np.zeros(self._CACHE_SIZE, dtype=object)
         for idx, line in enumerate(self._cachelines):
-            new_line = Line(idx)
+            new_line = Line(idx, self.statistic)
             self._cachelines[idx] = new_line
+
+    def _get_line(self, tag, index):
+        """Gets the line a local read or write of the tag uses, the line holding
+            the tag or else the line it will replace
+
+        Args:
+            tag (int): The tag
+            index (int): The index
+
+        Returns:
+            Line: The cacheline
+        """
+        return self.cachelines[index]
+
+    def _probe_line(self, tag, index):
+        """Gets the line a remote request for the tag looks at, without changing
+            which line would be replaced next
+
+        Args:
+            tag (int): The tag
+            index (int): The index
+
+        Returns:
+            Line: The cacheline
+        """
+        return self.cachelines[index]
         
     # -- Writes -- #
-    def write(self, address):
+    def write(self, address, tag=None, index=None):
         """Perfroms a write operation to the cache
 
         Args:
             address (int): Address of the word
+            tag (int): Tag of the address, computed from the address if not given
+            index (int): Index of the address, computed from the address if not given
 
         Returns:
             hit (bool): True if there is a write hit, else false
         """
-        logger.info('cache {} writing to address: {}'.format(self, address))
-        tag, index, offset = get_address_parameters(address, self._INDEX_BITS, self._OFFSET_BITS)        
-        line = self.cachelines[index]
+        if (tag is None):
+            tag, index, offset = get_address_parameters(address, self._INDEX_BITS, self._OFFSET_BITS)
+        line = self._get_line(tag, index)
 
-        Statistic.cache_probe() # checking tag and state
+        self.statistic.cache_probe() # checking tag and state
         if (tag == line.tag and line.valid==True):
             # need to check the state
             if (line.state == MSI.SHARED):
-                logger.debug('Line is in SHARED state')
                 # we need to tell directory to send invalidates for this address
                 self._write_miss(line, tag, address, False)
                 return False
             elif(line.state == MSI.INVALID):
-                logger.debug('Line is in INVALID state')
-                Statistic.coherence_miss()
+                self.statistic.coherence_miss()
                 self._write_miss(line, tag, address, True)
                 return False
             elif(line.state == MSI.MODIFIED):
-                logger.debug('Line is in MODIFIED state')
                 self._write_hit(line, tag, address)
                 return True
-            elif(Optimizer.OPTIMIZE and line.state==MSI.EXCLUSIVE):
-                logger.debug('Line is in Exlusive state, so skipping directory and writing to modified')
+            elif(self.optimizer.OPTIMIZE and line.state==MSI.EXCLUSIVE):
                 self._write_hit(line, tag, address)
                 return True
         else:
             # block not in cache so get block from directory,
             if (line.valid == False):
-                Statistic.compulsory_miss()
+                self.statistic.compulsory_miss()
 
             # Now we can skip this section and cheat a bit but we will do it anyway
-            logger.debug('Line tag: {} vs addres tag: {}'.format(line.tag, tag))
-            logger.debug('Line validity: {}'.format(line.valid))
             if (line.state == MSI.MODIFIED):
-                logger.info(f"Line w/ address {address} is in state Modified but tags don't match so creating replacement writeback")
-                Statistic.replacement_writeback()
+                self.statistic.replacement_writeback()
             
             if (line.valid):
                 stored_address = get_stored_address(line.tag, index, self._INDEX_BITS, self._OFFSET_BITS)
@@ -95,16 +129,13 @@ class Cache():
             stored_address (int): The address that is stored in the cache currently but is about to be overwritten
                 it is none if the tags match.
         """
-        logger.info('Write miss for cache: {} and need data: {} and stored address: {}'.format(self, need_data, stored_address))
         self.pending_address = address
         # note that the num_invalidates to expect will appear after we have recieved all
         # the acknowledged invalidations
-        Statistic.directory_request()
+        self.statistic.directory_request()
         num_invalidates = self.directory.write_miss(self, address, need_data, stored_address)
-        logger.debug(f"Cache {self} expecting {num_invalidates} invalidations")
-        Statistic.cache_probe()
+        self.statistic.cache_probe()
         line.write(tag)
-        logger.debug(f"Cache {self} probed and accessed to address: {address}")
 
     def _write_hit(self, line, tag, address):
         """This is when a write happens and the state of the line is Modified
@@ -114,47 +145,46 @@ class Cache():
             tag  (int): The value of the tag
             address (int): Address of the word 
         """
-        logger.info('Read hit for cache: {}'.format(self))
         line.write(tag)
-        Statistic.private_access()
+        self.statistic.private_access()
 
     # -- Reads -- #
-    def read(self, address):
+    def read(self, address, tag=None, index=None):
         """Perfroms a read operation to the cache, if there is no hit then 
             it asks the directory for the information
 
         Args:
             address (int): Address of the word
+            tag (int): Tag of the address, computed from the address if not given
+            index (int): Index of the address, computed from the address if not given
 
         Returns:
             hit (bool): True if there is a cache hit, else false
         """
-        logger.info('cache {} reading address: {}'.format(self, address))
-        tag, index, offset = get_address_parameters(address, self._INDEX_BITS, self._OFFSET_BITS)
-        line = self.cachelines[index]
+        if (tag is None):
+            tag, index, offset = get_address_parameters(address, self._INDEX_BITS, self._OFFSET_BITS)
+        line = self._get_line(tag, index)
 
-        Statistic.cache_probe()
+        self.statistic.cache_probe()
         if (tag == line.tag and line.valid==True):
             if (line.state == MSI.INVALID):
-                Statistic.coherence_miss()
+                self.statistic.coherence_miss()
                 self._read_miss(line, tag, address)
                 return False
             else:
                 self._read_hit(line, tag, address)
                 return True
         else:
-            logger.debug(f"Tag mismatch, tag in cache: {line.tag} vs tag for given addres:{tag}")
             # it is either compulsory or conflict
             if (line.valid == False):
-                Statistic.compulsory_miss()
+                self.statistic.compulsory_miss()
             else:
-                Statistic.conflic_miss()
+                self.statistic.conflic_miss()
                 
             # block not in cache so get block from directory
             if (line.state == MSI.MODIFIED):
-                logger.info(f"Line w/ address {address} is in state Modified but tags don't match so creating replacement writeback")
                 # check if it was modified state
-                Statistic.replacement_writeback()
+                self.statistic.replacement_writeback()
             
             # for optimization
             if line.valid:
@@ -173,16 +203,13 @@ class Cache():
             tag  (int): The value of the tag
             address (int): Address of the word 
         """
-        logger.info('Read miss for cache: {}, with stored address: {}'.format(self,stored_address))
-        Statistic.directory_request()
+        self.statistic.directory_request()
         num_sharers = self.directory.read_miss(self, address, stored_address)
         # set cache state
-        if (Optimizer.OPTIMIZE and num_sharers==0):
-            logger.info(f"Cache {self} setting address {address} to state exclusive")
+        if (self.optimizer.OPTIMIZE and num_sharers==0):
             line.read(tag) # auto sets it to shared
             line.set_state(MSI.EXCLUSIVE)
         else:
-            logger.info(f"Cache {self} setting address {address} to state shared")
             line.set_state(MSI.SHARED) # provides a cache probe
             line.read(tag)  
         
@@ -194,10 +221,9 @@ class Cache():
             tag  (int): The value of the tag
             address (int): Address of the word 
         """
-        logger.info('Read hit for cache: {}'.format(self))
         # We never change state when we read, even when optimization is enabled
-        Statistic.cache_access()
-        Statistic.private_access()
+        self.statistic.cache_access()
+        self.statistic.private_access()
         return
 
 
@@ -210,18 +236,15 @@ class Cache():
         Args:
             address (int): Address of the word
         """
-        logger.info('Remote read miss issued for cache {} with address: {}'.format(self, address))
         tag, index, offset = get_address_parameters(address, self._INDEX_BITS, self._OFFSET_BITS)
-        line = self.cachelines[index]
+        line = self._probe_line(tag, index)
 
         # check if the line is actuall valid
         if (tag == line.tag and line.valid == True):
             if (line.state == MSI.MODIFIED):
-                logger.info('Changing line {} to state SHARED, since it was in modified'.format(line))
                 line.state = MSI.SHARED
-                Statistic.coherence_writeback()
-            elif(line.state == MSI.EXCLUSIVE and Optimizer.OPTIMIZE):
-                logger.info('Changing line {} to state SHARED, since it was in exlusive'.format(line))
+                self.statistic.coherence_writeback()
+            elif(line.state == MSI.EXCLUSIVE and self.optimizer.OPTIMIZE):
                 line.state = MSI.SHARED
 
     def send_line(self, cache, address):
@@ -232,9 +255,8 @@ class Cache():
             cache (Cache): Cache to send data to
             address (int): Address of the word
         """
-        logger.info('Cache {} sending line with address {} to cache {}'.format(self, address, cache))
         tag, index, offset = get_address_parameters(address, self._INDEX_BITS, self._OFFSET_BITS)
-        line = self.cachelines[index]
+        line = self._probe_line(tag, index)
         return
 
     def alert_last_sharer(self, address, cache):
@@ -245,12 +267,10 @@ class Cache():
             Cache: cache that has just been removed as a sharer
         """
         # check if optimization is on
-        if (Optimizer.OPTIMIZE):
-            logger.info(f'Directory informing cache {self} that it is last sharer for address: {address} because other sharer cache: {cache} invalidated'.format(self, address, cache))
+        if (self.optimizer.OPTIMIZE):
             tag, index, offset = get_address_parameters(address, self._INDEX_BITS, self._OFFSET_BITS)
-            line = self.cachelines[index]
+            line = self._probe_line(tag, index)
             if (line.tag == tag and line.valid==True):
-                logger.debug(f'cache {self} changing address {address} to state exclusive')
                 # change state to exlusive since it is last sharer but dont probe as this will overlap
                 line.state = MSI.EXCLUSIVE
                 # send acknowledgment to directory but this overlaps
@@ -263,15 +283,14 @@ class Cache():
             address (int): Address of the word
             cache (Cache): The cache that asked for invalidation
         """
-        logger.info('Cache {} is invalidating line with address: {} asked from cache: {}'.format(self, address, cache))
         tag, index, offset = get_address_parameters(address, self._INDEX_BITS, self._OFFSET_BITS)
-        line = self.cachelines[index]
+        line = self._probe_line(tag, index)
         # check if the line is actuall valid
         if (tag == line.tag and line.valid == True):
         #     if (line.state == MSI.MODIFIED):
                 # logger.debug('line w/ address {} is in modified so creating coherence writeback'.format(address))
                 # line.state = MSI.SHARED
-                # Statistic.coherence_writeback()
+                # self.statistic.coherence_writeback()
             line.invalidate()
             cache.confirm_invalidation(address)
 
@@ -282,7 +301,6 @@ class Cache():
             Args:
                 address (int): Address of the word
         """
-        logger.debug('Confirming invalidation for cache: {}'.format(self))
         # if (self.num_invalidates == 0):
         #     raise Exception('Too many confirm invalidations sent, expected {}'.format(self.num_invalidates))
         # else:
@@ -310,9 +328,8 @@ class Cache():
         Returns:
             bool: True if the address is valid in the cache
         """
-        logger.debug('Cache {} checking if it contains the address: {}'.format(self, address))
         tag, index, offset = get_address_parameters(address, self._INDEX_BITS, self._OFFSET_BITS)
-        line = self.cachelines[index]
+        line = self._probe_line(tag, index)
         
         if (line.tag == tag and line.valid == True and line.state != MSI.INVALID):
             return True
@@ -334,6 +351,14 @@ class Cache():
     def cachelines(self):
         return self._cachelines
 
+    @property
+    def sets(self):
+        return self._SETS
+
+    @property
+    def ways(self):
+        return self._WAYS
+
     @property
     def LINE_SIZE(self):
         return self._CACHE_SIZE
@@ -372,8 +397,6 @@ def get_stored_address(tag, index, INDEX_BITS, OFFSET_BITS):
     Returns:
         int : The address but with offset 0
     """
-    logger.debug(f'Getting stored address with Tag: {tag}, index: {index}')
     tag = tag << (INDEX_BITS + OFFSET_BITS)
     index = index << OFFSET_BITS
-    logger.debug(f'new tag: {tag}, new index: {index}')
     return tag | index | 0
\ No newline at end of file
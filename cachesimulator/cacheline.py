@@ -1,9 +1,9 @@
 from cachesimulator.MSI import *
 from cachesimulator.config import LINE_SIZE
-from cachesimulator.statistics import Statistic
 
 class Line():
-    def __init__(self, idx):
+    def __init__(self, idx, statistic):
+        self.statistic = statistic
         # initalise cache to be invalid
         self.state = INVALID
         self.tag = -1 
@@ -20,21 +20,21 @@ class Line():
         self.state = SHARED
         self.valid = True
         self.dirty = False
-        Statistic.cache_access()
+        self.statistic.cache_access()
 
     def write(self, tag):
         self.tag = tag
         self.dirty = True
         self.valid = True
         self.state = MODIFIED
-        Statistic.cache_access()
+        self.statistic.cache_access()
 
     def invalidate(self):
         self.state = INVALID
 
     def set_state(self, state):
         self.state = state
-        Statistic.cache_probe()
+        self.statistic.cache_probe()
         
     # -- Setters and Getters --
     @property
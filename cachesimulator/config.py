@@ -1,3 +1,31 @@
 CACHE_SIZE = 512    # number of lines within a cache
 LINE_SIZE = 4       # number of words within a cache line
-NUMBER_OF_CACHES = 4# number of caches in the system
\ No newline at end of file
+NUMBER_OF_CACHES = 4# number of caches in the system
+
+
+class SimulatorConfig():
+    """Geometry of a simulated system. The caches and directory of a simulation
+        share one config, so systems of different sizes can be simulated one
+        after the other in the same process. Defaults to the constants above.
+    """
+
+    def __init__(self, cache_size=None, line_size=None, number_of_caches=None):
+        self.cache_size = CACHE_SIZE if (cache_size is None) else cache_size
+        self.line_size = LINE_SIZE if (line_size is None) else line_size
+        self.number_of_caches = NUMBER_OF_CACHES if (number_of_caches is None) else number_of_caches
+        for name, value in (('cache_size', self.cache_size), ('line_size', self.line_size)):
+            if (value <= 0 or value & (value - 1) != 0):
+                raise Exception('{} must be a power of two, got {}'.format(name, value))
+        if (self.number_of_caches <= 0):
+            raise Exception('number_of_caches must be positive, got {}'.format(self.number_of_caches))
+
+    def __repr__(self):
+        return f"SimulatorConfig(cache_size={self.cache_size}, line_size={self.line_size}, number_of_caches={self.number_of_caches})"
+
+    @property
+    def offset_bits(self):
+        return self.line_size.bit_length() - 1
+
+    @property
+    def index_bits(self):
+        return self.cache_size.bit_length() - 1
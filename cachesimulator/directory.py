@@ -1,12 +1,16 @@
 import logging
-from cachesimulator.config import NUMBER_OF_CACHES
+from cachesimulator.config import SimulatorConfig
 from cachesimulator.statistics import Statistic
 from cachesimulator.optimizer import Optimizer
 logger = logging.getLogger('cachesimulator.Logger')
 
 class Directory():
 
-    def __init__(self):
+    def __init__(self, config=None, statistic=None, optimizer=None):
+        self.config = SimulatorConfig() if (config is None) else config
+        # counters and protocol of the simulation the directory belongs to
+        self.statistic = Statistic() if (statistic is None) else statistic
+        self.optimizer = Optimizer() if (optimizer is None) else optimizer
         self._sharers = []
         return
 
@@ -25,7 +29,6 @@ class Directory():
         Returns:
             int: number of sharers
         """
-        logger.debug('Directory read miss')
 
         # lets do optimization where we check for sharers of the old addrress
         self._optimize_check(stored_address, cache)
@@ -40,26 +43,23 @@ class Directory():
         # has a copt of the data
         if (len(cache_containers) != 0):
             cache_closest = self._get_closest_cache(cache_containers, cache)
-            logger.info('closest cache to {} is {}'.format(cache, cache_closest))
             # ask the closest cache to send the data to issuing cache 
             cache_closest.send_line(cache, address)
-            Statistic.directory_request()   # ask to send line
-            Statistic.cache_probe()
-            Statistic.cache_access() # for cache accessing data to send
+            self.statistic.directory_request()   # ask to send line
+            self.statistic.cache_probe()
+            self.statistic.cache_access() # for cache accessing data to send
 
             furthest_distance = self._get_furthest_distance(cache_containers, cache)
-            Statistic.processor_hop(furthest_distance)
-            Statistic.remote_access()
+            self.statistic.processor_hop(furthest_distance)
+            self.statistic.remote_access()
         else:
             # there is no cache that holds the data, we need to query memory and send it personally
-            logger.info('No cache has line {}, so fetching it from memory'.format(address))
-            Statistic.memory_access()
+            self.statistic.memory_access()
 
-            logger.debug("Sending line to cache: {}".format(cache))
             
-            Statistic.directory_request()
+            self.statistic.directory_request()
 
-            Statistic.off_chip_access()
+            self.statistic.off_chip_access()
 
         return len(cache_containers)
 
@@ -78,10 +78,9 @@ class Directory():
         Returns:
             int : Number of invalidations to expect 
         """
-        logger.debug(f'Directory write miss, is data needed: {need_data}')
 
         if (need_data):
-            Statistic.write_miss_data_needed()
+            self.statistic.write_miss_data_needed()
 
         # lets do optimization where we check for sharers of the old addrress
         self._optimize_check(stored_address, cache)
@@ -89,9 +88,8 @@ class Directory():
         # get caches which contain the address
         cache_containers = self._get_sharers(cache, address)
         if (len(cache_containers) > 0):
-            logger.info('Sending invalidations to sharers: {}'.format(cache_containers))
             # send ivalidations to them all (remote write miss)
-            Statistic.directory_request()
+            self.statistic.directory_request()
             self._send_invalidations(cache, cache_containers, address)
             
 
@@ -103,34 +101,32 @@ class Directory():
                 if (len(cache_containers) > 1):
                     pass
                 else:
-                    Statistic.cache_access()
+                    self.statistic.cache_access()
 
             # this is for invalidations
-            Statistic.cache_probe()
+            self.statistic.cache_probe()
 
             furthest_distance = self._get_furthest_distance(cache_containers, cache)
-            Statistic.processor_hop(furthest_distance)
+            self.statistic.processor_hop(furthest_distance)
 
-            Statistic.invalidation_sent(len(cache_containers))
-            Statistic.remote_access()
+            self.statistic.invalidation_sent(len(cache_containers))
+            self.statistic.remote_access()
 
             return len(cache_containers)
         # No sharers
         else:
-            logger.info('No sharers')
             # need to get from main memory and send to cache
             if (need_data):
-                Statistic.memory_access()
-                Statistic.off_chip_access()
+                self.statistic.memory_access()
+                self.statistic.off_chip_access()
                 
             else:
                 # the cache does not need data just telling us to send invalidations
-                logger.info("Getting data from memory")
-                Statistic.write_miss_no_sharers()
-                Statistic.remote_access()
+                self.statistic.write_miss_no_sharers()
+                self.statistic.remote_access()
                 pass
             # directory sends data to cache
-            Statistic.directory_request()
+            self.statistic.directory_request()
             
             return 0
 
@@ -141,7 +137,6 @@ class Directory():
             caches (list(Cache)): List of caches containing the address
             address (int): Address of the word
         """
-        logger.debug('Sending remote misses to caches: {}'.format(caches))
         for c in caches:
             c.remote_read_miss(address)
 
@@ -153,7 +148,6 @@ class Directory():
             caches (list(Cache)): Caches which need to be invalidated
             address (int): Address of the word
         """
-        logger.info('Sending invalidations to caches: {} for address {}'.format(caches, address))
         for c in caches:
             c.invalidate_line(address, cache)
 
@@ -167,7 +161,6 @@ class Directory():
         Returns:
             list(Cache): list of caches which contain the address
         """
-        logger.debug('Getting sharers for address {}'.format(address))
         cache_containers = []
         for c in self.sharers:
             if (cache != c):
@@ -176,7 +169,7 @@ class Directory():
                 if (contains):
                     cache_containers.append(c)
         if (no_latency == False):
-            Statistic.directory_access()
+            self.statistic.directory_access()
         return cache_containers
 
     def _get_closest_cache(self, caches, cache):
@@ -190,17 +183,13 @@ class Directory():
         Returns:
             Cache: The closest cache such that the network latency takes the least amount of time
         """
-        logger.info('Finding closest cache with caches: {}, to closest cache: {}'.format(caches, cache))
         distances = []
         for c in caches:
-            if (Optimizer.OPTIMIZE):
-                logger.debug(f"using optimised: {Optimizer.OPTIMIZE}")
-                distance = ((c.id - cache.id)) % (NUMBER_OF_CACHES)
-                logger.debug('Distance between cache {} & {}: {}'.format(cache, c, distance))
+            if (self.optimizer.OPTIMIZE):
+                distance = ((c.id - cache.id)) % (self.config.number_of_caches)
                 distances.append(distance)
             else:
-                distance = ((cache.id - c.id)) % (NUMBER_OF_CACHES)
-                logger.debug('Distance between cache {} & {}: {}'.format(cache, c, distance))
+                distance = ((cache.id - c.id)) % (self.config.number_of_caches)
                 distances.append(distance)
         
         min_distance = min(distances)
@@ -222,14 +211,11 @@ class Directory():
         distances = []
         # getting furthest cache to send invalidation too
         for c in caches:
-            if (Optimizer.OPTIMIZE):
-                logger.debug(f"using optimised: {Optimizer.OPTIMIZE}")
-                distance = ((c.id - cache.id)) % (NUMBER_OF_CACHES)
-                logger.debug('Distance between cache {} & {}: {}'.format(cache, c, distance))
+            if (self.optimizer.OPTIMIZE):
+                distance = ((c.id - cache.id)) % (self.config.number_of_caches)
                 distances.append(distance)
             else:
-                distance = ((cache.id - c.id)) % (NUMBER_OF_CACHES)
-                logger.debug('Distance between cache {} & {}: {}'.format(cache, c, distance))
+                distance = ((cache.id - c.id)) % (self.config.number_of_caches)
                 distances.append(distance)
         
         max_distance = max(distances)
@@ -244,15 +230,11 @@ class Directory():
             stored_address (int): Address that is being kicked out of the cache
             cache (Cache): cache who had a tag miss
         """
-        if ( (stored_address != None) and Optimizer.OPTIMIZE):    # check it does not equal None
-            logger.info(f"Cache {cache} has invalidated address: {stored_address}, checking for sharers")
+        if ( (stored_address != None) and self.optimizer.OPTIMIZE):    # check it does not equal None
             cache_containers_for_stored_address = self._get_sharers(cache, stored_address, no_latency=True)
             if (len(cache_containers_for_stored_address) == 1):
                 last_sharer = cache_containers_for_stored_address[0] 
-                logger.info(f"Alerting cache {last_sharer} that it is last sharer for address {stored_address}")
                 last_sharer.alert_last_sharer(stored_address, cache)
-        else:
-            logger.debug(f"Stored address not set")
 
     @property
     def sharers(self):
@@ -0,0 +1,109 @@
+from cachesimulator.tracer import Tracer
+import numpy as np
+import os
+import logging
+
+logger = logging.getLogger('cachesimulator.Logger')
+
+# the coherence messages recorded, the event of a record is its index in this list
+COHERENCE_EVENTS = ['read_miss', 'write_miss', 'invalidate_line', 'remote_read_miss', 'send_line',
+                    'alert_last_sharer', 'replacement_writeback', 'coherence_writeback']
+EVENT_CODES = {event: code for code, event in enumerate(COHERENCE_EVENTS)}
+# cache ids and addresses which are not known are -1
+EVENT_DTYPE = np.dtype([('event', np.int8), ('cache_id', np.int16), ('other_id', np.int16),
+                        ('address', np.int64), ('cost', np.int32)])
+# records kept in memory before they are written to the log
+BLOCK_SIZE = 1 << 16
+
+
+class EventLog:
+    """Sink of a Tracer which records the coherence messages as fixed width records
+        of EVENT_DTYPE. The records are kept in a preallocated block which is
+        appended to the log file whenever it is full.
+    """
+
+    def __init__(self, file_path, block_size=BLOCK_SIZE):
+        """
+        Args:
+            file_path (string): Path of the log, overwritten
+            block_size (int): number of records written at once
+        """
+        self.file_path = file_path
+        self.records = 0
+        self._file = open(file_path, 'wb')
+        self._block = np.zeros(block_size, dtype=EVENT_DTYPE)
+        # a view of each field, setting an item of them is cheaper than a whole record
+        self._events = self._block['event']
+        self._cache_ids = self._block['cache_id']
+        self._other_ids = self._block['other_id']
+        self._addresses = self._block['address']
+        self._costs = self._block['cost']
+        self._length = 0
+
+    def __call__(self, event, cache_id, other_id, address, cost):
+        code = EVENT_CODES.get(event)
+        if (code is None):
+            return
+        position = self._length
+        self._events[position] = code
+        self._cache_ids[position] = -1 if (cache_id is None) else cache_id
+        self._other_ids[position] = -1 if (other_id is None) else other_id
+        self._addresses[position] = -1 if (address is None) else address
+        self._costs[position] = cost
+        self._length = position + 1
+        if (self._length == len(self._block)):
+            self.flush()
+
+    def flush(self):
+        self._block[:self._length].tofile(self._file)
+        self._file.flush()
+        self.records += self._length
+        self._length = 0
+
+    def close(self):
+        if (not self._file.closed):
+            self.flush()
+            self._file.close()
+
+    def tracer(self):
+        """Gets a tracer which sends only the coherence messages to this log
+
+        Returns:
+            Tracer: The tracer, enabled
+        """
+        tracer = Tracer([self], events=COHERENCE_EVENTS)
+        tracer.enable()
+        return tracer
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+
+def read_event_log(file_path):
+    """Maps the records of an event log into memory
+
+    Args:
+        file_path (string): Path of the log
+
+    Returns:
+        np.memmap: The records with dtype EVENT_DTYPE
+    """
+    if (os.path.getsize(file_path) == 0):
+        # an empty file can not be mapped
+        return np.zeros(0, dtype=EVENT_DTYPE)
+    return np.memmap(file_path, dtype=EVENT_DTYPE, mode='r')
+
+
+def event_names(records):
+    """Gets the name of the event of every record
+
+    Args:
+        records (np.ndarray): records with dtype EVENT_DTYPE
+
+    Returns:
+        np.ndarray: The names
+    """
+    return np.array(COHERENCE_EVENTS)[records['event']]
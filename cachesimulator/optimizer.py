@@ -1,13 +1,5 @@
 class Optimizer:
-    OPTIMIZE = False
+    """Whether the simulation follows MESI rather than MSI, each simulation has its own"""
 
-    # @classmethod
-    # def optimize(self, val):
-    #     self._OPTIMIZE = val
-
-
-    # @classmethod
-    # @property
-    # def OPTIMIZE(self):
-    #     print(f"asking for optimization")
-    #     return self._OPTIMIZE
+    def __init__(self, optimize=False):
+        self.OPTIMIZE = optimize
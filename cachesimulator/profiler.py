@@ -0,0 +1,107 @@
+from contextlib import contextmanager
+import cProfile
+import time
+import tracemalloc
+import logging
+
+logger = logging.getLogger('cachesimulator.Logger')
+
+
+class Profiler:
+    """Measures the wall time and peak memory of the phases of a run. Tracing memory
+        slows python down several times, so the time of a phase is measured with
+        tracing off and its memory in a separate run of the phase. While disabled
+        a phase does nothing, so a run can always be split into phases.
+    """
+
+    def __init__(self, enabled=True, stats_path=None):
+        """
+        Args:
+            enabled (bool): Measure the phases
+            stats_path (string): Path of a cProfile dump of the phases which ask for it,
+                no dump if not given
+        """
+        self.enabled = enabled
+        self.stats_path = stats_path
+        # (name, seconds) of each timed phase in order
+        self.phases = []
+        # name -> peak bytes of each phase run under tracemalloc
+        self.peaks = {}
+        self._started_tracing = False
+
+    @contextmanager
+    def phase(self, name, profile=False):
+        """Measures the wall time of the code run within the phase
+
+        Args:
+            name (string): Name of the phase
+            profile (bool): Run cProfile over the phase, if there is a stats_path
+        """
+        if (not self.enabled):
+            yield
+            return
+        profiler = cProfile.Profile() if (profile and self.stats_path is not None) else None
+        start = time.perf_counter()
+        if (profiler is not None):
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if (profiler is not None):
+                profiler.disable()
+            self.phases.append((name, time.perf_counter() - start))
+            if (profiler is not None):
+                profiler.dump_stats(self.stats_path)
+
+    @contextmanager
+    def memory(self, name):
+        """Measures the peak memory of the code run within the phase, tracing starts
+            with the first phase measured and goes on until stop so the memory still
+            held from earlier phases is counted
+
+        Args:
+            name (string): Name of the phase
+        """
+        if (not self.enabled):
+            yield
+            return
+        if (not tracemalloc.is_tracing()):
+            tracemalloc.start()
+            self._started_tracing = True
+        tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            self.peaks[name] = max(self.peaks.get(name, 0), tracemalloc.get_traced_memory()[1])
+
+    def stop(self):
+        """Stops tracing memory if a phase started it"""
+        if (self._started_tracing):
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def seconds(self, name):
+        return sum(seconds for phase, seconds in self.phases if (phase == name))
+
+    def report(self, accesses, loop='simulation'):
+        """Gets the time and memory of every phase and the throughput of the simulation
+
+        Args:
+            accesses (int): number of accesses simulated
+            loop (string): name of the phase which simulates the accesses
+
+        Returns:
+            string: The report
+        """
+        lines = ['{:<14}{:>12}{:>20}'.format('Phase', 'Wall (s)', 'Peak memory (MiB)')]
+        for name, seconds in self.phases:
+            peak = '{:.2f}'.format(self.peaks[name] / (1 << 20)) if (name in self.peaks) else '-'
+            lines.append('{:<14}{:>12.3f}{:>20}'.format(name, seconds, peak))
+        if (len(self.peaks) != 0):
+            lines.append('Peak memory measured in a separate run under tracemalloc')
+        seconds = self.seconds(loop)
+        if (accesses != 0 and seconds != 0):
+            lines.append(f'Accesses: {accesses}, {accesses / seconds:.0f} accesses/s, {seconds * 1e9 / accesses:.0f} ns/access')
+        if (self.stats_path is not None):
+            lines.append(f'Profile of the {loop} saved to {self.stats_path}')
+        return '\n'.join(lines)
@@ -0,0 +1,143 @@
+from array import array
+import random
+
+# replacement policies of a set associative cache
+LRU = 'lru'
+PLRU = 'plru'
+FIFO = 'fifo'
+RANDOM = 'random'
+
+
+class ReplacementPolicy():
+    """Keeps the replacement state of every set in flat typed arrays, way w of
+        set s is at s * ways + w. A hit calls access, a fill calls insert and a
+        miss with no free line asks for the victim.
+    """
+
+    def __init__(self, sets, ways):
+        self._SETS = sets
+        self._WAYS = ways
+
+    def access(self, set_index, way):
+        """The way of the set has been read or written"""
+        return
+
+    def insert(self, set_index, way):
+        """A new block has been placed in the way of the set"""
+        self.access(set_index, way)
+
+    def victim(self, set_index):
+        """Chooses the way of the set to replace
+
+        Args:
+            set_index (int): Index of the set
+
+        Returns:
+            int: The way
+        """
+        raise NotImplementedError
+
+
+class LRUPolicy(ReplacementPolicy):
+    """Least recently used, every line keeps the time of its last access"""
+
+    def __init__(self, sets, ways):
+        super().__init__(sets, ways)
+        self._stamps = array('Q', [0]) * (sets * ways)
+        self._clock = 0
+
+    def access(self, set_index, way):
+        self._clock += 1
+        self._stamps[set_index * self._WAYS + way] = self._clock
+
+    def victim(self, set_index):
+        base = set_index * self._WAYS
+        stamps = self._stamps[base:base + self._WAYS]
+        return stamps.index(min(stamps))
+
+
+class FIFOPolicy(LRUPolicy):
+    """First in first out, every line keeps the time it was filled"""
+
+    def access(self, set_index, way):
+        return
+
+    def insert(self, set_index, way):
+        super().access(set_index, way)
+
+
+class TreePLRUPolicy(ReplacementPolicy):
+    """Tree pseudo least recently used, each set keeps ways - 1 bits of a binary
+        tree where every bit points to the half of its subtree to replace next
+    """
+
+    def __init__(self, sets, ways):
+        if (ways & (ways - 1) != 0):
+            raise Exception('Tree PLRU needs a power of two ways, got {}'.format(ways))
+        super().__init__(sets, ways)
+        self._NODES = max(ways - 1, 1)
+        self._bits = array('B', [0]) * (sets * self._NODES)
+
+    def access(self, set_index, way):
+        base = set_index * self._NODES
+        node = 0
+        half = self._WAYS >> 1
+        while (half):
+            upper = way & half
+            # point away from the accessed half
+            self._bits[base + node] = 0 if upper else 1
+            node = 2 * node + (2 if upper else 1)
+            half >>= 1
+
+    def victim(self, set_index):
+        base = set_index * self._NODES
+        node = 0
+        way = 0
+        half = self._WAYS >> 1
+        while (half):
+            if (self._bits[base + node]):
+                way |= half
+                node = 2 * node + 2
+            else:
+                node = 2 * node + 1
+            half >>= 1
+        return way
+
+
+class RandomPolicy(ReplacementPolicy):
+    """Replaces a random way, seeded so runs are repeatable. Every set draws from
+        its own generator, so the victims of a set only depend on the misses of that
+        set and a sharded simulation chooses the same victims as a serial one.
+    """
+
+    def __init__(self, sets, ways, seed=0):
+        super().__init__(sets, ways)
+        self._seed = seed
+        # set index -> generator, created at the first victim of the set
+        self._randoms = {}
+
+    def victim(self, set_index):
+        generator = self._randoms.get(set_index)
+        if (generator is None):
+            generator = random.Random(self._seed * self._SETS + int(set_index))
+            self._randoms[set_index] = generator
+        return generator.randrange(self._WAYS)
+
+
+POLICIES = {LRU: LRUPolicy, PLRU: TreePLRUPolicy, FIFO: FIFOPolicy, RANDOM: RandomPolicy}
+
+
+def create_policy(policy, sets, ways):
+    """Creates the replacement policy with the given name
+
+    Args:
+        policy (string): One of (lru, plru, fifo, random)
+        sets (int): Number of sets
+        ways (int): Number of lines in each set
+
+    Returns:
+        ReplacementPolicy: The policy
+    """
+    if (policy not in POLICIES):
+        raise Exception('Unknown replacement policy {}, expected ({})'.format(policy, ', '.join(POLICIES)))
+    return POLICIES[policy](sets, ways)
@@ -0,0 +1,48 @@
+from cachesimulator.cache import Cache
+from cachesimulator.replacement import create_policy, LRU
+from cachesimulator import MSI
+
+import cachesimulator.Logger
+import logging
+
+logger = logging.getLogger('cachesimulator.Logger')
+
+class SetAssociativeCache(Cache):
+    """Cache whose lines are grouped into sets of `ways` lines, an address can be
+        held by any line of the set of its index. A miss fills a line which is not
+        valid or has been invalidated, otherwise the replacement policy chooses
+        the victim whose address becomes the stored address. With a single way
+        it behaves exactly like Cache.
+    """
+
+    def __init__(self, id, directory=None, ways=4, policy=LRU, config=None, statistic=None, optimizer=None):
+        self._WAYS = ways
+        super().__init__(id, directory=directory, config=config, statistic=statistic, optimizer=optimizer)
+        if (self._SETS * ways != self._CACHE_SIZE or self._SETS & (self._SETS - 1) != 0):
+            raise Exception('Cache of {} lines can not have {} ways, expected a power of two number of sets'.format(self._CACHE_SIZE, ways))
+        self.policy = create_policy(policy, self._SETS, ways)
+
+    def _get_line(self, tag, index):
+        # way w of set s is line s * ways + w
+        base = index * self._WAYS
+        free_way = -1
+        for way in range(self._WAYS):
+            line = self._cachelines[base + way]
+            if (line.tag == tag and line.valid):
+                self.policy.access(index, way)
+                return line
+            if (free_way < 0 and (not line.valid or line.state == MSI.INVALID)):
+                free_way = way
+        # miss, the line is filled straight after so the new block is inserted now
+        way = free_way if (free_way >= 0) else self.policy.victim(index)
+        self.policy.insert(index, way)
+        return self._cachelines[base + way]
+
+    def _probe_line(self, tag, index):
+        base = index * self._WAYS
+        for way in range(self._WAYS):
+            line = self._cachelines[base + way]
+            if (line.tag == tag and line.valid):
+                return line
+        # no line holds the tag, callers check the tag themselves
+        return self._cachelines[base]
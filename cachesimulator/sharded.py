@@ -0,0 +1,121 @@
+from cachesimulator.binary_trace import stream_columns
+from cachesimulator.config import SimulatorConfig
+from cachesimulator.directory import Directory
+from cachesimulator.sparse_directory import SparseDirectory
+from cachesimulator.cache import Cache
+from cachesimulator.simulator import create_system, run_trace
+from cachesimulator.statistics import Statistic
+from cachesimulator.shared_trace import SharedTrace
+from cachesimulator.sweep import load_trace
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import repeat
+import numpy as np
+import os
+import logging
+
+logger = logging.getLogger('cachesimulator.Logger')
+
+# shared trace a worker is attached to, set once by the pool initializer
+_TRACE = None
+
+
+def shard_ids(addresses, shards, offset_bits, sets):
+    """Gets the shard of every address, every address of a cache set is in the
+        same shard
+
+    Args:
+        addresses (np.ndarray): address of each entry
+        shards (int): number of shards
+        offset_bits (int): number of offset bits
+        sets (int): number of sets in a cache
+
+    Returns:
+        np.ndarray: shard of each entry
+    """
+    return ((addresses >> offset_bits) & (sets - 1)) % shards
+
+
+def select_shard(columns, shard, shards, offset_bits, sets):
+    """Gets the accesses of one shard in trace order, (p, v, h) are dropped
+
+    Args:
+        columns (tuple(np.ndarray)): uids, commands and addresses of the trace
+        shard (int): the shard to select
+        shards (int): number of shards
+
+    Returns:
+        tuple(np.ndarray): uids, commands and addresses of the shard
+    """
+    uids, commands, addresses = columns
+    selected = np.flatnonzero((uids >= 0) & (shard_ids(addresses, shards, offset_bits, sets) == shard))
+    return uids[selected], commands[selected], addresses[selected]
+
+
+def simulate_shard(columns, shard, shards, optimize=False, cache_class=Cache, directory_class=Directory, config=None, latency=None):
+    """Simulates the accesses of one shard on a new system
+
+    Returns:
+        Statistic: The statistics of the shard
+    """
+    directory, caches = create_system(config, optimize, cache_class, directory_class, latency)
+    shard_columns = select_shard(columns, shard, shards, caches[0].config.offset_bits, caches[0].sets)
+    return run_trace(stream_columns(*shard_columns), caches)
+
+
+def _initialise_worker(handle):
+    global _TRACE
+    # keep the trace so the block stays mapped for the life of the worker
+    _TRACE = SharedTrace.attach(handle)
+
+
+def _simulate_worker_shard(shard, shards, optimize, cache_class, directory_class, config, latency):
+    return simulate_shard(_TRACE.columns, shard, shards, optimize, cache_class, directory_class, config, latency)
+
+
+def simulate_sharded(trace_file, optimize=False, shards=None, workers=None, cache_class=Cache, directory_class=Directory, config=None, latency=None):
+    """Simulates the trace with its cache sets split into shards which are simulated in
+        parallel and their statistics merged. A cache set only interacts with the same
+        set of the other caches, so the statistics are identical to simulate. The
+        directory must not couple sets, so SparseDirectory can not be sharded, and
+        the (p, v, h) commands are dropped. Every set of a random replacement policy
+        has its own generator, so it is sharded exactly too.
+
+    Args:
+        trace_file (string): Path to the trace or a trace in memory, see load_trace
+        optimize (bool): Use MESI rather than MSI
+        shards (int): number of shards, defaults to the number of workers
+        workers (int): number of processes, defaults to the number of cpus, 1 simulates
+            the shards one after the other in this process
+        cache_class (type): Class of the caches
+        directory_class (type): Class of the directory
+        config (SimulatorConfig): Geometry of the system, the defaults if not given
+        latency (Latency): Clock cycles of each action, the defaults if not given
+
+    Returns:
+        Statistic: The merged statistics
+    """
+    directory_type = directory_class.func if (isinstance(directory_class, partial)) else directory_class
+    if (isinstance(directory_type, type) and issubclass(directory_type, SparseDirectory)):
+        raise Exception('A SparseDirectory evicts entries across cache sets, so it can not be sharded')
+    if (config is None):
+        config = SimulatorConfig()
+    if (workers is None):
+        workers = os.cpu_count()
+    if (shards is None):
+        shards = workers
+    if (workers <= 1):
+        columns = load_trace(trace_file)
+        statistics = [simulate_shard(columns, shard, shards, optimize, cache_class, directory_class, config, latency)
+                      for shard in range(shards)]
+    else:
+        arguments = (repeat(shards), repeat(optimize), repeat(cache_class), repeat(directory_class),
+                     repeat(config), repeat(latency))
+        with SharedTrace.create(load_trace(trace_file)) as trace:
+            with ProcessPoolExecutor(max_workers=min(workers, shards), initializer=_initialise_worker, initargs=(trace.handle,)) as executor:
+                statistics = list(executor.map(_simulate_worker_shard, range(shards), *arguments))
+
+    merged = Statistic(latency)
+    for statistic in statistics:
+        merged.merge(statistic)
+    return merged
@@ -0,0 +1,95 @@
+from multiprocessing import shared_memory
+import numpy as np
+import sys
+
+# dtypes of the columns, largest first so every column stays aligned
+COLUMN_DTYPES = [('address', np.int64), ('uid', np.int16), ('command', np.int8)]
+
+
+class SharedTrace():
+    """A decoded trace whose processor id, opcode and address columns live in one
+        shared memory block. The process which creates it owns the block, other
+        processes attach to it by name without copying, so there is a single copy
+        of the trace however many workers read it.
+
+        SharedTrace.create(columns) copies the columns in, SharedTrace.attach(handle)
+        maps them in a process started by the creator, where handle is the
+        picklable (name, length).
+    """
+
+    def __init__(self, memory, length, owner):
+        self._memory = memory
+        self.length = length
+        self.owner = owner
+        # views of the block, one after another
+        self._columns = {}
+        offset = 0
+        for name, dtype in COLUMN_DTYPES:
+            self._columns[name] = np.ndarray((length,), dtype=dtype, buffer=memory.buf, offset=offset)
+            offset += length * np.dtype(dtype).itemsize
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+        if (self.owner):
+            self.unlink()
+
+    @classmethod
+    def create(self, columns):
+        """Copies the columns of a decoded trace into a new shared memory block
+
+        Args:
+            columns (tuple(np.ndarray)): uids, commands and addresses
+
+        Returns:
+            SharedTrace: The trace, owning the block
+        """
+        uids, commands, addresses = columns
+        length = len(uids)
+        size = sum(length * np.dtype(dtype).itemsize for name, dtype in COLUMN_DTYPES)
+        # a block can not be empty
+        memory = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        trace = SharedTrace(memory, length, owner=True)
+        trace._columns['uid'][:] = uids
+        trace._columns['command'][:] = commands
+        trace._columns['address'][:] = addresses
+        return trace
+
+    @classmethod
+    def attach(self, handle):
+        """Maps the shared memory block of a trace created by another process
+
+        Args:
+            handle (tuple): (name, length) of the trace
+
+        Returns:
+            SharedTrace: The trace, the block is not unlinked when it is closed
+        """
+        name, length = handle
+        if (sys.version_info >= (3, 13)):
+            memory = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            # workers share the resource tracker of the creator, so the block is
+            # already tracked and is only removed by the creator
+            memory = shared_memory.SharedMemory(name=name)
+        return SharedTrace(memory, length, owner=False)
+
+    def close(self):
+        """Unmaps the block, the columns can not be used afterwards"""
+        self._columns = {}
+        self._memory.close()
+
+    def unlink(self):
+        """Frees the block once every process has closed it, only the owner unlinks"""
+        self._memory.unlink()
+
+    @property
+    def handle(self):
+        return (self._memory.name, self.length)
+
+    @property
+    def columns(self):
+        """tuple(np.ndarray): uids, commands and addresses"""
+        return (self._columns['uid'], self._columns['command'], self._columns['address'])
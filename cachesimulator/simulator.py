@@ -0,0 +1,127 @@
+from cachesimulator.trace_parser import parse
+from cachesimulator.binary_trace import stream_binary, stream_chunks, is_path, BINARY_EXTENSION
+from cachesimulator.config import SimulatorConfig
+from cachesimulator.directory import Directory
+from cachesimulator.cache import Cache
+from cachesimulator.statistics import Statistic
+from cachesimulator.optimizer import Optimizer
+from cachesimulator.tracer import Tracer, LoggingSink
+import logging
+import os
+
+logger = logging.getLogger('cachesimulator.Logger')
+
+
+def create_system(config=None, optimize=False, cache_class=Cache, directory_class=Directory, latency=None):
+    """Creates the directory and caches of a simulation, they share a new Statistic
+        and Optimizer so several systems can be simulated at once
+
+    Args:
+        config (SimulatorConfig): Geometry of the system, the defaults if not given
+        optimize (bool): Use MESI rather than MSI
+        cache_class (type): Class of the caches
+        directory_class (type): Class of the directory
+        latency (Latency): Clock cycles of each action, the defaults if not given
+
+    Returns:
+        directory (Directory): The directory
+        caches (list(Cache)): The caches in order of id
+    """
+    if (config is None):
+        config = SimulatorConfig()
+    directory = directory_class(config=config, statistic=Statistic(latency), optimizer=Optimizer(optimize))
+    caches = [cache_class(x, directory=directory) for x in range(config.number_of_caches)]
+    for c in caches:
+        directory.append_sharer(c)
+    return directory, caches
+
+
+def read_trace(trace_file, trace_cache=None, caches=None):
+    """Gets the entries of the trace, they are decoded lazily as the simulation runs
+
+    Args:
+        trace_file (string or os.PathLike): Path to the trace, or the column arrays of a
+            trace or an iterable of chunks of them e.g. a generated workload
+        trace_cache (TraceCache): Decoded traces kept on disk, not used if None
+        caches (list(Cache)): The caches, needed for the geometry of a trace cache
+
+    Returns:
+        generator: The entries [cache.id, command, address] or with the tag and index
+    """
+    if (not is_path(trace_file)):
+        # a trace in memory is simulated straight from its columns, nothing to parse
+        return stream_chunks(trace_file)
+    trace_file = os.fspath(trace_file)
+    if (trace_cache is not None):
+        # replay the trace with the tag and index of every access already decoded,
+        # the index is of the set when the caches are set associative
+        return trace_cache.stream(trace_file, line_size=caches[0].config.line_size, cache_size=caches[0].sets)
+    elif (trace_file.endswith(BINARY_EXTENSION)):
+        # replay a converted trace straight from its memory map
+        return stream_binary(trace_file)
+    else:
+        return parse(trace_file, stream=True)
+
+
+def run_trace(entries, caches, tracer=None):
+    """Runs the entries of a trace through the caches
+
+    Args:
+        entries (iterable): The entries [cache.id, command, address, ...]
+        caches (list(Cache)): The caches in order of id
+        tracer (Tracer): Traces the events of the caches, v toggles logging them
+
+    Returns:
+        Statistic: The statistics of the caches
+    """
+    statistic = caches[0].statistic
+    if (tracer is None):
+        tracer = Tracer()
+    tracer.attach(caches)
+    verbose = LoggingSink()
+    for entry in entries:
+        # decoded traces also give the tag and index of the address
+        cache_id, command, address, *parameters = entry
+        cache = caches[cache_id]
+
+        # check the command
+        if (command == 'R'):
+            statistic.add_instructions()
+            cache.read(address, *parameters)
+            statistic.end_instruction()
+        elif(command == 'W'):
+            statistic.add_instructions()
+            cache.write(address, *parameters)
+            statistic.end_instruction()
+        # deal with other stuff
+        elif(command == 'v'):
+            # log the events until the next v, nothing is traced without sinks
+            verbose_logging = tracer.toggle_sink(verbose)
+            logger.setLevel(logging.INFO if (verbose_logging) else logging.WARNING)
+        elif(command == 'h'):
+            print(f"Hit Rate: {statistic.hit_rate()}")
+        elif(command == 'p'):
+            for c in caches:
+                contents = c.cache_contents()
+                print(f"Cache {c} contents:\n{contents}")
+    return statistic
+
+
+def simulate(trace_file, optimize=False, trace_cache=None, cache_class=Cache, directory_class=Directory, config=None, latency=None, tracer=None):
+    """Simulates the trace on a new system, nothing is printed or saved
+
+    Args:
+        trace_file (string): Path to the trace or a trace in memory, see read_trace
+        optimize (bool): Use MESI rather than MSI
+        trace_cache (TraceCache): Decoded traces kept on disk, not used if None
+        cache_class (type): Class of the caches
+        directory_class (type): Class of the directory
+        config (SimulatorConfig): Geometry of the system, the defaults if not given
+        latency (Latency): Clock cycles of each action, the defaults if not given
+        tracer (Tracer): Traces the events of the simulation, see run_trace
+
+    Returns:
+        Statistic: The statistics of the simulation
+    """
+    directory, caches = create_system(config, optimize, cache_class, directory_class, latency)
+    return run_trace(read_trace(trace_file, trace_cache, caches), caches, tracer)
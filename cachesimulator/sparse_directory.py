@@ -0,0 +1,352 @@
+from cachesimulator.bitvector_directory import BitVectorDirectory, popcount
+from collections import OrderedDict
+import logging
+logger = logging.getLogger('cachesimulator.Logger')
+
+# sharer encodings of a directory entry
+FULL_MAP = 'full'
+LIMITED_POINTER = 'pointer'
+COARSE_VECTOR = 'coarse'
+
+
+class SparseDirectory(BitVectorDirectory):
+    """Directory with a fixed number of entries organised as a set associative
+        structure, so its memory stays bounded however many blocks the trace touches.
+        When a set is full the least recently used entry is evicted and the block
+        is recalled from every cache the entry covers.
+
+        Each entry stores its sharers with one of the encodings
+            full: a bit per cache, exact
+            pointer: up to `pointers` cache ids, once they overflow the entry
+                falls back to broadcasting to every cache
+            coarse: a bit per group of `group_size` caches
+        An imprecise entry does not know which of the caches it covers hold the
+        block, so a miss is forwarded to every one of them and pays for it: the
+        probes, Invalidations-sent and the processor hops are of the whole set of
+        candidates. The candidates holding the block answer, the closest sends the
+        data, and memory does when none of them do.
+    """
+
+    def __init__(self, entries=1024, ways=4, encoding=FULL_MAP, pointers=2, group_size=2, config=None, statistic=None, optimizer=None):
+        super().__init__(config=config, statistic=statistic, optimizer=optimizer)
+        if (entries % ways != 0):
+            raise Exception('Directory entries {} must be a multiple of the ways {}'.format(entries, ways))
+        self._SETS = entries // ways
+        self._WAYS = ways
+        # block address -> sharer encoding of each set, least recently used first
+        self._sets = [OrderedDict() for _ in range(self._SETS)]
+        if (encoding == FULL_MAP):
+            self.encoding = FullMapEncoding()
+        elif (encoding == LIMITED_POINTER):
+            self.encoding = LimitedPointerEncoding(pointers)
+        elif (encoding == COARSE_VECTOR):
+            self.encoding = CoarseVectorEncoding(group_size)
+        else:
+            raise Exception('Unknown directory encoding {}, expected ({}, {}, {})'.format(encoding, FULL_MAP, LIMITED_POINTER, COARSE_VECTOR))
+
+    def read_miss(self, cache, address, stored_address):
+        candidates = self._inexact_candidates(cache, address)
+        if (candidates is None):
+            return super().read_miss(cache, address, stored_address)
+        self._optimize_check(stored_address, cache)
+        self.statistic.directory_access()
+        # the request is forwarded to every candidate, the holders downgrade their copy
+        holders = self._forward(candidates, address)
+        self._send_remote_read_miss(holders, address)
+        self.statistic.directory_request()
+        self.statistic.cache_probe()
+        self.statistic.processor_hop(self._get_furthest_distance(candidates, cache))
+        if (len(holders) != 0):
+            self._get_closest_cache(holders, cache).send_line(cache, address)
+            self.statistic.cache_access()
+            self.statistic.remote_access()
+        else:
+            # none of the candidates hold the block, memory sends the data
+            self.statistic.memory_access()
+            self.statistic.directory_request()
+            self.statistic.off_chip_access()
+        self._remove_sharer(cache, stored_address)
+        self._add_sharer(cache, address)
+        return len(holders)
+
+    def write_miss(self, cache, address, need_data, stored_address):
+        candidates = self._inexact_candidates(cache, address)
+        if (candidates is None):
+            return super().write_miss(cache, address, need_data, stored_address)
+        if (need_data):
+            self.statistic.write_miss_data_needed()
+        self._optimize_check(stored_address, cache)
+        self.statistic.directory_access()
+        # every candidate is sent an invalidation and acknowledges it, the holders
+        # invalidate their copy and the closest of them sends the data
+        holders = self._forward(candidates, address)
+        self.statistic.directory_request()
+        self._send_invalidations(cache, candidates, address)
+        if (need_data):
+            if (len(holders) != 0):
+                self._get_closest_cache(holders, cache).send_line(cache, address)
+                # the data access overlaps with the acknowledgements of the others
+                if (len(candidates) == 1):
+                    self.statistic.cache_access()
+            else:
+                self.statistic.memory_access()
+                self.statistic.off_chip_access()
+        self.statistic.cache_probe()
+        self.statistic.processor_hop(self._get_furthest_distance(candidates, cache))
+        self.statistic.invalidation_sent(len(candidates))
+        self.statistic.remote_access()
+        self._remove_sharer(cache, stored_address)
+        self._set_only_sharer(cache, address)
+        return len(candidates)
+
+    def _inexact_candidates(self, cache, address):
+        """Gets the other caches an imprecise entry of the address covers
+
+        Returns:
+            list(Cache): The caches in order of id, None if the entry is exact, missing
+                or covers no other cache
+        """
+        entry = self._lookup(address >> self._OFFSET_BITS)
+        if (entry is None or self.encoding.exact(entry)):
+            return None
+        mask = self.encoding.candidates(entry, self._all_caches()) & ~(1 << cache.id)
+        return self._mask_caches(mask) if (mask) else None
+
+    def _forward(self, caches, address):
+        """Forwards a request to the caches, each answers whether it holds the block
+
+        Returns:
+            list(Cache): The caches holding the address
+        """
+        return [c for c in caches if (c.contains_address(address))]
+
+    # -- Entries -- #
+    def _peek(self, block):
+        """Gets the entry of the block without touching it
+
+        Returns:
+            The sharer encoding, None if the block has no entry
+        """
+        return self._sets[block % self._SETS].get(block)
+
+    def _lookup(self, block):
+        """Gets the entry of the block and makes it the most recently used
+
+        Returns:
+            The sharer encoding, None if the block has no entry
+        """
+        entries = self._sets[block % self._SETS]
+        entry = entries.get(block)
+        if (entry is not None):
+            entries.move_to_end(block)
+        return entry
+
+    def _store(self, block, entry, cache):
+        """Stores the entry of the block, evicting the least recently used entry of
+            the set if it is full
+
+        Args:
+            block (int): Block address
+            entry: The sharer encoding
+            cache (Cache): The cache whose miss needs the entry
+        """
+        entries = self._sets[block % self._SETS]
+        if (block not in entries and len(entries) >= self._WAYS):
+            victim, victim_entry = entries.popitem(last=False)
+            self._evict_entry(victim, victim_entry, cache)
+        entries[block] = entry
+        entries.move_to_end(block)
+
+    def _evict_entry(self, block, entry, cache):
+        """Recalls the evicted block from every cache which may hold it, a holder in M
+            writes it back before invalidating it. The miss which evicted the entry
+            waits for the acknowledgements.
+
+        Args:
+            block (int): Block address of the evicted entry
+            entry: The sharer encoding of the evicted entry
+            cache (Cache): The cache whose miss evicted the entry
+        """
+        address = block << self._OFFSET_BITS
+        candidates = self._mask_caches(self.encoding.candidates(entry, self._all_caches()))
+        self.statistic.directory_eviction()
+        if (len(candidates) == 0):
+            return
+        self.statistic.directory_request()
+        for c in candidates:
+            # a holder in M downgrades to S with a coherence writeback
+            c.remote_read_miss(address)
+            c.invalidate_line(address, cache)
+        self.statistic.cache_probe()
+        self.statistic.processor_hop(self._get_furthest_distance(candidates, cache))
+        self.statistic.invalidation_sent(len(candidates))
+
+    def _add_sharer(self, cache, address):
+        block = address >> self._OFFSET_BITS
+        entry = self._lookup(block)
+        if (entry is None):
+            entry = self.encoding.empty()
+        self._store(block, self.encoding.add(entry, cache.id), cache)
+
+    def _set_only_sharer(self, cache, address):
+        self._store(address >> self._OFFSET_BITS, self.encoding.add(self.encoding.empty(), cache.id), cache)
+
+    def _remove_sharer(self, cache, address):
+        if (address is None):
+            return
+        block = address >> self._OFFSET_BITS
+        entries = self._sets[block % self._SETS]
+        entry = entries.get(block)
+        if (entry is None):
+            return
+        entry = self.encoding.remove(entry, cache.id)
+        if (not self.encoding.exact(entry)):
+            # the other sharers are not known, poll them so the entry shrinks back
+            # and is freed once the last of them has left
+            mask = self.encoding.candidates(entry, self._all_caches()) & ~(1 << cache.id)
+            entry = self.encoding.empty()
+            for c in self._forward(self._mask_caches(mask), address):
+                entry = self.encoding.add(entry, c.id)
+        if (self.encoding.is_empty(entry)):
+            # free the entry, no cache holds the block
+            del entries[block]
+        else:
+            entries[block] = entry
+
+    def _sharer_mask(self, cache, address):
+        # an imprecise entry can only give the caches which may hold the block
+        entry = self._lookup(address >> self._OFFSET_BITS)
+        if (entry is None):
+            return 0
+        return self.encoding.candidates(entry, self._all_caches()) & ~(1 << cache.id)
+
+    def sharer_count(self, address):
+        """Gets the number of caches the entry of the address covers, of an imprecise
+            entry every cache which may hold the block
+        """
+        entry = self._peek(address >> self._OFFSET_BITS)
+        if (entry is None):
+            return 0
+        return popcount(self.encoding.candidates(entry, self._all_caches()))
+
+    def _mask_caches(self, mask):
+        """Gets the caches of the bitmask in order of id
+
+        Returns:
+            list(Cache): The caches
+        """
+        caches = []
+        while (mask):
+            lowest = mask & -mask
+            caches.append(self._caches[lowest.bit_length() - 1])
+            mask ^= lowest
+        return caches
+
+    def _all_caches(self):
+        """Gets the bitmask of every cache
+
+        Returns:
+            int: bitmask of the caches
+        """
+        return (1 << len(self._caches)) - 1
+
+    @property
+    def size(self):
+        """Number of entries in use"""
+        return sum(len(entries) for entries in self._sets)
+
+
+class FullMapEncoding():
+    """A bit for each cache"""
+
+    def empty(self):
+        return 0
+
+    def is_empty(self, entry):
+        return entry == 0
+
+    def add(self, entry, cache_id):
+        return entry | (1 << cache_id)
+
+    def remove(self, entry, cache_id):
+        return entry & ~(1 << cache_id)
+
+    def candidates(self, entry, all_caches):
+        return entry
+
+    def exact(self, entry):
+        return True
+
+
+class LimitedPointerEncoding():
+    """Up to a fixed number of cache ids, broadcasting to every cache once they overflow"""
+    BROADCAST = -1
+
+    def __init__(self, pointers):
+        self.pointers = pointers
+
+    def empty(self):
+        return ()
+
+    def is_empty(self, entry):
+        return entry == ()
+
+    def add(self, entry, cache_id):
+        if (entry == self.BROADCAST or cache_id in entry):
+            return entry
+        if (len(entry) >= self.pointers):
+            return self.BROADCAST
+        return entry + (cache_id,)
+
+    def remove(self, entry, cache_id):
+        if (entry == self.BROADCAST):
+            # the other sharers are not known, the directory polls them
+            return entry
+        return tuple(c for c in entry if c != cache_id)
+
+    def candidates(self, entry, all_caches):
+        if (entry == self.BROADCAST):
+            return all_caches
+        mask = 0
+        for c in entry:
+            mask |= 1 << c
+        return mask
+
+    def exact(self, entry):
+        return entry != self.BROADCAST
+
+
+class CoarseVectorEncoding():
+    """A bit for each group of caches, a bit can not be cleared while the
+        other caches of the group might still hold the block
+    """
+
+    def __init__(self, group_size):
+        self.group_size = group_size
+        self._GROUP_MASK = (1 << group_size) - 1
+
+    def empty(self):
+        return 0
+
+    def is_empty(self, entry):
+        return entry == 0
+
+    def add(self, entry, cache_id):
+        return entry | (1 << (cache_id // self.group_size))
+
+    def remove(self, entry, cache_id):
+        if (self.group_size == 1):
+            return entry & ~(1 << cache_id)
+        return entry
+
+    def candidates(self, entry, all_caches):
+        mask = 0
+        group = 0
+        while (entry >> group):
+            if ((entry >> group) & 1):
+                mask |= self._GROUP_MASK << (group * self.group_size)
+            group += 1
+        return mask & all_caches
+
+    def exact(self, entry):
+        return self.group_size == 1
@@ -0,0 +1,198 @@
+from cachesimulator.config import SimulatorConfig
+from cachesimulator.sweep import load_trace, save_table
+from cachesimulator.trace_parser import COMMAND_CODES
+import numpy as np
+import heapq
+import sys
+import logging
+
+logger = logging.getLogger('cachesimulator.Logger')
+
+# distance of an access whose line was never used by the cache before
+COLD = -1
+# distance of an access whose line was invalidated by a write of another cache
+INVALIDATED = -2
+# distance of a write to a line the cache does not hold modified at any size, MSI
+# asks the directory to invalidate the other copies however large the cache is
+UPGRADE = -3
+
+
+class FenwickTree:
+    """Binary indexed tree over the timestamps of a cache, a timestamp is 1 while it
+        is the last use of a line or a hole still in the stack
+    """
+
+    def __init__(self, size):
+        self._tree = [0] * (size + 1)
+
+    def add(self, position, delta):
+        position += 1
+        while (position < len(self._tree)):
+            self._tree[position] += delta
+            position += position & -position
+
+    def prefix(self, position):
+        """Gets the sum of the first positions
+
+        Args:
+            position (int): number of positions to sum
+
+        Returns:
+            int: The sum
+        """
+        total = 0
+        while (position > 0):
+            total += self._tree[position]
+            position -= position & -position
+        return total
+
+
+def stack_distances(columns, config=None):
+    """Gets the distance of every access in one pass, the smallest fully associative
+        LRU cache for which the access is private under MSI is one line larger.
+        Every cache has its own LRU stack of lines and holes. A write of another cache
+        turns the line into a hole, as the Directory invalidates the copy and leaves
+        its line free, so it keeps its depth rather than moving the lines below it up.
+        An access pushes the lines above it down until the first hole, which it fills,
+        so the top lines of the stack are the contents of a cache of that many lines.
+        The distance of a read is its depth, the number of lines and holes above it.
+        A write is only private while the line is modified, that is since the last
+        write of the cache no other cache read it and every access of the cache to it
+        was a hit, so its distance is the largest depth of those accesses.
+
+    Args:
+        columns (tuple(np.ndarray)): uids, commands and addresses of the trace
+        config (SimulatorConfig): Geometry of the system, the defaults if not given
+
+    Returns:
+        uids (np.ndarray): cache of each access, (p, v, h) are dropped
+        distances (np.ndarray): distance of each access, COLD or INVALIDATED if the
+            line is not in the stack and UPGRADE for a write to a line which is not modified
+    """
+    if (config is None):
+        config = SimulatorConfig()
+    uids, commands, addresses = columns
+    selected = np.flatnonzero((commands == COMMAND_CODES['R']) | (commands == COMMAND_CODES['W']))
+    uids = uids[selected]
+    writes = commands[selected] == COMMAND_CODES['W']
+    lines = addresses[selected] >> config.offset_bits
+
+    caches = range(config.number_of_caches)
+    trees = [FenwickTree(count) for count in np.bincount(uids, minlength=config.number_of_caches)]
+    # line -> timestamp of its last use, for the lines in the stack of each cache
+    last_uses = [{} for _ in caches]
+    # negated timestamps of the holes of each cache, the top hole first
+    holes = [[] for _ in caches]
+    invalidated = [set() for _ in caches]
+    # line -> largest depth of an access since the cache last wrote it, while it is modified
+    modified = [{} for _ in caches]
+    clocks = [0 for _ in caches]
+    distances = []
+    for uid, write, line in zip(uids.tolist(), writes.tolist(), lines.tolist()):
+        tree = trees[uid]
+        last_use = last_uses[uid]
+        cache_holes = holes[uid]
+        now = clocks[uid]
+        previous = last_use.get(line)
+        if (previous is None):
+            if (line in invalidated[uid]):
+                invalidated[uid].discard(line)
+                distance = INVALIDATED
+            else:
+                distance = COLD
+            # the line fills the top hole, or the stack grows
+            if (len(cache_holes) != 0):
+                tree.add(-heapq.heappop(cache_holes), -1)
+        else:
+            # every line and hole in the stack was last used before now
+            distance = tree.prefix(now) - tree.prefix(previous + 1)
+            if (len(cache_holes) != 0 and -cache_holes[0] > previous):
+                # the lines above the top hole move down into it, the line leaves a hole
+                tree.add(-heapq.heapreplace(cache_holes, -previous), -1)
+            else:
+                tree.add(previous, -1)
+        tree.add(now, 1)
+        last_use[line] = now
+        clocks[uid] = now + 1
+
+        if (write):
+            depth = modified[uid].get(line)
+            if (distance >= 0):
+                distance = UPGRADE if (depth is None) else max(depth, distance)
+            # the write makes the line modified at every size
+            modified[uid][line] = 0
+            for other in caches:
+                if (other != uid):
+                    modified[other].pop(line, None)
+                    previous = last_uses[other].pop(line, None)
+                    if (previous is not None):
+                        heapq.heappush(holes[other], -previous)
+                        invalidated[other].add(line)
+        else:
+            if (line in modified[uid]):
+                # a read miss would fetch the line shared
+                modified[uid][line] = max(modified[uid][line], distance)
+            for other in caches:
+                if (other != uid):
+                    # a remote read miss makes a modified line shared
+                    modified[other].pop(line, None)
+        distances.append(distance)
+    return uids, np.array(distances, dtype=np.int64)
+
+
+def hit_counts(distances, sizes):
+    """Gets the hits of fully associative LRU caches of each size, an access hits when
+        its stack distance is less than the number of lines
+
+    Args:
+        distances (np.ndarray): stack distance of each access
+        sizes (list(int)): number of lines of each cache
+
+    Returns:
+        list(int): The hits of each size
+    """
+    histogram = np.bincount(distances[distances >= 0], minlength=max(sizes))
+    hits = np.concatenate(([0], np.cumsum(histogram)))
+    return [int(hits[min(size, len(histogram))]) for size in sizes]
+
+
+def capacity_curve(trace_file, sizes=None, config=None):
+    """Gets the private hits and misses of every cache size from a single pass over the
+        trace. The caches are fully associative LRU, a SetAssociativeCache with one set,
+        following MSI with the invalidations of the Directory. A miss counts every
+        access which is not private, including a write to a shared line.
+
+    Args:
+        trace_file (string): Path to a text, compressed or binary trace
+        sizes (list(int)): number of lines of each cache, the powers of two until every
+            access that can hit does, at least to the cache size of the config
+        config (SimulatorConfig): Geometry of the system, the defaults if not given
+
+    Returns:
+        list(dict): A row for each size
+    """
+    if (config is None):
+        config = SimulatorConfig()
+    uids, distances = stack_distances(load_trace(trace_file), config)
+    if (sizes is None):
+        largest = max(config.cache_size, int(distances.max(initial=0)) + 1)
+        sizes = [1 << bits for bits in range((largest - 1).bit_length() + 1)]
+    rows = []
+    for size, hits in zip(sizes, hit_counts(distances, sizes)):
+        rows.append({
+            'cache_size': size,
+            'Private-hits': hits,
+            'Misses': len(distances) - hits,
+            'Hit-rate': hits / len(distances) if (len(distances) != 0) else 0,
+        })
+    return rows
+
+
+if __name__ == '__main__':
+
+    args = sys.argv[1:]
+    # the trace and the table to write
+    trace_file = args[0]
+    table_path = args[1]
+
+    save_table(capacity_curve(trace_file), table_path)
@@ -1,5 +1,8 @@
+from array import array
 import logging
 import os
+from cachesimulator.binary_trace import BINARY_EXTENSION
+from cachesimulator.trace_parser import strip_compression
 logger = logging.getLogger('cachesimulator.Logger')
 
 class Latency:
@@ -12,170 +15,147 @@ class Latency:
     DIRECTORY_HOP = 5
     MEMORY_ACCESS = 15
 
+    def __init__(self, **latencies):
+        """Latencies of a simulation, any of the constants above can be overridden
+            e.g. Latency(MEMORY_ACCESS=30)
+        """
+        for name, value in latencies.items():
+            if (not name.isupper() or not hasattr(Latency, name)):
+                raise Exception('Unknown latency {}, expected one of ({})'.format(name, ', '.join(LATENCIES)))
+            setattr(self, name, value)
+
+
+# names of the latencies which can be overridden
+LATENCIES = [name for name in vars(Latency) if name.isupper()]
+
+# type of access of an instruction, a private access takes precedence over a remote
+# one which takes precedence over an off chip one
+PRIVATE = 0
+REMOTE = 1
+OFF_CHIP = 2
+
+# a latency histogram has a bucket for each cycle count below this, and one for the rest
+HISTOGRAM_BUCKETS = 1024
+# percentiles of the latency of each type of access in the key statistics
+PERCENTILES = [50, 90, 99]
+
+
+def histogram_percentile(histogram, percentile, max_latency):
+    """Gets the nearest rank percentile of a latency histogram
+
+    Args:
+        histogram (array): count of each latency, the last bucket counts the longer ones
+        percentile (int): percentile from 1 to 100
+        max_latency (int): longest latency in the histogram, given if the percentile
+            is in the overflow bucket
+
+    Returns:
+        int: The latency, 0 if the histogram is empty
+    """
+    total = sum(histogram)
+    if (total == 0):
+        return 0
+    rank = max(1, -(-percentile * total // 100))
+    seen = 0
+    for latency, count in enumerate(histogram):
+        seen += count
+        if (seen >= rank):
+            break
+    return latency if (latency < HISTOGRAM_BUCKETS) else max_latency
+
 
 class Statistic:
-    """This class deals with getting the statistics and saving them
+    """This class deals with getting the statistics and saving them. Every
+        simulation has its own instance, shared by its directory, caches and lines
     """
-    # number of instructions issued
-    INSTRUCTIONS = 0
-
-    # Extra statistics
-    # miss because data is from start of program
-    COMPULSORY_MISSES = 0   
-    # miss when the data required was in the cache previously, but got evicted.
-    CONFLICT_MISSES = 0     
-    # miss occurs due to the limited size of a cache and not the cache's mapping function
-    CAPACITY_MISSES = 0
-    # miss because another cache invalidated the line     
-    COHERENCE_MISSES = 0 
-
-    # Line is in S, and cache wants to write so alerts the directory but there are no sharers 
-    WRITE_MISS_BUT_NO_DATA_NEEDED_AND_NO_SHARERS = 0
-    # line in I, and cache wants to write so alerts directory
-    WRITE_MISS_BUT_DATA_NEEDED = 0
-
-    THREE_HOPS = 0
-    TWO_HOPS = 0
-    ONE_HOPS = 0
-
-    # latency statstics
-    CACHE_PROBES = 0 
-    CACHE_PROBES_PREV = CACHE_PROBES
-    CACHE_ACCESSES = 0
-    CACHE_ACCESSES_PREV = CACHE_ACCESSES 
-    SRAM_ACCESSES = 0 
-    SRAM_ACCESSES_PREV = SRAM_ACCESSES
-    DIRECTORY_ACCESSES = 0 
-    DIRECTORY_ACCESSES_PREV = DIRECTORY_ACCESSES
-    PROCESSOR_HOPS = 0 
-    PROCESSOR_HOPS_PREV = PROCESSOR_HOPS
-    MEMORY_ACCESSES = 0 
-    MEMORY_ACCESSES_PREV = MEMORY_ACCESSES
-    DIRECTORY_HOPS = 0 
-    DIRECTORY_HOPS_PREV = DIRECTORY_HOPS
-
-    # statstics
-    PRIVATE_ACCESSES = 0  
-    PRIVATE_ACCESSES_PREV = PRIVATE_ACCESSES
-    REMOTE_ACCESSES = 0   
-    REMOTE_ACCESSES_PREV = REMOTE_ACCESSES    
-    OFF_CHIP_ACCESS = 0   
-    OFF_CHIP_ACCESS_PREV = OFF_CHIP_ACCESS
-
-    REPLACEMENT_WRITEBACKS = 0
-    COHERENCE_WRITEBACKS = 0
-    INVALIDATIONS_SENT = 0
-
-    AVERAGE_LATENCY = 0
-    PRIV_LATENCIES = []
-    REM_LATENCIES = []
-    OFF_CHIP_LATENCIES = []
-    TOTAL_LATENCY = 0 
-    TOTAL_LATENCY_PREV = TOTAL_LATENCY
-
-    @classmethod
+
+    def __init__(self, latency=None):
+        # clock cycles of each action, the Latency constants if not given
+        self.latency = Latency() if (latency is None) else latency
+        self.reset()
+
     def add_instructions(self):
         self.INSTRUCTIONS += 1
 
-    @classmethod
     def end_instruction(self):
-        """sets all the previous values to current ones
-            and checks which type access (private remote etc)
-            and then stores that latency
+        """Stores the latency of the instruction with its type of access and
+            starts the next instruction
         """
-        instruction_latency = self.compute_current_latency()
-
-        if(self.PRIVATE_ACCESSES != self.PRIVATE_ACCESSES_PREV):
-            self.PRIV_LATENCIES.append(instruction_latency)
-        elif(self.REMOTE_ACCESSES_PREV != self.REMOTE_ACCESSES):
-            self.REM_LATENCIES.append(instruction_latency)
-        elif(self.OFF_CHIP_ACCESS_PREV != self.OFF_CHIP_ACCESS):
-            self.OFF_CHIP_LATENCIES.append(instruction_latency)
+        instruction_latency = self._instruction_latency
+
+        bucket = min(instruction_latency, HISTOGRAM_BUCKETS)
+        if(self._access_type == PRIVATE):
+            self.PRIV_INSTRUCTIONS += 1
+            self.PRIV_LATENCY += instruction_latency
+            self.PRIV_HISTOGRAM[bucket] += 1
+            self.PRIV_MAX_LATENCY = max(self.PRIV_MAX_LATENCY, instruction_latency)
+        elif(self._access_type == REMOTE):
+            self.REM_INSTRUCTIONS += 1
+            self.REM_LATENCY += instruction_latency
+            self.REM_HISTOGRAM[bucket] += 1
+            self.REM_MAX_LATENCY = max(self.REM_MAX_LATENCY, instruction_latency)
+        elif(self._access_type == OFF_CHIP):
+            self.OFF_CHIP_INSTRUCTIONS += 1
+            self.OFF_CHIP_LATENCY += instruction_latency
+            self.OFF_CHIP_HISTOGRAM[bucket] += 1
+            self.OFF_CHIP_MAX_LATENCY = max(self.OFF_CHIP_MAX_LATENCY, instruction_latency)
         else:
             raise Exception(f"No type of access (remote, private or chip) was done for the end of this instruction")
 
-        self.CACHE_PROBES_PREV =        self.CACHE_PROBES
-        self.CACHE_ACCESSES_PREV =      self.CACHE_ACCESSES
-        self.SRAM_ACCESSES_PREV =       self.SRAM_ACCESSES
-        self.DIRECTORY_ACCESSES_PREV =  self.DIRECTORY_ACCESSES
-        self.PROCESSOR_HOPS_PREV =      self.PROCESSOR_HOPS
-        self.MEMORY_ACCESSES_PREV =     self.MEMORY_ACCESSES
-        self.DIRECTORY_HOPS_PREV =      self.DIRECTORY_HOPS
-        # statstics       
-        self.PRIVATE_ACCESSES_PREV = self.PRIVATE_ACCESSES      
-        self.REMOTE_ACCESSES_PREV = self.REMOTE_ACCESSES
-        self.OFF_CHIP_ACCESS_PREV = self.OFF_CHIP_ACCESS
+        self._instruction_latency = 0
+        self._access_type = None
 
 
     # -- Misses -- #
-    @classmethod
     def compulsory_miss(self):
-        logger.debug("-Compulsory miss-")
         self.COMPULSORY_MISSES += 1
 
-    @classmethod
     def conflic_miss(self):
-        logger.debug("-Conflict miss-")
         self.CONFLICT_MISSES += 1
 
-    @classmethod
     def capacity_miss(self):
-        logger.debug("-Capacity miss-")
         self.CAPACITY_MISSES += 1
 
-    @classmethod
     def coherence_miss(self):
-        logger.debug("-Coherence miss-")
         self.COHERENCE_MISSES += 1
     
-    @classmethod
     def three_hops(self):
         self.THREE_HOPS += 1
 
-    @classmethod
     def two_hops(self):
         self.TWO_HOPS += 1
 
-    @classmethod
     def one_hops(self):
         self.ONE_HOPS += 1
 
     # latency requests
-    @classmethod
     def cache_probe(self):
-        logger.info('-Cache probe-')
         self.CACHE_PROBES += 1
+        self._instruction_latency += self.latency.CACHE_PROBE
 
-    @classmethod
     def write_miss_no_sharers(self):
-        logger.debug('-Write miss no need data and no sharers-')
         self.WRITE_MISS_BUT_NO_DATA_NEEDED_AND_NO_SHARERS += 1
 
-    @classmethod
     def write_miss_data_needed(self):
         self.WRITE_MISS_BUT_DATA_NEEDED += 1
     # ------------------------------
 
     # -- Latency Actions -- #
-    @classmethod
     def cache_access(self):
-        logger.info('-Cache access-')
         self.CACHE_ACCESSES += 1
+        self._instruction_latency += self.latency.CACHE_ACCESS
 
-    @classmethod
     def sram_access(self):
-        logger.info("-SRAM access-")
         self.SRAM_ACCESSES += 1
+        self._instruction_latency += self.latency.SRAM_ACCESS
 
-    @classmethod
     def directory_access(self):
-        logger.info('-Directory Access-')
         self.DIRECTORY_ACCESSES += 1
+        self._instruction_latency += self.latency.DIRECTORY_ACCESS
 
-    @classmethod
     def processor_hop(self, hops):
-        logger.info('-{} Proccessor hops-'.format(hops))
         self.PROCESSOR_HOPS += hops
+        self._instruction_latency += hops * self.latency.PROCESSOR_HOP
 
         if (hops == 3):
             self.three_hops()
@@ -184,81 +164,96 @@ class Statistic:
         else:
             self.one_hops()
 
-    @classmethod
     def directory_request(self):
-        logger.info('-Directory Request-')
         self.DIRECTORY_HOPS += 1
+        self._instruction_latency += self.latency.DIRECTORY_HOP
 
-    @classmethod
     def memory_access(self):
-        logger.info('-Memory Access-')
         self.MEMORY_ACCESSES += 1
+        self._instruction_latency += self.latency.MEMORY_ACCESS
 
     #-----------------------------------------
 
     # -- Key statistics -- #
-    @classmethod
     def private_access(self):
-        logger.info('-Private Access-')
         self.PRIVATE_ACCESSES += 1
+        self._access_type = PRIVATE
     
-    @classmethod
     def remote_access(self):
-        logger.info('-Remote Access-')
         self.REMOTE_ACCESSES += 1
+        if (self._access_type != PRIVATE):
+            self._access_type = REMOTE
 
-    @classmethod
     def off_chip_access(self):
-        logger.info('-Off Chip Access-')
         self.OFF_CHIP_ACCESS += 1
+        if (self._access_type is None):
+            self._access_type = OFF_CHIP
 
-    @classmethod
     def replacement_writeback(self):
-        logger.info('-Replacement Writeback-')
         self.REPLACEMENT_WRITEBACKS += 1
 
-    @classmethod
     def coherence_writeback(self):
-        logger.info('-Coherence Writeback-')
         self.COHERENCE_WRITEBACKS += 1
 
-    @classmethod
     def invalidation_sent(self, num):
-        logger.info(f'-{num} Invalidations Sent-')
         self.INVALIDATIONS_SENT += num
+
+    def directory_eviction(self):
+        self.DIRECTORY_EVICTIONS += 1
     # --------------------------------------------
 
-    
-    @classmethod
+    def merge(self, other):
+        """Adds the counters, latency sums and histograms of another simulation to these, used to
+            combine the statistics of the shards of a trace
+
+        Args:
+            other (Statistic): Statistics of the other simulation, at the end of an instruction
+        """
+        for name, value in vars(other).items():
+            if (not name.isupper()):
+                continue
+            if (isinstance(value, array)):
+                histogram = getattr(self, name)
+                for bucket, count in enumerate(value):
+                    histogram[bucket] += count
+            elif (name.endswith('_MAX_LATENCY')):
+                setattr(self, name, max(getattr(self, name), value))
+            else:
+                setattr(self, name, getattr(self, name) + value)
+        return self
+
+
     def reset(self):
+        # number of instructions issued
         self.INSTRUCTIONS = 0
 
+        # Extra statistics
+        # miss because data is from start of program
         self.COMPULSORY_MISSES = 0   
+        # miss when the data required was in the cache previously, but got evicted.
         self.CONFLICT_MISSES = 0     
+        # miss occurs due to the limited size of a cache and not the cache's mapping function
         self.CAPACITY_MISSES = 0 
+        # miss because another cache invalidated the line
         self.COHERENCE_MISSES = 0 
 
+        # Line is in S, and cache wants to write so alerts the directory but there are no sharers 
         self.WRITE_MISS_BUT_NO_DATA_NEEDED_AND_NO_SHARERS = 0
+        # line in I, and cache wants to write so alerts directory
         self.WRITE_MISS_BUT_DATA_NEEDED = 0
 
         self.THREE_HOPS = 0
         self.TWO_HOPS = 0
         self.ONE_HOPS = 0
 
+        # latency statstics
         self.CACHE_PROBES = 0         
-        self.CACHE_PROBES_PREV = self.CACHE_PROBES
         self.CACHE_ACCESSES = 0      
-        self.CACHE_ACCESSES_PREV = self.CACHE_ACCESSES 
         self.SRAM_ACCESSES = 0       
-        self.SRAM_ACCESSES_PREV = self.SRAM_ACCESSES
         self.DIRECTORY_ACCESSES = 0    
-        self.DIRECTORY_ACCESSES_PREV = self.DIRECTORY_ACCESSES
         self.PROCESSOR_HOPS = 0       
-        self.PROCESSOR_HOPS_PREV = self.PROCESSOR_HOPS
         self.MEMORY_ACCESSES = 0      
-        self.MEMORY_ACCESSES_PREV = self.MEMORY_ACCESSES
         self.DIRECTORY_HOPS = 0      
-        self.DIRECTORY_HOPS_PREV = self.DIRECTORY_HOPS            
 
         # statstics
         self.REMOTE_ACCESSES = 0         
@@ -267,66 +262,59 @@ class Statistic:
         self.REPLACEMENT_WRITEBACKS = 0
         self.COHERENCE_WRITEBACKS = 0
         self.INVALIDATIONS_SENT = 0
-        self.PRIVATE_ACCESSES_PREV = self.PRIVATE_ACCESSES        
-        self.REMOTE_ACCESSES_PREV = self.REMOTE_ACCESSES
-        self.OFF_CHIP_ACCESS_PREV = self.OFF_CHIP_ACCESS
+        # sparse directory entries replaced, invalidating the sharers of the entry
+        self.DIRECTORY_EVICTIONS = 0
 
 
         self.AVERAGE_LATENCY = 0
 
-        self.PRIV_LATENCIES = []
-        self.REM_LATENCIES = []
-        self.OFF_CHIP_LATENCIES = []
-        self.TOTAL_LATENCY = 0 
-        self.TOTAL_LATENCY_PREV = self.TOTAL_LATENCY
+        # latency of the actions of the current instruction, and its type of access
+        self._instruction_latency = 0
+        self._access_type = None
+
+        # instructions and their summed latency of each type of access
+        self.PRIV_INSTRUCTIONS = 0
+        self.PRIV_LATENCY = 0
+        self.REM_INSTRUCTIONS = 0
+        self.REM_LATENCY = 0
+        self.OFF_CHIP_INSTRUCTIONS = 0
+        self.OFF_CHIP_LATENCY = 0
+        # count of each latency, and the longest, of each type of access
+        self.PRIV_HISTOGRAM = array('Q', bytes(8 * (HISTOGRAM_BUCKETS + 1)))
+        self.PRIV_MAX_LATENCY = 0
+        self.REM_HISTOGRAM = array('Q', bytes(8 * (HISTOGRAM_BUCKETS + 1)))
+        self.REM_MAX_LATENCY = 0
+        self.OFF_CHIP_HISTOGRAM = array('Q', bytes(8 * (HISTOGRAM_BUCKETS + 1)))
+        self.OFF_CHIP_MAX_LATENCY = 0
     
     # -- Latency Methods -- #
-    @classmethod
     def compute_current_latency(self):
-        """Computes the current latency taken by looking
-            at previous actiond and current
+        """Gets the latency of the actions of the current instruction so far
         """
-        cache_probes        = (self.CACHE_PROBES - self.CACHE_PROBES_PREV)*Latency.CACHE_PROBE    
-        cache_accesses      = (self.CACHE_ACCESSES - self.CACHE_ACCESSES_PREV)*Latency.CACHE_ACCESS
-        sram_accesses       = (self.SRAM_ACCESSES - self.SRAM_ACCESSES_PREV)*Latency.SRAM_ACCESS
-        directory_accesses  = (self.DIRECTORY_ACCESSES - self.DIRECTORY_ACCESSES_PREV)*Latency.DIRECTORY_ACCESS
-        processor_hops      = (self.PROCESSOR_HOPS - self.PROCESSOR_HOPS_PREV)*Latency.PROCESSOR_HOP
-        memory_accesses     = (self.MEMORY_ACCESSES - self.MEMORY_ACCESSES_PREV)*Latency.MEMORY_ACCESS
-        directory_hops      = (self.DIRECTORY_HOPS - self.DIRECTORY_HOPS_PREV)*Latency.DIRECTORY_HOP
-
-        total_latency = cache_probes + cache_accesses + sram_accesses + directory_accesses + processor_hops + memory_accesses + directory_hops
-        return total_latency
-
-    @classmethod
+        return self._instruction_latency
+
     def total_latency(self):
-        return sum(self.REM_LATENCIES) + sum(self.PRIV_LATENCIES) + sum(self.OFF_CHIP_LATENCIES)
+        return self.PRIV_LATENCY + self.REM_LATENCY + self.OFF_CHIP_LATENCY
 
-    @classmethod
     def average_latency(self):
-        average = sum(self.REM_LATENCIES) + sum(self.PRIV_LATENCIES) + sum(self.OFF_CHIP_LATENCIES)
-        try:
-            average = average/self.INSTRUCTIONS
-        except:
-            return 0
-        return average
+        if (self.INSTRUCTIONS != 0):
+            return self.total_latency()/self.INSTRUCTIONS
+        return 0
     
-    @classmethod
     def rem_average_latency(self):
-        if (len(self.REM_LATENCIES) != 0):
-            return sum(self.REM_LATENCIES)/len(self.REM_LATENCIES)
+        if (self.REM_INSTRUCTIONS != 0):
+            return self.REM_LATENCY/self.REM_INSTRUCTIONS
         return 0
 
-    @classmethod
     def priv_average_latency(self):
-        if (len(self.PRIV_LATENCIES) != 0):
-            return sum(self.PRIV_LATENCIES)/len(self.PRIV_LATENCIES)
+        if (self.PRIV_INSTRUCTIONS != 0):
+            return self.PRIV_LATENCY/self.PRIV_INSTRUCTIONS
         else:
             return 0
 
-    @classmethod
     def off_chip_latency(self):
-        if (len(self.OFF_CHIP_LATENCIES) != 0):
-            return sum(self.OFF_CHIP_LATENCIES)/len(self.OFF_CHIP_LATENCIES)
+        if (self.OFF_CHIP_INSTRUCTIONS != 0):
+            return self.OFF_CHIP_LATENCY/self.OFF_CHIP_INSTRUCTIONS
         else:
             return 0
 
@@ -334,23 +322,15 @@ class Statistic:
 
 
     # -- Printing Info -- #
-    @classmethod
     def debug_statistics(self):
         string = f"""Instruction: {self.INSTRUCTIONS}
 Total Cache accesses: {self.CACHE_ACCESSES}
-    Instruction cache accesses: {self.CACHE_ACCESSES - self.CACHE_ACCESSES_PREV}
 Total Cache probes: {self.CACHE_PROBES}
-    Instruction cache probes: {self.CACHE_PROBES - self.CACHE_PROBES_PREV}
 Total SRAM Accesses: {self.SRAM_ACCESSES}
-    Instruction SRAM accesses: {self.SRAM_ACCESSES - self.SRAM_ACCESSES_PREV}
 Total Processor Hops: {self.PROCESSOR_HOPS}
-    Instruction processor hops: {self.PROCESSOR_HOPS - self.PROCESSOR_HOPS_PREV}
 Total Directory Accesses: {self.DIRECTORY_ACCESSES}
-    Instruction directory Accesses: {self.DIRECTORY_ACCESSES - self.DIRECTORY_ACCESSES_PREV}
 Total Directory Requests/Hops: {self.DIRECTORY_HOPS}
-    Instruction directory requests/hops: {self.DIRECTORY_HOPS - self.DIRECTORY_HOPS_PREV}
 Total Memory Accesses: {self.MEMORY_ACCESSES}
-    Instruction memory accesses: {self.MEMORY_ACCESSES - self.MEMORY_ACCESSES_PREV}
 Instruction Latency: {self.compute_current_latency()}
 
 Compulsory misses:  {self.COMPULSORY_MISSES}
@@ -359,6 +339,7 @@ Capacity misses:    {self.CAPACITY_MISSES}
 Coherence misses:   {self.COHERENCE_MISSES}
 Write miss, don't need data, with no sharers: {self.WRITE_MISS_BUT_NO_DATA_NEEDED_AND_NO_SHARERS}
 write miss and data is needed: {self.WRITE_MISS_BUT_DATA_NEEDED}
+Directory evictions: {self.DIRECTORY_EVICTIONS}
 
 Three hops: {self.THREE_HOPS}
 Two hops: {self.TWO_HOPS}
@@ -366,23 +347,50 @@ One hops: {self.ONE_HOPS}
         """
         return string
 
-    @classmethod
     def key_statistics(self):
-        string = f"""Private-accesses: {self.PRIVATE_ACCESSES}
-Remote-accesses: {self.REMOTE_ACCESSES}
-Off-chip-accesses: {self.OFF_CHIP_ACCESS}
-Total-accesses: {self.PRIVATE_ACCESSES + self.REMOTE_ACCESSES + self.OFF_CHIP_ACCESS}
-Replacement-writebacks: {self.REPLACEMENT_WRITEBACKS}
-Coherence-writebacks: {self.COHERENCE_WRITEBACKS}
-Invalidations-sent: {self.INVALIDATIONS_SENT}
-Average-latency: {self.average_latency()}
-Priv-average-latency: {self.priv_average_latency()}
-Rem-average-latency: {self.rem_average_latency()}
-Off-chip-average-latency: {self.off_chip_latency()}
-Total-latency: {self.total_latency()}"""
+        string = "\n".join(f"{name}: {value}" for name, value in self.key_values().items())
         return string
 
-    @classmethod
+    def key_values(self):
+        """Gets the key statistics by their names in key_statistics
+
+        Returns:
+            dict: name -> value
+        """
+        return {
+            'Private-accesses': self.PRIVATE_ACCESSES,
+            'Remote-accesses': self.REMOTE_ACCESSES,
+            'Off-chip-accesses': self.OFF_CHIP_ACCESS,
+            'Total-accesses': self.PRIVATE_ACCESSES + self.REMOTE_ACCESSES + self.OFF_CHIP_ACCESS,
+            'Replacement-writebacks': self.REPLACEMENT_WRITEBACKS,
+            'Coherence-writebacks': self.COHERENCE_WRITEBACKS,
+            'Invalidations-sent': self.INVALIDATIONS_SENT,
+            'Average-latency': self.average_latency(),
+            'Priv-average-latency': self.priv_average_latency(),
+            'Rem-average-latency': self.rem_average_latency(),
+            'Off-chip-average-latency': self.off_chip_latency(),
+            'Total-latency': self.total_latency(),
+            **self.percentile_values('Priv', self.PRIV_HISTOGRAM, self.PRIV_MAX_LATENCY),
+            **self.percentile_values('Rem', self.REM_HISTOGRAM, self.REM_MAX_LATENCY),
+            **self.percentile_values('Off-chip', self.OFF_CHIP_HISTOGRAM, self.OFF_CHIP_MAX_LATENCY),
+        }
+
+    def percentile_values(self, name, histogram, max_latency):
+        """Gets the PERCENTILES and the longest latency of a type of access
+
+        Args:
+            name (string): Prefix of the names e.g. Priv
+            histogram (array): Latency histogram of the access type
+            max_latency (int): Longest latency of the access type
+
+        Returns:
+            dict: name -> value
+        """
+        values = {f'{name}-p{percentile}-latency': histogram_percentile(histogram, percentile, max_latency)
+                  for percentile in PERCENTILES}
+        values[f'{name}-max-latency'] = max_latency
+        return values
+
     def hit_rate(self):
         """Calculates the hit rate by dividing the private accesses by 
             number of instructions issued
@@ -397,21 +405,25 @@ Total-latency: {self.total_latency()}"""
 
     # -------------------------------
 
-def save_statistics(file_path):
+def save_statistics(file_path, statistic):
     """Saves the key statstics in the given path with
         out_<trace_name>.txt.
 
     Args:
         file_path (string/path): Path to trace file
+        statistic (Statistic): Statistics of the simulation
     """
     # get the filename and path
     path = os.path.dirname(file_path)
-    name = os.path.basename(file_path)
+    name = os.path.basename(strip_compression(file_path))
+    # binary traces share the output of the text trace they were converted from
+    if (name.endswith(BINARY_EXTENSION)):
+        name = name[:-len(BINARY_EXTENSION)] + '.txt'
     # create new path file
     file_name = f"out_{name}"
     file = os.path.join(path,file_name)
 
     # write to file, key statstics
     f = open(file, "w")
-    f.write(Statistic.key_statistics())
+    f.write(statistic.key_statistics())
     f.close()
\ No newline at end of file
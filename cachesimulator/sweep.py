@@ -0,0 +1,158 @@
+from cachesimulator.binary_trace import decode_text, load_binary, stream_columns, is_columns, is_path, concatenate_columns, BINARY_EXTENSION
+from cachesimulator.config import SimulatorConfig
+from cachesimulator.simulator import create_system, run_trace
+from cachesimulator.statistics import Latency, LATENCIES
+from cachesimulator.shared_trace import SharedTrace
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+import numpy as np
+import csv
+import json
+import os
+import sys
+import logging
+
+logger = logging.getLogger('cachesimulator.Logger')
+
+# parameters of a sweep point besides the LATENCIES
+CONFIG_PARAMETERS = ['cache_size', 'line_size', 'number_of_caches']
+OPTIMIZE = 'optimize'
+
+# shared trace a worker is attached to, set once by the pool initializer
+_TRACE = None
+
+
+def expand_grid(grid):
+    """Expands a grid of parameter values into every combination of them
+
+    Args:
+        grid (dict): parameter -> list of values, the parameters are CONFIG_PARAMETERS,
+            optimize and the LATENCIES e.g. {'cache_size': [256, 512], 'optimize': [False, True]}
+
+    Returns:
+        list(dict): The points of the grid, parameter -> value
+    """
+    for name in grid:
+        if (name not in CONFIG_PARAMETERS and name != OPTIMIZE and name not in LATENCIES):
+            raise Exception('Unknown sweep parameter {}, expected one of ({})'.format(name, ', '.join(CONFIG_PARAMETERS + [OPTIMIZE] + LATENCIES)))
+    names = list(grid)
+    return [dict(zip(names, values)) for values in product(*(grid[name] for name in names))]
+
+
+def load_trace(trace_file):
+    """Decodes the whole trace into column arrays
+
+    Args:
+        trace_file (string or os.PathLike): Path to a text, compressed or binary trace,
+            or the column arrays of a trace or an iterable of chunks of them
+
+    Returns:
+        tuple(np.ndarray): uids, commands and addresses
+    """
+    if (not is_path(trace_file)):
+        return trace_file if (is_columns(trace_file)) else concatenate_columns(list(trace_file))
+    trace_file = os.fspath(trace_file)
+    if (trace_file.endswith(BINARY_EXTENSION)):
+        records = load_binary(trace_file)
+        return (np.ascontiguousarray(records['uid']), np.ascontiguousarray(records['command']),
+                np.ascontiguousarray(records['address']))
+    return decode_text(trace_file)
+
+
+def run_point(columns, point):
+    """Simulates the decoded trace on the system of a sweep point
+
+    Args:
+        columns (tuple(np.ndarray)): uids, commands and addresses of the trace
+        point (dict): parameter -> value
+
+    Returns:
+        dict: The parameters of the point followed by its key statistics
+    """
+    config = SimulatorConfig(**{name: point[name] for name in CONFIG_PARAMETERS if name in point})
+    latency = Latency(**{name: point[name] for name in LATENCIES if name in point})
+    directory, caches = create_system(config, point.get(OPTIMIZE, False), latency=latency)
+    statistic = run_trace(stream_columns(*columns), caches)
+    row = dict(point)
+    row.update(statistic.key_values())
+    return row
+
+
+def _initialise_worker(handle):
+    global _TRACE
+    # keep the trace so the block stays mapped for the life of the worker
+    _TRACE = SharedTrace.attach(handle)
+
+
+def _run_worker_point(point):
+    return run_point(_TRACE.columns, point)
+
+
+def _check_processors(columns, points):
+    """Checks every point has a cache for each processor of the trace"""
+    uids = columns[0][columns[0] >= 0]
+    processors = int(uids.max()) + 1 if (len(uids) != 0) else 0
+    for point in points:
+        if (point.get('number_of_caches', SimulatorConfig().number_of_caches) < processors):
+            raise Exception('Sweep point {} has fewer caches than the {} processors of the trace'.format(point, processors))
+
+
+def sweep(trace_file, grid, workers=None):
+    """Simulates the trace on every point of the grid. The trace is decoded once into
+        shared memory which the workers attach to by name, so there is one copy of the
+        trace however many workers there are. The points are spread over the workers.
+
+    Args:
+        trace_file (string): Path to the trace
+        grid (dict): parameter -> list of values, see expand_grid
+        workers (int): number of processes, defaults to the number of cpus, 1 runs
+            every point in this process
+
+    Returns:
+        list(dict): A row for each point in order of the grid
+    """
+    points = expand_grid(grid)
+    if (workers is None):
+        workers = os.cpu_count()
+    workers = min(workers, len(points))
+    if (workers <= 1):
+        columns = load_trace(trace_file)
+        _check_processors(columns, points)
+        return [run_point(columns, point) for point in points]
+
+    # the decoded columns are freed once they are copied into shared memory
+    with SharedTrace.create(load_trace(trace_file)) as trace:
+        _check_processors(trace.columns, points)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_initialise_worker, initargs=(trace.handle,)) as executor:
+            return list(executor.map(_run_worker_point, points))
+
+
+def save_table(rows, file_path):
+    """Saves the rows of a sweep as CSV, or JSON if the path ends with .json
+
+    Args:
+        rows (list(dict)): The rows of the sweep
+        file_path (string): Path of the table
+    """
+    if (file_path.endswith('.json')):
+        with open(file_path, 'w') as f:
+            json.dump(rows, f, indent=2)
+        return
+    # points of a grid all have the same parameters
+    with open(file_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+if __name__ == '__main__':
+
+    args = sys.argv[1:]
+    # the trace, a json file of the grid, the table to write and optionally the number of workers
+    trace_file = args[0]
+    with open(args[1]) as f:
+        grid = json.load(f)
+    table_path = args[2]
+    workers = int(args[3]) if (len(args) > 3) else None
+
+    save_table(sweep(trace_file, grid, workers), table_path)
@@ -1,5 +1,11 @@
 from cachesimulator.directory import Directory
 from cachesimulator.cache import Cache
+from cachesimulator.simulator import simulate
+from main import main
+import tempfile
+import shutil
+import random
+import os
 
 def create_directory():
         directory = Directory()
@@ -10,4 +16,38 @@ def create_caches(directory, num):
     for i in range(num):
         cache = Cache(i, directory=directory)
         caches.append(cache)
-    return caches
\ No newline at end of file
+    return caches
+
+def get_counters(statistic):
+    """Gets every counter of the statistics and the total latency"""
+    statistics = {name: value for name, value in vars(statistic).items() if name.isupper()}
+    statistics['Total-latency'] = statistic.total_latency()
+    return statistics
+
+def run_statistics(file, optimize=False, **kwargs):
+    """Simulates the trace, nothing is printed or saved, and returns every counter of the statistics"""
+    return get_counters(simulate(file, optimize=optimize, **kwargs))
+
+def run_main(file, optimize=False, **kwargs):
+    """Runs the trace through main and returns every counter of the statistics. main
+        saves the statistics next to the trace, so a trace on disk is copied into a
+        temporary directory first
+    """
+    if (not isinstance(file, str)):
+        return get_counters(main(file, optimize=optimize, **kwargs))
+    with tempfile.TemporaryDirectory() as directory:
+        copy = shutil.copy(file, os.path.join(directory, os.path.basename(file)))
+        return get_counters(main(copy, optimize=optimize, **kwargs))
+
+def write_random_trace(file, length, seed, num_caches=4, num_tags=3, num_indexes=2):
+    """Writes a trace of random accesses to a few tags and indexes, so there is a lot
+        of sharing, invalidation and replacement between the caches
+    """
+    rng = random.Random(seed)
+    with open(file, 'w') as f:
+        for _ in range(length):
+            tag = rng.randrange(num_tags)
+            index = rng.randrange(num_indexes)
+            address = (tag << 11) | (index << 2) | rng.randrange(4)
+            f.write(f"P{rng.randrange(num_caches)} {rng.choice('RW')} {address}\n")
+    return file
@@ -0,0 +1,93 @@
+import logging
+import os
+import tempfile
+import unittest
+import numpy as np
+from cachesimulator import MSI
+from cachesimulator.cache import Cache
+from cachesimulator.array_cache import ArrayCache
+from cachesimulator.test.setup import create_directory, run_statistics, write_random_trace
+from data.trace_files import trace1, test_trace, trace_addre_1, optimize_trace
+
+logger = logging.getLogger("cachesimulator.Logger")
+logger.setLevel(logging.WARNING)
+
+class TestArrayCache(unittest.TestCase):
+
+    def create_caches(self, num):
+        directory = create_directory()
+        caches = [ArrayCache(i, directory=directory) for i in range(num)]
+        directory._sharers = caches
+        return caches
+
+    def test_arrays(self):
+        cache = self.create_caches(1)[0]
+        self.assertEqual(np.int64, cache.tags.dtype)
+        self.assertEqual(np.int8, cache.states.dtype)
+        self.assertFalse(cache.valid.any())
+        self.assertFalse(cache.dirty.any())
+
+    def test_write_hit(self):
+        cache = self.create_caches(1)[0]
+        address = 12611
+        index = 80
+        # modify line to have valid address here in modified state
+        line = cache.cachelines[index]
+        line.valid = True
+        line.tag = 6
+        line.state = MSI.MODIFIED
+        # expected result
+        self.assertTrue(cache.write(address))
+        self.assertTrue(cache.dirty[index])
+
+    def test_write_miss_multi_sharers(self):
+        caches = self.create_caches(4)
+        cache = caches[2]
+        address = 12611
+        index = 80
+        for c in caches:
+            line = c.cachelines[index]
+            line.valid = True
+            line.tag = 6
+            line.state = MSI.SHARED
+        # expect other caches to have states invalid
+        cache.write(address)
+        for c in caches:
+            expected_state = MSI.MODIFIED if (c == cache) else MSI.INVALID
+            self.assertEqual(expected_state, c.cachelines[index].state)
+
+    def test_remote_miss(self):
+        caches = self.create_caches(4)
+        address = 12611
+        index = 80
+        # set cache 3 to modified
+        line = caches[3].cachelines[index]
+        line.valid = True
+        line.tag = 6
+        line.state = MSI.MODIFIED
+        # now have cache 0 ask for read
+        caches[0].read(address)
+        self.assertEqual(MSI.SHARED, caches[3].cachelines[index].state)
+        self.assertEqual(1, caches[0].statistic.COHERENCE_WRITEBACKS)
+
+    # -- Same statistics as Cache -- #
+    def test_traces(self):
+        for file in (test_trace, trace_addre_1, optimize_trace):
+            for optimize in (False, True):
+                expected = run_statistics(file, optimize, cache_class=Cache)
+                actual = run_statistics(file, optimize, cache_class=ArrayCache)
+                self.assertEqual(expected, actual, f"{file} optimize: {optimize}")
+
+    def test_trace1(self):
+        expected = run_statistics(trace1, cache_class=Cache)
+        actual = run_statistics(trace1, cache_class=ArrayCache)
+        self.assertEqual(expected, actual)
+
+    def test_random_traces(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for seed in range(5):
+                file = write_random_trace(os.path.join(directory, 'random.txt'), 300, seed)
+                for optimize in (False, True):
+                    expected = run_statistics(file, optimize, cache_class=Cache)
+                    actual = run_statistics(file, optimize, cache_class=ArrayCache)
+                    self.assertEqual(expected, actual, f"seed: {seed} optimize: {optimize}")
@@ -0,0 +1,44 @@
+import logging
+import os
+import tempfile
+import unittest
+from cachesimulator.benchmark import run_benchmark, record_run, find_regressions, load_history, format_run, PHASES
+
+logger = logging.getLogger("cachesimulator.Logger")
+logger.setLevel(logging.WARNING)
+
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_run(self):
+        run = run_benchmark({'workload': ['migratory', 'uniform'], 'accesses': [500], 'number_of_caches': [2], 'optimize': [False, True]})
+        # expected a row of every point with the time of every phase
+        self.assertEqual(4, len(run['results']))
+        for row in run['results']:
+            for phase in PHASES:
+                self.assertGreater(row[phase + '_seconds'], 0)
+        self.assertIn('migratory', format_run(run))
+
+    def test_regressions(self):
+        baseline = {'results': [{'workload': 'uniform', 'accesses': 100, 'number_of_caches': 4, 'optimize': False,
+                                 'parse_seconds': 1.0, 'simulate_seconds': 2.0, 'end_to_end_seconds': 3.0}]}
+        run = {'results': [dict(baseline['results'][0], simulate_seconds=2.1, end_to_end_seconds=3.6)]}
+        # expected only the end to end time more than 10% slower
+        regressions = find_regressions(run, baseline, 10)
+        self.assertEqual(['end_to_end'], [regression['phase'] for regression in regressions])
+        self.assertAlmostEqual(20, regressions[0]['slower'])
+        self.assertEqual(2, len(find_regressions(run, baseline, 1)))
+
+    def test_history(self):
+        baseline = {'results': [{'workload': 'uniform', 'accesses': 100, 'number_of_caches': 4, 'optimize': False,
+                                 'parse_seconds': 1.0, 'simulate_seconds': 2.0, 'end_to_end_seconds': 3.0}]}
+        slower = {'results': [dict(baseline['results'][0], parse_seconds=2.0)]}
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'history.json')
+            # expected the first run to be the baseline
+            self.assertEqual([], record_run(slower, path))
+            self.assertEqual([], record_run(baseline, path, rebaseline=True))
+            self.assertEqual(1, len(record_run(slower, path)))
+            history = load_history(path)
+        self.assertEqual(baseline, history['baseline'])
+        self.assertEqual(3, len(history['runs']))
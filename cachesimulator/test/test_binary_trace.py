@@ -0,0 +1,157 @@
+import logging
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from main import main
+from cachesimulator.binary_trace import convert_to_binary, load_binary, stream_binary, stream_columns, decode_text, parallel_decode_text, split_file, count_lines, TRACE_DTYPE, COMMANDS
+from cachesimulator.trace_parser import parse
+from cachesimulator.simulator import read_trace
+from data.trace_files import test_trace, trace1
+
+logger = logging.getLogger("cachesimulator.Logger")
+logger.setLevel(logging.WARNING)
+
+class TestBinaryTrace(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def convert(self, file, block_size=None):
+        binary_path = os.path.join(self.directory.name, 'trace.npy')
+        if (block_size is None):
+            return convert_to_binary(file, binary_path)
+        return convert_to_binary(file, binary_path, block_size=block_size)
+
+    def write_text(self, text):
+        file = os.path.join(self.directory.name, 'trace.txt')
+        with open(file, 'wb') as f:
+            f.write(text)
+        return file
+
+    def test_load_binary(self):
+        binary_path = self.convert(test_trace)
+        records = load_binary(binary_path)
+        # expected
+        expected = parse(test_trace)
+        # actual
+        self.assertEqual(TRACE_DTYPE, records.dtype)
+        self.assertEqual(len(expected), len(records))
+
+    def test_stream_binary(self):
+        # small blocks so lines cross block boundaries
+        binary_path = self.convert(test_trace, block_size=16)
+        # expected
+        expected = parse(test_trace)
+        # actual
+        actual = list(stream_binary(binary_path, chunk_size=3))
+        self.assertEqual(expected, actual)
+
+    def test_stream_binary_trace1(self):
+        binary_path = self.convert(trace1)
+        # expected
+        expected = parse(trace1)
+        # actual
+        actual = list(stream_binary(binary_path))
+        self.assertEqual(expected, actual)
+
+    def test_main_binary(self):
+        binary_path = self.convert(test_trace)
+        statistic = main(binary_path)
+
+        self.assertEqual(3, statistic.PRIVATE_ACCESSES)
+        self.assertEqual(7, statistic.REMOTE_ACCESSES)
+        self.assertEqual(5, statistic.OFF_CHIP_ACCESS)
+        self.assertEqual(298, statistic.total_latency())
+        # statistics are saved as text
+        self.assertTrue(os.path.exists(os.path.join(self.directory.name, 'out_trace.txt')))
+
+    def test_read_trace_path(self):
+        binary_path = self.convert(test_trace)
+        # expected a pathlib.Path to be read as the file it names
+        expected = parse(test_trace)
+        self.assertEqual(expected, list(read_trace(Path(binary_path))))
+        self.assertEqual(expected, list(read_trace(Path(test_trace))))
+
+    def test_unknown_command(self):
+        file = self.write_text(b'P0 R 1\nP0 X 5\n')
+        # expected the same odd line rejected by the streaming parser and the decoder
+        with self.assertRaises(Exception):
+            list(parse(file, stream=True))
+        with self.assertRaises(Exception):
+            decode_text(file)
+
+    # -- Vectorised decoding -- #
+    def test_decode_text(self):
+        # expected
+        expected = parse(trace1)
+        # actual
+        actual = list(stream_columns(*decode_text(trace1)))
+        self.assertEqual(expected, actual)
+
+    def test_decode_text_small_blocks(self):
+        # expected
+        expected = parse(test_trace)
+        # actual
+        actual = list(stream_columns(*decode_text(test_trace, block_size=5)))
+        self.assertEqual(expected, actual)
+
+    def test_decode_control_commands(self):
+        file = self.write_text(b'P0 W 1299\nv\nP4 R 0\nh\np\nP2 W 1290')
+        uids, commands, addresses = decode_text(file)
+        # expected
+        expected_commands = ['W', 'v', 'R', 'h', 'p', 'W']
+        # actual
+        actual_commands = [COMMANDS[c] for c in commands]
+        self.assertEqual(expected_commands, actual_commands)
+        self.assertEqual([0, -1, 4, -1, -1, 2], uids.tolist())
+        self.assertEqual([1299, -1, 0, -1, -1, 1290], addresses.tolist())
+
+    def test_decode_irregular_lines(self):
+        # windows line endings, padding and long processor ids take the slow path
+        file = self.write_text(b'P0 W 1299\r\n  P3 R 12 \nP12 R 5\n h\nP1 W 00042\n')
+        # expected
+        expected = parse(file)
+        # actual
+        actual = list(stream_columns(*decode_text(file)))
+        self.assertEqual(expected, actual)
+        self.assertEqual([12, 'R', 5], actual[2])
+        self.assertEqual(len(expected), count_lines(file))
+
+    def test_decode_unknown_command(self):
+        file = self.write_text(b'P0 W 1299\nx\n')
+        with self.assertRaises(Exception):
+            decode_text(file)
+
+    # -- Parallel decoding -- #
+    def assertColumnsEqual(self, expected, actual):
+        for expected_column, actual_column in zip(expected, actual):
+            self.assertEqual(expected_column.dtype, actual_column.dtype)
+            self.assertEqual(expected_column.tolist(), actual_column.tolist())
+
+    def test_split_file(self):
+        offsets = split_file(test_trace, 10)
+        with open(test_trace, 'rb') as f:
+            text = f.read()
+        # every chunk starts at the beginning of a line
+        self.assertEqual(0, offsets[0])
+        self.assertEqual(len(text), offsets[-1])
+        for offset in offsets[1:-1]:
+            self.assertEqual(b'\n', text[offset - 1:offset])
+
+    def test_parallel_decode_text(self):
+        # expected
+        expected = decode_text(trace1)
+        # actual
+        actual = parallel_decode_text(trace1, workers=2)
+        self.assertColumnsEqual(expected, actual)
+
+    def test_parallel_decode_small_chunks(self):
+        # expected
+        expected = decode_text(test_trace)
+        # actual
+        actual = parallel_decode_text(test_trace, workers=2, chunk_size=3)
+        self.assertColumnsEqual(expected, actual)
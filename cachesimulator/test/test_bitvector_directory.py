@@ -0,0 +1,79 @@
+import logging
+import os
+import tempfile
+import unittest
+from cachesimulator.array_cache import ArrayCache
+from cachesimulator.cache import Cache
+from cachesimulator.bitvector_directory import BitVectorDirectory, popcount
+from cachesimulator.test.setup import run_statistics, write_random_trace
+from data.trace_files import trace1, test_trace, trace_addre_1, optimize_trace
+
+logger = logging.getLogger("cachesimulator.Logger")
+logger.setLevel(logging.WARNING)
+
+class TestBitVectorDirectory(unittest.TestCase):
+
+    def create_caches(self, num):
+        directory = BitVectorDirectory()
+        caches = [Cache(i, directory=directory) for i in range(num)]
+        for c in caches:
+            directory.append_sharer(c)
+        return directory, caches
+
+    def test_popcount(self):
+        self.assertEqual(0, popcount(0))
+        self.assertEqual(3, popcount(0b10110))
+
+    def test_read_sharers(self):
+        directory, caches = self.create_caches(4)
+        address = 12611
+        caches[3].read(address)
+        caches[1].read(address)
+        # expected
+        expected_sharers = [caches[1], caches[3]]
+        # actual
+        actual_sharers = directory._get_sharers(caches[0], address)
+        self.assertEqual(expected_sharers, actual_sharers)
+        self.assertEqual(2, directory.sharer_count(address))
+
+    def test_write_invalidates_sharers(self):
+        directory, caches = self.create_caches(4)
+        address = 12611
+        for c in caches:
+            c.read(address)
+        caches[2].write(address)
+        # only the writer holds the address
+        self.assertEqual(1, directory.sharer_count(address))
+        self.assertEqual([caches[2]], directory._get_sharers(caches[0], address))
+
+    def test_eviction_clears_sharer(self):
+        directory, caches = self.create_caches(2)
+        address = 12611
+        # same index with a different tag
+        conflict_address = address + (1 << 11)
+        caches[0].read(address)
+        caches[0].read(conflict_address)
+        self.assertEqual(0, directory.sharer_count(address))
+        self.assertEqual(1, directory.sharer_count(conflict_address))
+
+    # -- Same statistics as Directory -- #
+    def test_traces(self):
+        for file in (test_trace, trace_addre_1, optimize_trace):
+            for optimize in (False, True):
+                expected = run_statistics(file, optimize)
+                actual = run_statistics(file, optimize, directory_class=BitVectorDirectory)
+                self.assertEqual(expected, actual, f"{file} optimize: {optimize}")
+
+    def test_random_traces(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for seed in range(5):
+                file = write_random_trace(os.path.join(directory, 'random.txt'), 300, seed)
+                for optimize in (False, True):
+                    expected = run_statistics(file, optimize)
+                    actual = run_statistics(file, optimize, directory_class=BitVectorDirectory, cache_class=ArrayCache)
+                    self.assertEqual(expected, actual, f"seed: {seed} optimize: {optimize}")
+
+    def test_trace1(self):
+        expected = run_statistics(trace1)
+        actual = run_statistics(trace1, directory_class=BitVectorDirectory)
+        self.assertEqual(expected, actual)
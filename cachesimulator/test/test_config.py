@@ -0,0 +1,62 @@
+import logging
+import unittest
+from cachesimulator.config import SimulatorConfig, CACHE_SIZE, LINE_SIZE, NUMBER_OF_CACHES
+from cachesimulator.cache import Cache
+from cachesimulator.directory import Directory
+from cachesimulator.bitvector_directory import BitVectorDirectory
+from cachesimulator.test.setup import run_statistics
+from data.trace_files import trace1, test_trace
+
+logger = logging.getLogger("cachesimulator.Logger")
+logger.setLevel(logging.WARNING)
+
+class TestConfig(unittest.TestCase):
+
+    def test_defaults(self):
+        config = SimulatorConfig()
+        # expected the module constants
+        self.assertEqual(CACHE_SIZE, config.cache_size)
+        self.assertEqual(LINE_SIZE, config.line_size)
+        self.assertEqual(NUMBER_OF_CACHES, config.number_of_caches)
+        self.assertEqual(9, config.index_bits)
+        self.assertEqual(2, config.offset_bits)
+
+    def test_not_power_of_two(self):
+        with self.assertRaises(Exception):
+            SimulatorConfig(cache_size=500)
+        with self.assertRaises(Exception):
+            SimulatorConfig(line_size=3)
+
+    def test_cache_geometry(self):
+        config = SimulatorConfig(cache_size=256, line_size=8)
+        directory = Directory(config=config)
+        cache = Cache(0, directory=directory)
+        # the cache takes the config of its directory
+        self.assertIs(config, cache.config)
+        self.assertEqual(256, len(cache.cachelines))
+        self.assertEqual(8, cache._INDEX_BITS)
+        self.assertEqual(3, cache._OFFSET_BITS)
+
+    def test_ring_size(self):
+        directory = Directory(config=SimulatorConfig(number_of_caches=8))
+        caches = [Cache(i, directory=directory) for i in range(8)]
+        # expected distance around a ring of 8 caches
+        self.assertEqual(7, directory._get_furthest_distance([caches[1]], caches[0]))
+        directory.optimizer.OPTIMIZE = True
+        self.assertEqual(1, directory._get_furthest_distance([caches[1]], caches[0]))
+
+    def test_geometries_in_one_process(self):
+        default = run_statistics(trace1)
+        small = run_statistics(trace1, config=SimulatorConfig(cache_size=128))
+        large = run_statistics(trace1, config=SimulatorConfig(cache_size=2048))
+        # expected fewer conflict misses the larger the caches
+        self.assertGreater(small['CONFLICT_MISSES'], default['CONFLICT_MISSES'])
+        self.assertLess(large['CONFLICT_MISSES'], default['CONFLICT_MISSES'])
+        # the default config is not changed by the other runs
+        self.assertEqual(default, run_statistics(trace1, config=SimulatorConfig()))
+
+    def test_more_caches(self):
+        config = SimulatorConfig(number_of_caches=8)
+        expected = run_statistics(test_trace, directory_class=BitVectorDirectory, config=config)
+        actual = run_statistics(test_trace, config=config)
+        self.assertEqual(expected, actual)
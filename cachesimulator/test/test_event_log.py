@@ -0,0 +1,77 @@
+import logging
+import os
+import tempfile
+import unittest
+import numpy as np
+from cachesimulator.event_log import EventLog, read_event_log, event_names, EVENT_DTYPE
+from cachesimulator.simulator import simulate, create_system, run_trace
+from cachesimulator.test.setup import run_statistics, run_main
+from data.trace_files import trace1, test_trace, trace_addre_1
+
+logger = logging.getLogger("cachesimulator.Logger")
+logger.setLevel(logging.WARNING)
+
+class TestEventLog(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.directory.name, 'events.log')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_records(self):
+        with EventLog(self.log_path) as log:
+            statistic = simulate(trace_addre_1, tracer=log.tracer())
+        records = read_event_log(self.log_path)
+        names = event_names(records)
+        # expected a record of every message
+        self.assertEqual(EVENT_DTYPE, records.dtype)
+        self.assertEqual(log.records, len(records))
+        self.assertEqual(statistic.INVALIDATIONS_SENT, np.count_nonzero(names == 'invalidate_line'))
+        self.assertEqual(statistic.REPLACEMENT_WRITEBACKS, np.count_nonzero(names == 'replacement_writeback'))
+        self.assertEqual(statistic.DIRECTORY_ACCESSES, np.count_nonzero((names == 'read_miss') | (names == 'write_miss')))
+        # the first message is the compulsory read miss of P0 from memory
+        self.assertEqual(('read_miss', 0, -1, 1, 21), (names[0],) + tuple(records[['cache_id', 'other_id', 'address', 'cost']][0].tolist()))
+
+    def test_order(self):
+        # P1 reads the line P0 wrote, the read miss comes before the messages it causes
+        with EventLog(self.log_path) as log:
+            directory, caches = create_system()
+            run_trace([[0, 'W', 1], [1, 'R', 1]], caches, log.tracer())
+        records = read_event_log(self.log_path)
+        # expected
+        self.assertEqual(['write_miss', 'read_miss', 'remote_read_miss', 'coherence_writeback', 'send_line'],
+                         event_names(records).tolist())
+        self.assertEqual([0, 1, 1, 1, 1], records['cache_id'].tolist())
+        self.assertEqual([-1, -1, 0, -1, 0], records['other_id'].tolist())
+
+    def test_blocks(self):
+        with EventLog(self.log_path) as log:
+            simulate(trace1, tracer=log.tracer())
+        expected = read_event_log(self.log_path)
+        # expected the same records when written in many small blocks
+        other_path = os.path.join(self.directory.name, 'small.log')
+        with EventLog(other_path, block_size=7) as log:
+            simulate(trace1, tracer=log.tracer())
+        actual = read_event_log(other_path)
+        self.assertTrue(np.array_equal(expected, actual))
+
+    def test_toggle_command(self):
+        # the v commands of the trace only toggle logging
+        with EventLog(self.log_path) as log:
+            statistic = simulate(test_trace, tracer=log.tracer())
+        logger.setLevel(logging.WARNING)
+        names = event_names(read_event_log(self.log_path))
+        self.assertEqual(statistic.DIRECTORY_ACCESSES, np.count_nonzero((names == 'read_miss') | (names == 'write_miss')))
+
+    def test_empty(self):
+        EventLog(self.log_path).close()
+        self.assertEqual(0, len(read_event_log(self.log_path)))
+
+    def test_main(self):
+        # expected the same statistics with the log
+        expected = run_statistics(trace_addre_1)
+        actual = run_main(trace_addre_1, event_log=self.log_path)
+        self.assertEqual(expected, actual)
+        self.assertNotEqual(0, len(read_event_log(self.log_path)))
@@ -1,7 +1,6 @@
-from main import main
+from cachesimulator.simulator import simulate
 import unittest
 import logging
-from cachesimulator.statistics import Statistic
 from data.trace_files import B0
 logger = logging.getLogger("cachesimulator.Logger")
 logger.setLevel(logging.WARNING)
@@ -10,7 +9,6 @@ class TestMain(unittest.TestCase):
 
     def setUp(self):
         print('\n')
-        Statistic.reset()
 
     def test_B0(self):
         """Tests:
@@ -20,7 +18,7 @@ class TestMain(unittest.TestCase):
         """
         logger.info('test_B0')
         file = B0
-        main(file)
+        statistic = simulate(file)
 
         # expected requests
         expected_cache_access = 2
@@ -38,12 +36,12 @@ class TestMain(unittest.TestCase):
         expected_average_latency = expected_average_latency + 1 + 1 + 5 + 1 + 15 + 5 + 1 + 1
 
         # actual
-        actual_cache_access       = Statistic.CACHE_ACCESSES
-        actual_cache_probes       = Statistic.CACHE_PROBES
-        actual_directory_request  = Statistic.DIRECTORY_HOPS
-        actual_directory_access   = Statistic.DIRECTORY_ACCESSES
-        actual_memory_accesses    = Statistic.MEMORY_ACCESSES
-        actual_processor_hops     = Statistic.PROCESSOR_HOPS
+        actual_cache_access       = statistic.CACHE_ACCESSES
+        actual_cache_probes       = statistic.CACHE_PROBES
+        actual_directory_request  = statistic.DIRECTORY_HOPS
+        actual_directory_access   = statistic.DIRECTORY_ACCESSES
+        actual_memory_accesses    = statistic.MEMORY_ACCESSES
+        actual_processor_hops     = statistic.PROCESSOR_HOPS
 
         # equate
         self.assertEqual(expected_cache_access, actual_cache_access)
@@ -54,10 +52,10 @@ class TestMain(unittest.TestCase):
         self.assertEqual(expected_processor_hops, actual_processor_hops)
 
 
-    def check_statistics(self, expected_cache_probes, expected_cache_access):
+    def check_statistics(self, statistic, expected_cache_probes, expected_cache_access):
         # actual
-        actual_cache_probes = Statistic.CACHE_PROBES
-        actual_cache_access = Statistic.CACHE_ACCESSES
+        actual_cache_probes = statistic.CACHE_PROBES
+        actual_cache_access = statistic.CACHE_ACCESSES
 
         self.assertEqual(expected_cache_access, actual_cache_access)
         self.assertEqual(expected_cache_probes, actual_cache_probes)
\ No newline at end of file
@@ -6,7 +6,7 @@ from cachesimulator.cache import Cache, get_address_parameters
 from cachesimulator.trace_parser import parse
 from cachesimulator.config import NUMBER_OF_CACHES
 from cachesimulator.directory import Directory
-from cachesimulator.statistics import Statistic, save_statistics
+from cachesimulator.statistics import save_statistics
 from cachesimulator.optimizer import Optimizer
 from data.trace_files import trace1, trace2, optimize_trace
 import numpy as np
@@ -17,7 +17,6 @@ class TestOptimize(unittest.TestCase):
 
     def setUp(self):
         print('\n')
-        Statistic.reset()
 
     # def test_trace1(self):
     #     file = trace1
@@ -48,17 +47,16 @@ class TestOptimize(unittest.TestCase):
         fourteen = [MODIFIED, INVALID, INVALID, INVALID]
         expected_states = [one, two, three, four, five, six, seven, eight, nine, ten, eleven, twelve, thirteen, fourteen]
         # test it line by line
-        parsed_text = parse(file)
+        parsed_text = parse(file, stream=True)
         # create the directory
-        directory = Directory()
+        directory = Directory(optimizer=Optimizer(True))
+        statistic = directory.statistic
         # create the caches
         caches = [Cache(x, directory=directory) for x in range(NUMBER_OF_CACHES)]
         # append the caches to the directory
         for c in caches:
             directory.append_sharer(c)
-        
-        # set the optimizer
-        Optimizer.OPTIMIZE = True
+
 
         # run the main code
         for i, entry in enumerate(parsed_text):
@@ -68,16 +66,16 @@ class TestOptimize(unittest.TestCase):
             
             # check the command
             if (command == 'R'):
-                Statistic.add_instructions()
+                statistic.add_instructions()
                 cache.read(address)
-                print(Statistic.debug_statistics())
-                Statistic.end_instruction()
+                print(statistic.debug_statistics())
+                statistic.end_instruction()
 
             elif(command == 'W'):
-                Statistic.add_instructions()
+                statistic.add_instructions()
                 cache.write(address)
-                print(Statistic.debug_statistics())
-                Statistic.end_instruction()
+                print(statistic.debug_statistics())
+                statistic.end_instruction()
 
             # deal with other stuff
             elif(command == 'v'):
@@ -87,7 +85,7 @@ class TestOptimize(unittest.TestCase):
                 else:
                     logger.setLevel(logging.WARNING)
             elif(command == 'h'):
-                print(f"{Statistic.hit_rate()}")
+                print(f"{statistic.hit_rate()}")
             elif(command == 'p'):
                 print('Print out cache content')
 
@@ -118,7 +116,7 @@ class TestOptimize(unittest.TestCase):
                 expected_state = EXCLUSIVE
                 msg = f"Special instruction {i+1}, therfore checking cache {c1} went to E state. It is in state: {actual_state} with tag: {line.tag}"
                 self.assertEquals(actual_state, expected_state, msg)
-            print(Statistic.key_statistics())
+            print(statistic.key_statistics())
             print(i+1)
             # input()
 
@@ -138,19 +136,19 @@ class TestOptimize(unittest.TestCase):
         expected_total_average_latency = 23 #.2sf
 
         # -- Actual -- #
-        actual_private_accesses = Statistic.PRIVATE_ACCESSES
-        actual_remote_accesses = Statistic.REMOTE_ACCESSES
-        actual_off_chip_accesses = Statistic.OFF_CHIP_ACCESS
+        actual_private_accesses = statistic.PRIVATE_ACCESSES
+        actual_remote_accesses = statistic.REMOTE_ACCESSES
+        actual_off_chip_accesses = statistic.OFF_CHIP_ACCESS
         actual_total_accesses = actual_private_accesses + actual_remote_accesses + actual_off_chip_accesses 
-        actual_r_writebacks = Statistic.REPLACEMENT_WRITEBACKS
-        actual_c_writebacks = Statistic.COHERENCE_WRITEBACKS
-        actual_invalidations_sent = Statistic.INVALIDATIONS_SENT
+        actual_r_writebacks = statistic.REPLACEMENT_WRITEBACKS
+        actual_c_writebacks = statistic.COHERENCE_WRITEBACKS
+        actual_invalidations_sent = statistic.INVALIDATIONS_SENT
         # latencies
-        actual_priv_average_latency = Statistic.priv_average_latency()
-        actual_rem_average_latency = np.round(Statistic.rem_average_latency(),2)
-        actual_off_chip_average_latency = Statistic.off_chip_latency()
-        actual_total_latency = Statistic.total_latency()
-        actual_total_average_latency = np.round(Statistic.average_latency(),2)
+        actual_priv_average_latency = statistic.priv_average_latency()
+        actual_rem_average_latency = np.round(statistic.rem_average_latency(),2)
+        actual_off_chip_average_latency = statistic.off_chip_latency()
+        actual_total_latency = statistic.total_latency()
+        actual_total_average_latency = np.round(statistic.average_latency(),2)
 
         self.assertEqual(expected_private_accesses,     actual_private_accesses)
         self.assertEqual(expected_remote_accesses,      actual_remote_accesses)
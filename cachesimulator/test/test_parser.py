@@ -1,8 +1,19 @@
 import logging
 import unittest
-from cachesimulator.trace_parser import parse, read_text, modify_lines
+import types
+import os
+import gzip
+import lzma
+import bz2
+import tempfile
+import shutil
+from pathlib import Path
+from cachesimulator.trace_parser import parse, read_text, modify_lines, stream_text, stream_lines
+from cachesimulator.binary_trace import decode_text, parallel_decode_text, stream_columns
+from cachesimulator.sweep import load_trace
+from main import main
 import cachesimulator.Logger
-from data.trace_files import trace_test_RW_no_sharers
+from data.trace_files import trace_test_RW_no_sharers, test_trace
 
 logger = logging.getLogger("cachesimulator.Logger")
 logger.setLevel(logging.WARNING)
@@ -36,6 +47,77 @@ class TestParser(unittest.TestCase):
         actual = modify_lines(lines)
         self.assertEqual(expected, actual)
 
+    def test_modify_lines_many_caches(self):
+        lines = ['P12 W 1299', 'P10 R 0', 'P1 R 3']
+        # expected every digit of the processor
+        expected = [[12, 'W', 1299], [10, 'R', 0], [1, 'R', 3]]
+        # actual
+        actual = modify_lines(lines)
+        self.assertEqual(expected, actual)
+
+    def test_stream_text(self):
+        # expected text
+        expected_text = read_text(test_trace)
+        # actual
+        actual_text = stream_text(test_trace)
+        # equality
+        self.assertIsInstance(actual_text, types.GeneratorType)
+        self.assertEqual(expected_text, list(actual_text))
+
+    def test_stream_lines_unknown_command(self):
+        lines = ['P0 W 1299', 'x']
+        entries = stream_lines(lines)
+        # the first entry is decoded before the bad line is reached
+        self.assertEqual([0, 'W', 1299], next(entries))
+        with self.assertRaises(Exception):
+            next(entries)
+
+    def test_parse_stream(self):
+        # expected output
+        expected = parse(test_trace)
+        # actual
+        actual = parse(test_trace, stream=True)
+        # equality
+        self.assertIsInstance(actual, types.GeneratorType)
+        self.assertEqual(expected, list(actual))
+
+
+    # -- Compressed traces -- #
+    def compress(self, directory, extension, opener):
+        file = os.path.join(directory, 'test_trace.txt' + extension)
+        with open(test_trace, 'rb') as f_in, opener(file, 'wb') as f_out:
+            f_out.write(f_in.read())
+        return file
+
+    def test_compressed_traces(self):
+        expected = parse(test_trace)
+        with tempfile.TemporaryDirectory() as directory:
+            for extension, opener in (('.gz', gzip.open), ('.xz', lzma.open), ('.bz2', bz2.open)):
+                file = self.compress(directory, extension, opener)
+                self.assertEqual(expected, parse(file), extension)
+                self.assertEqual(expected, list(parse(file, stream=True)), extension)
+                self.assertEqual(expected, list(stream_columns(*decode_text(file, block_size=16))), extension)
+                self.assertEqual(expected, list(stream_columns(*parallel_decode_text(file, workers=2))), extension)
+
+    def test_main_compressed_trace(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file = self.compress(directory, '.gz', gzip.open)
+            statistic = main(file)
+            # statistics are saved as if the trace was not compressed
+            self.assertTrue(os.path.exists(os.path.join(directory, 'out_test_trace.txt')))
+        self.assertEqual(298, statistic.total_latency())
+
+    def test_main_path(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file = Path(shutil.copy(test_trace, directory))
+            # expected a pathlib.Path to be simulated and saved like a string path
+            for column, expected in zip(load_trace(file), decode_text(test_trace)):
+                self.assertEqual(expected.tolist(), column.tolist())
+            statistic = main(file)
+            self.assertTrue(os.path.exists(os.path.join(directory, 'out_test_trace.txt')))
+            self.assertEqual(298, statistic.total_latency())
+            statistic = main(file, profile=True)
+            self.assertEqual(298, statistic.total_latency())
 
 
 def get_test_trace_file():
@@ -0,0 +1,100 @@
+import logging
+import os
+import pstats
+import tempfile
+import tracemalloc
+import unittest
+from cachesimulator.profiler import Profiler
+from cachesimulator.test.setup import run_statistics, run_main
+from cachesimulator.simulator import create_system, simulate
+from cachesimulator.trace_parser import parse
+from cachesimulator.workloads import stream_workload
+from cachesimulator.cache import Cache
+from cachesimulator.directory import Directory
+from main import decode_entries, profile_simulation
+from data.trace_files import trace_addre_1
+
+logger = logging.getLogger("cachesimulator.Logger")
+logger.setLevel(logging.WARNING)
+
+
+class TestProfiler(unittest.TestCase):
+
+    def test_phases(self):
+        profiler = Profiler()
+        with profiler.memory('parse'):
+            data = list(range(10000))
+        profiler.stop()
+        with profiler.phase('parse'):
+            data = list(range(10000))
+        with profiler.phase('simulation'):
+            # expected the timed phases not to be traced
+            self.assertFalse(tracemalloc.is_tracing())
+            sum(data)
+        # expected every phase in order, with the memory of the list in the parse
+        self.assertEqual(['parse', 'simulation'], [name for name, seconds in profiler.phases])
+        self.assertGreater(profiler.peaks['parse'], 10000 * 8)
+        report = profiler.report(10000)
+        self.assertIn('parse', report)
+        self.assertIn('ns/access', report)
+
+    def test_disabled(self):
+        profiler = Profiler(enabled=False)
+        with profiler.phase('simulation', profile=True):
+            pass
+        with profiler.memory('simulation'):
+            pass
+        # expected nothing measured
+        self.assertEqual([], profiler.phases)
+        self.assertEqual({}, profiler.peaks)
+
+    def test_stats(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'simulation.prof')
+            profiler = Profiler(stats_path=path)
+            with profiler.phase('parse'):
+                sorted(range(100))
+            with profiler.phase('simulation', profile=True):
+                sum(range(100))
+            # expected only the simulation profiled
+            functions = [function for file, line, function in pstats.Stats(path).stats]
+        self.assertIn("<built-in method builtins.sum>", functions)
+        self.assertNotIn("<built-in method builtins.sorted>", functions)
+
+    def test_main(self):
+        # expected the same statistics when profiling
+        expected = run_statistics(trace_addre_1)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'simulation.prof')
+            actual = run_main(trace_addre_1, profile=True, profile_stats=path)
+            self.assertTrue(os.path.exists(path))
+        self.assertEqual(expected, actual)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_decode_entries(self):
+        directory, caches = create_system()
+        # expected the trace decoded once and replayed as often as needed
+        entries = decode_entries(trace_addre_1, None, caches)
+        self.assertEqual(parse(trace_addre_1), list(entries()))
+        self.assertEqual(parse(trace_addre_1), list(entries()))
+        # expected chunks of a trace in memory to be read only by the simulation
+        self.assertIsNone(decode_entries(stream_workload('uniform', 10), None, caches))
+
+    def test_profile_simulation(self):
+        profiler = Profiler()
+        statistic = profile_simulation(profiler, trace_addre_1, False, None, Cache, Directory, None, None)
+        # expected the same statistics and every phase timed in a single run
+        self.assertEqual(simulate(trace_addre_1).key_values(), statistic.key_values())
+        self.assertEqual(['construction', 'parse', 'simulation'], [name for name, seconds in profiler.phases])
+        self.assertEqual({}, profiler.peaks)
+        # expected every phase measured when the memory is asked for
+        profiler = Profiler()
+        statistic = profile_simulation(profiler, trace_addre_1, False, None, Cache, Directory, None, None, memory=True)
+        self.assertEqual(simulate(trace_addre_1).key_values(), statistic.key_values())
+        self.assertEqual(['construction', 'parse', 'simulation'], list(profiler.peaks))
+        self.assertFalse(tracemalloc.is_tracing())
+        # expected the memory of a stream read once not measured
+        profiler = Profiler()
+        statistic = profile_simulation(profiler, stream_workload('migratory', 100), False, None, Cache, Directory, None, None, memory=True)
+        self.assertEqual(100, statistic.INSTRUCTIONS)
+        self.assertEqual({}, profiler.peaks)
@@ -0,0 +1,129 @@
+import logging
+import os
+import tempfile
+import unittest
+from functools import partial
+from cachesimulator.set_associative_cache import SetAssociativeCache
+from cachesimulator.bitvector_directory import BitVectorDirectory
+from cachesimulator.replacement import TreePLRUPolicy, create_policy, POLICIES
+from cachesimulator.test.setup import run_statistics, write_random_trace
+from data.trace_files import trace1, test_trace, trace_addre_1, optimize_trace
+
+logger = logging.getLogger("cachesimulator.Logger")
+logger.setLevel(logging.WARNING)
+
+class TestSetAssociativeCache(unittest.TestCase):
+
+    def create_caches(self, num, **kwargs):
+        directory = BitVectorDirectory()
+        caches = [SetAssociativeCache(i, directory=directory, **kwargs) for i in range(num)]
+        for c in caches:
+            directory.append_sharer(c)
+        return directory, caches
+
+    def set_addresses(self, cache, tags, index=5):
+        # addresses of the tags which all map to the set of the index
+        return [(tag << (cache._INDEX_BITS + cache._OFFSET_BITS)) | (index << cache._OFFSET_BITS) for tag in tags]
+
+    def test_geometry(self):
+        directory, caches = self.create_caches(1, ways=4)
+        self.assertEqual(128, caches[0].sets)
+        self.assertEqual(7, caches[0]._INDEX_BITS)
+        with self.assertRaises(Exception):
+            SetAssociativeCache(0, ways=3)
+        with self.assertRaises(Exception):
+            SetAssociativeCache(0, policy='mru')
+
+    def test_lru_victim(self):
+        directory, caches = self.create_caches(2, ways=2, policy='lru')
+        cache = caches[0]
+        first, second, third = self.set_addresses(cache, (1, 2, 3))
+        cache.read(first)
+        cache.read(second)
+        # first is now the most recently used
+        self.assertTrue(cache.read(first))
+        cache.read(third)
+        # expected
+        self.assertTrue(cache.contains_address(first))
+        self.assertFalse(cache.contains_address(second))
+        # the directory is told about the stored address of the victim
+        self.assertEqual(0, directory.sharer_count(second))
+        self.assertEqual(1, cache.statistic.CONFLICT_MISSES)
+
+    def test_fifo_victim(self):
+        directory, caches = self.create_caches(2, ways=2, policy='fifo')
+        cache = caches[0]
+        first, second, third = self.set_addresses(cache, (1, 2, 3))
+        cache.read(first)
+        cache.read(second)
+        cache.read(first)
+        cache.read(third)
+        # expected the first block in is the first out
+        self.assertFalse(cache.contains_address(first))
+        self.assertTrue(cache.contains_address(second))
+
+    def test_invalid_line_replaced_first(self):
+        directory, caches = self.create_caches(2, ways=2, policy='lru')
+        first, second, third = self.set_addresses(caches[0], (1, 2, 3))
+        caches[0].read(first)
+        caches[0].read(second)
+        caches[0].read(first)
+        # cache 1 invalidates the copy of the most recently used block
+        caches[1].write(first)
+        caches[0].read(third)
+        # expected
+        self.assertTrue(caches[0].contains_address(second))
+        self.assertTrue(caches[0].contains_address(third))
+
+    def test_tree_plru(self):
+        policy = TreePLRUPolicy(1, 4)
+        for way in (0, 1, 2, 3):
+            policy.access(0, way)
+        # expected the tree points away from the last accesses
+        self.assertEqual(0, policy.victim(0))
+        policy.access(0, 0)
+        self.assertEqual(2, policy.victim(0))
+        with self.assertRaises(Exception):
+            TreePLRUPolicy(1, 6)
+
+    def test_policies_choose_a_way(self):
+        for name in POLICIES:
+            policy = create_policy(name, 4, 8)
+            for way in range(8):
+                policy.insert(3, way)
+            self.assertIn(policy.victim(3), range(8))
+
+    def test_fewer_conflict_misses(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file = write_random_trace(os.path.join(directory, 'random.txt'), 300, 0)
+            direct_mapped = run_statistics(file)
+            # every tag of the trace fits in the set
+            associative = run_statistics(file, cache_class=partial(SetAssociativeCache, ways=4))
+        # only lines invalidated by other caches are still replaced
+        self.assertLess(associative['CONFLICT_MISSES'], direct_mapped['CONFLICT_MISSES'])
+        self.assertEqual(0, associative['REPLACEMENT_WRITEBACKS'])
+        self.assertLess(associative['Total-latency'], direct_mapped['Total-latency'])
+
+    # -- A single way is the same as Cache -- #
+    def test_traces(self):
+        for policy in POLICIES:
+            cache_class = partial(SetAssociativeCache, ways=1, policy=policy)
+            for file in (test_trace, trace_addre_1, optimize_trace):
+                for optimize in (False, True):
+                    expected = run_statistics(file, optimize)
+                    actual = run_statistics(file, optimize, cache_class=cache_class)
+                    self.assertEqual(expected, actual, f"{file} {policy} optimize: {optimize}")
+
+    def test_random_traces(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for seed in range(5):
+                file = write_random_trace(os.path.join(directory, 'random.txt'), 300, seed)
+                for optimize in (False, True):
+                    expected = run_statistics(file, optimize)
+                    actual = run_statistics(file, optimize, cache_class=partial(SetAssociativeCache, ways=1))
+                    self.assertEqual(expected, actual, f"seed: {seed} optimize: {optimize}")
+
+    def test_trace1(self):
+        expected = run_statistics(trace1)
+        actual = run_statistics(trace1, cache_class=partial(SetAssociativeCache, ways=1))
+        self.assertEqual(expected, actual)
@@ -0,0 +1,97 @@
+import logging
+import os
+import tempfile
+import unittest
+from functools import partial
+import numpy as np
+from cachesimulator.binary_trace import decode_text
+from cachesimulator.bitvector_directory import BitVectorDirectory
+from cachesimulator.config import SimulatorConfig
+from cachesimulator.set_associative_cache import SetAssociativeCache
+from cachesimulator.sharded import simulate_sharded, select_shard
+from cachesimulator.sparse_directory import SparseDirectory
+from cachesimulator.trace_cache import TraceCache
+from cachesimulator.workloads import generate_workload
+from cachesimulator.simulator import simulate
+from cachesimulator.statistics import Statistic
+from cachesimulator.test.setup import run_statistics, run_main, write_random_trace
+from data.trace_files import trace1, test_trace, trace_addre_1, optimize_trace
+
+logger = logging.getLogger("cachesimulator.Logger")
+logger.setLevel(logging.WARNING)
+
+class TestSharded(unittest.TestCase):
+
+    def assertSameStatistics(self, expected, actual, msg=None):
+        self.assertEqual(expected.key_values(), actual.key_values(), msg)
+        self.assertEqual(expected.debug_statistics(), actual.debug_statistics(), msg)
+
+    def test_merge(self):
+        first = simulate(test_trace)
+        second = simulate(trace_addre_1)
+        merged = Statistic().merge(first).merge(second)
+        # expected
+        self.assertEqual(first.PRIVATE_ACCESSES + second.PRIVATE_ACCESSES, merged.PRIVATE_ACCESSES)
+        self.assertEqual(first.INSTRUCTIONS + second.INSTRUCTIONS, merged.INSTRUCTIONS)
+        self.assertEqual(first.total_latency() + second.total_latency(), merged.total_latency())
+
+    def test_shards_partition_trace(self):
+        columns = decode_text(trace1)
+        shards = [select_shard(columns, shard, 3, 2, 512) for shard in range(3)]
+        # expected every access in exactly one shard
+        accesses = np.count_nonzero(columns[0] >= 0)
+        self.assertEqual(accesses, sum(len(uids) for uids, commands, addresses in shards))
+        for uids, commands, addresses in shards:
+            self.assertEqual(1, len(np.unique(((addresses >> 2) & 511) % 3)))
+
+    def test_traces(self):
+        for file in (test_trace, trace_addre_1, optimize_trace):
+            for optimize in (False, True):
+                expected = simulate(file, optimize)
+                actual = simulate_sharded(file, optimize, shards=3, workers=1)
+                self.assertSameStatistics(expected, actual, f"{file} optimize: {optimize}")
+
+    def test_random_traces(self):
+        cache_class = partial(SetAssociativeCache, ways=2)
+        config = SimulatorConfig(cache_size=8)
+        with tempfile.TemporaryDirectory() as directory:
+            for seed in range(3):
+                file = write_random_trace(os.path.join(directory, 'random.txt'), 300, seed, num_indexes=8)
+                expected = simulate(file, True, cache_class=cache_class, directory_class=BitVectorDirectory, config=config)
+                actual = simulate_sharded(file, True, shards=4, workers=1, cache_class=cache_class,
+                                          directory_class=BitVectorDirectory, config=config)
+                self.assertSameStatistics(expected, actual, f"seed: {seed}")
+
+    def test_random_policy(self):
+        # every set has its own generator, so the shards choose the victims of the serial run
+        cache_class = partial(SetAssociativeCache, ways=4, policy='random')
+        config = SimulatorConfig(cache_size=64)
+        columns = generate_workload('uniform', 20000, config)
+        expected = simulate(columns, cache_class=cache_class, config=config)
+        actual = simulate_sharded(columns, shards=4, workers=1, cache_class=cache_class, config=config)
+        self.assertSameStatistics(expected, actual)
+
+    def test_unsupported(self):
+        # expected a sparse directory, a trace cache or an event log to be rejected
+        with self.assertRaises(Exception):
+            simulate_sharded(test_trace, shards=2, workers=1, directory_class=SparseDirectory)
+        with self.assertRaises(Exception):
+            simulate_sharded(test_trace, shards=2, workers=1, directory_class=partial(SparseDirectory, entries=64))
+        with tempfile.TemporaryDirectory() as directory:
+            with self.assertRaises(Exception):
+                run_main(test_trace, shards=2, trace_cache=TraceCache(directory))
+            with self.assertRaises(Exception):
+                run_main(test_trace, shards=2, event_log=os.path.join(directory, 'events.log'))
+
+    def test_trace1_workers(self):
+        expected = simulate(trace1)
+        actual = simulate_sharded(trace1, shards=4, workers=2)
+        self.assertSameStatistics(expected, actual)
+
+    def test_main(self):
+        # expected
+        expected = run_statistics(trace1, optimize=True)
+        # actual
+        actual = run_main(trace1, optimize=True, shards=2)
+        self.assertEqual(expected['Total-latency'], actual['Total-latency'])
+        self.assertEqual(expected['INVALIDATIONS_SENT'], actual['INVALIDATIONS_SENT'])
@@ -0,0 +1,64 @@
+import logging
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from cachesimulator.binary_trace import decode_text
+from cachesimulator.shared_trace import SharedTrace
+from cachesimulator.sweep import sweep
+from data.trace_files import trace1, test_trace
+
+logger = logging.getLogger("cachesimulator.Logger")
+logger.setLevel(logging.WARNING)
+
+
+def sum_addresses(handle):
+    trace = SharedTrace.attach(handle)
+    total = int(trace.columns[2].sum())
+    trace.close()
+    return total
+
+
+class TestSharedTrace(unittest.TestCase):
+
+    def test_columns(self):
+        columns = decode_text(test_trace)
+        with SharedTrace.create(columns) as trace:
+            # expected
+            for expected, actual in zip(columns, trace.columns):
+                self.assertEqual(expected.dtype, actual.dtype)
+                self.assertTrue(np.array_equal(expected, actual))
+
+    def test_attach(self):
+        columns = decode_text(test_trace)
+        with SharedTrace.create(columns) as trace:
+            other = SharedTrace.attach(trace.handle)
+            # both map the same block
+            trace.columns[2][0] = 12611
+            self.assertEqual(12611, other.columns[2][0])
+            self.assertFalse(other.owner)
+            other.close()
+
+    def test_attach_in_workers(self):
+        columns = decode_text(trace1)
+        expected = int(columns[2].sum())
+        with SharedTrace.create(columns) as trace:
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                actual = list(executor.map(sum_addresses, [trace.handle] * 4))
+        self.assertEqual([expected] * 4, actual)
+
+    def test_empty(self):
+        columns = (np.zeros(0, np.int16), np.zeros(0, np.int8), np.zeros(0, np.int64))
+        with SharedTrace.create(columns) as trace:
+            self.assertEqual(0, len(trace.columns[0]))
+
+    def test_unlinked(self):
+        with SharedTrace.create(decode_text(test_trace)) as trace:
+            handle = trace.handle
+        with self.assertRaises(FileNotFoundError):
+            SharedTrace.attach(handle)
+
+    def test_sweep_trace1(self):
+        grid = {'cache_size': [256, 512], 'optimize': [False, True]}
+        expected = sweep(trace1, grid, workers=1)
+        actual = sweep(trace1, grid, workers=2)
+        self.assertEqual(expected, actual)
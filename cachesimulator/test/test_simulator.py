@@ -0,0 +1,47 @@
+import logging
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from cachesimulator.simulator import create_system, run_trace, simulate
+from cachesimulator.trace_parser import parse
+from data.trace_files import test_trace, trace_addre_1, optimize_trace
+
+logger = logging.getLogger("cachesimulator.Logger")
+logger.setLevel(logging.WARNING)
+
+class TestSimulator(unittest.TestCase):
+
+    def test_systems_are_independent(self):
+        directory, caches = create_system(optimize=True)
+        other_directory, other_caches = create_system()
+        self.assertIs(directory.statistic, caches[3].statistic)
+        self.assertIs(directory.optimizer, caches[3].optimizer)
+        self.assertIsNot(directory.statistic, other_directory.statistic)
+        self.assertFalse(other_caches[0].optimizer.OPTIMIZE)
+
+    def test_run_trace(self):
+        directory, caches = create_system()
+        statistic = run_trace(parse(test_trace), caches)
+        # expected
+        self.assertIs(directory.statistic, statistic)
+        self.assertEqual(3, statistic.PRIVATE_ACCESSES)
+        self.assertEqual(298, statistic.total_latency())
+
+    def test_concurrent_simulations(self):
+        runs = [(file, optimize) for file in (test_trace, trace_addre_1, optimize_trace) for optimize in (False, True)]
+        # expected one after the other
+        expected = [simulate(file, optimize).key_statistics() for file, optimize in runs]
+        # actual all at once
+        with ThreadPoolExecutor(max_workers=len(runs)) as executor:
+            statistics = list(executor.map(lambda run: simulate(*run), runs))
+        actual = [statistic.key_statistics() for statistic in statistics]
+        self.assertEqual(expected, actual)
+
+    def test_latency_sums(self):
+        directory, caches = create_system()
+        statistic = run_trace(parse(test_trace), caches)
+        # expected every instruction counted once in the class of its access
+        self.assertEqual(statistic.PRIVATE_ACCESSES, statistic.PRIV_INSTRUCTIONS)
+        self.assertEqual(statistic.REMOTE_ACCESSES, statistic.REM_INSTRUCTIONS)
+        self.assertEqual(statistic.OFF_CHIP_ACCESS, statistic.OFF_CHIP_INSTRUCTIONS)
+        self.assertEqual(298, statistic.PRIV_LATENCY + statistic.REM_LATENCY + statistic.OFF_CHIP_LATENCY)
+        self.assertEqual(298 / statistic.INSTRUCTIONS, statistic.average_latency())
@@ -0,0 +1,157 @@
+import logging
+import os
+import tempfile
+import unittest
+from functools import partial
+from cachesimulator import MSI
+from cachesimulator.cache import Cache
+from cachesimulator.sparse_directory import SparseDirectory
+from cachesimulator.test.setup import run_statistics, write_random_trace
+from data.trace_files import trace1, test_trace, trace_addre_1, optimize_trace
+
+logger = logging.getLogger("cachesimulator.Logger")
+logger.setLevel(logging.WARNING)
+
+class TestSparseDirectory(unittest.TestCase):
+
+    def create_caches(self, num, **kwargs):
+        directory = SparseDirectory(**kwargs)
+        caches = [Cache(i, directory=directory) for i in range(num)]
+        for c in caches:
+            directory.append_sharer(c)
+        return directory, caches
+
+    def test_entries_multiple_of_ways(self):
+        with self.assertRaises(Exception):
+            SparseDirectory(entries=10, ways=4)
+
+    def test_unknown_encoding(self):
+        with self.assertRaises(Exception):
+            SparseDirectory(encoding='tree')
+
+    def test_eviction_invalidates_sharers(self):
+        # a single entry, every new block evicts the last
+        directory, caches = self.create_caches(4, entries=1, ways=1)
+        address = 12611
+        other_address = 12615
+        caches[1].read(address)
+        caches[2].read(address)
+        caches[0].read(other_address)
+        # expected
+        self.assertEqual(1, directory.statistic.DIRECTORY_EVICTIONS)
+        self.assertEqual(2, directory.statistic.INVALIDATIONS_SENT)
+        # actual
+        self.assertEqual(MSI.INVALID, caches[1].cachelines[80].state)
+        self.assertEqual(MSI.INVALID, caches[2].cachelines[80].state)
+        self.assertFalse(caches[1].contains_address(address))
+        self.assertEqual(1, directory.size)
+
+    def test_eviction_writes_back(self):
+        address = 12611
+        other_address = 12615
+        statistics = []
+        for entries in (1, 1024):
+            directory, caches = self.create_caches(4, entries=entries, ways=1)
+            caches[1].write(address)
+            directory.statistic.end_instruction()
+            caches[0].read(other_address)
+            directory.statistic.end_instruction()
+            statistics.append(directory.statistic)
+        # expected the modified block written back and the recall to cost the miss
+        self.assertEqual(1, statistics[0].COHERENCE_WRITEBACKS)
+        self.assertEqual(0, statistics[1].COHERENCE_WRITEBACKS)
+        self.assertGreater(statistics[0].total_latency(), statistics[1].total_latency())
+
+    def test_pointer_overflow_broadcasts(self):
+        directory, caches = self.create_caches(4, encoding='pointer', pointers=1)
+        address = 12611
+        caches[1].read(address)
+        caches[3].read(address)
+        # expected the overflowed entry to cover every cache
+        self.assertEqual(4, directory.sharer_count(address))
+        self.assertEqual([caches[1], caches[2], caches[3]], directory._get_sharers(caches[0], address))
+        caches[0].write(address)
+        # expected every other cache is sent an invalidation
+        self.assertEqual(3, directory.statistic.INVALIDATIONS_SENT)
+        self.assertFalse(caches[1].contains_address(address))
+        self.assertFalse(caches[3].contains_address(address))
+
+    def test_broadcast_latency(self):
+        address = 12611
+        latencies = []
+        for directory_class in (SparseDirectory, partial(SparseDirectory, encoding='pointer', pointers=1)):
+            directory = directory_class()
+            caches = [Cache(i, directory=directory) for i in range(4)]
+            for c in caches:
+                directory.append_sharer(c)
+            caches[2].read(address)
+            caches[3].read(address)
+            directory.statistic.reset()
+            caches[0].write(address)
+            directory.statistic.end_instruction()
+            latencies.append(directory.statistic.total_latency())
+        # expected the broadcast to wait for cache 1, further from cache 0 than the sharers
+        self.assertGreater(latencies[1], latencies[0])
+
+    def test_broadcast_freed(self):
+        directory, caches = self.create_caches(4, encoding='pointer', pointers=1)
+        address = 12611
+        # same index, another tag
+        conflict_address = address + (1 << 11)
+        caches[1].read(address)
+        caches[3].read(address)
+        caches[1].read(conflict_address)
+        # expected the entry to shrink back to the remaining sharer
+        self.assertEqual(1, directory.sharer_count(address))
+        caches[3].read(conflict_address)
+        # expected the entry freed once the last sharer left
+        self.assertIsNone(directory._peek(address >> 2))
+        self.assertEqual(0, directory.sharer_count(address))
+
+    def test_coarse_vector_group(self):
+        directory, caches = self.create_caches(4, encoding='coarse', group_size=2)
+        address = 12611
+        caches[2].read(address)
+        caches[0].write(address)
+        # expected cache 3 shares the group of cache 2
+        self.assertEqual(2, directory.statistic.INVALIDATIONS_SENT)
+        # expected cache 1 shares the group of cache 0
+        self.assertEqual(2, directory.sharer_count(address))
+
+    def test_bounded_entries(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file = write_random_trace(os.path.join(directory, 'random.txt'), 300, 0, num_tags=8, num_indexes=8)
+            directories = []
+            def directory_class(**kwargs):
+                directories.append(SparseDirectory(entries=8, ways=2, **kwargs))
+                return directories[-1]
+            small = run_statistics(file, directory_class=directory_class)
+            full = run_statistics(file)
+        self.assertLessEqual(directories[0].size, 8)
+        self.assertGreater(small['DIRECTORY_EVICTIONS'], 0)
+        self.assertGreater(small['INVALIDATIONS_SENT'], full['INVALIDATIONS_SENT'])
+
+    # -- Same statistics as Directory when nothing is evicted or imprecise -- #
+    def test_traces(self):
+        for directory_class in (SparseDirectory,
+                                partial(SparseDirectory, encoding='pointer', pointers=4),
+                                partial(SparseDirectory, encoding='coarse', group_size=1)):
+            for file in (test_trace, trace_addre_1, optimize_trace):
+                for optimize in (False, True):
+                    expected = run_statistics(file, optimize)
+                    actual = run_statistics(file, optimize, directory_class=directory_class)
+                    self.assertEqual(expected, actual, f"{file} optimize: {optimize}")
+
+    def test_random_traces(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for seed in range(5):
+                file = write_random_trace(os.path.join(directory, 'random.txt'), 300, seed)
+                for optimize in (False, True):
+                    expected = run_statistics(file, optimize)
+                    actual = run_statistics(file, optimize, directory_class=partial(SparseDirectory, encoding='pointer', pointers=4))
+                    self.assertEqual(expected, actual, f"seed: {seed} optimize: {optimize}")
+
+    def test_trace1(self):
+        expected = run_statistics(trace1)
+        actual = run_statistics(trace1, directory_class=partial(SparseDirectory, entries=1 << 16, ways=16))
+        self.assertEqual(expected, actual)
@@ -0,0 +1,107 @@
+import logging
+import os
+import random
+import tempfile
+import unittest
+from functools import partial
+import numpy as np
+from cachesimulator.binary_trace import decode_text
+from cachesimulator.config import SimulatorConfig
+from cachesimulator.set_associative_cache import SetAssociativeCache
+from cachesimulator.simulator import simulate
+from cachesimulator.stack_distance import FenwickTree, stack_distances, hit_counts, capacity_curve, COLD, INVALIDATED, UPGRADE
+from data.trace_files import trace1
+
+logger = logging.getLogger("cachesimulator.Logger")
+logger.setLevel(logging.WARNING)
+
+
+def write_trace(file, entries):
+    with open(file, 'w') as f:
+        for uid, command, line in entries:
+            f.write(f"P{uid} {command} {line << 2}\n")
+    return file
+
+
+class TestStackDistance(unittest.TestCase):
+
+    def test_fenwick_tree(self):
+        tree = FenwickTree(10)
+        values = [3, 0, 1, 4, 1, 5, 9, 2, 6, 5]
+        for position, value in enumerate(values):
+            tree.add(position, value)
+        for position in range(11):
+            self.assertEqual(sum(values[:position]), tree.prefix(position))
+
+    def test_distances(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file = write_trace(os.path.join(directory, 'trace.txt'),
+                               [(0, 'R', 1), (0, 'R', 2), (0, 'R', 3), (0, 'R', 1), (0, 'W', 3), (0, 'R', 3)])
+            uids, distances = stack_distances(decode_text(file))
+        # expected the write to a shared line never to be private
+        self.assertEqual([COLD, COLD, COLD, 2, UPGRADE, 0], distances.tolist())
+
+    def test_invalidations(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # P1 writing line 2 leaves a hole in the stack of P0, so line 1 keeps its depth
+            file = write_trace(os.path.join(directory, 'trace.txt'),
+                               [(0, 'R', 1), (0, 'R', 2), (1, 'W', 2), (0, 'R', 1), (0, 'R', 2), (1, 'R', 2)])
+            uids, distances = stack_distances(decode_text(file))
+        # expected
+        self.assertEqual([COLD, COLD, COLD, 1, INVALIDATED, 0], distances.tolist())
+        self.assertEqual([1, 2], hit_counts(distances, [1, 4]))
+
+    def test_holes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # a cache of 2 lines evicts line 1 before P1 invalidates line 2
+            file = write_trace(os.path.join(directory, 'trace.txt'),
+                               [(0, 'R', 1), (0, 'R', 2), (0, 'R', 3), (1, 'W', 2), (0, 'R', 1), (0, 'R', 3)])
+            rows = capacity_curve(file, [2, 4], SimulatorConfig(number_of_caches=2))
+        # expected line 1 to fill the hole, so line 3 still hits in a cache of 2 lines
+        self.assertEqual([1, 2], [row['Private-hits'] for row in rows])
+
+    def test_modified(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # P0 writes line 1 twice, the second write is private only while line 1 stays in the cache
+            file = write_trace(os.path.join(directory, 'trace.txt'),
+                               [(0, 'W', 1), (0, 'R', 2), (0, 'W', 1), (1, 'R', 1), (0, 'W', 1)])
+            uids, distances = stack_distances(decode_text(file), SimulatorConfig(number_of_caches=2))
+        # expected the write after the read of P1 to need the directory
+        self.assertEqual([COLD, COLD, 1, COLD, UPGRADE], distances.tolist())
+
+    def test_single_cache(self):
+        # a single cache gives the private accesses of a fully associative LRU cache
+        rng = random.Random(0)
+        entries = [(0, rng.choice('RW'), rng.randrange(40)) for _ in range(2000)]
+        with tempfile.TemporaryDirectory() as directory:
+            file = write_trace(os.path.join(directory, 'trace.txt'), entries)
+            sizes = [1, 2, 4, 8, 16, 32, 64]
+            actual = capacity_curve(file, sizes)
+            for size, row in zip(sizes, actual):
+                config = SimulatorConfig(cache_size=size)
+                expected = simulate(file, cache_class=partial(SetAssociativeCache, ways=size), config=config)
+                self.assertEqual(expected.PRIVATE_ACCESSES, row['Private-hits'], f"size: {size}")
+                self.assertEqual(expected.INSTRUCTIONS - expected.PRIVATE_ACCESSES, row['Misses'])
+
+    def test_many_caches(self):
+        # with invalidations and shared lines the curve matches every size of the reference
+        for seed, number_of_caches, lines in [(0, 2, 10), (1, 4, 40), (2, 4, 8), (3, 3, 70)]:
+            rng = random.Random(seed)
+            entries = [(rng.randrange(number_of_caches), rng.choice('RW'), rng.randrange(lines)) for _ in range(2000)]
+            with tempfile.TemporaryDirectory() as directory:
+                file = write_trace(os.path.join(directory, 'trace.txt'), entries)
+                sizes = [1, 2, 4, 8, 16, 32, 64]
+                actual = capacity_curve(file, sizes, SimulatorConfig(number_of_caches=number_of_caches))
+                for size, row in zip(sizes, actual):
+                    config = SimulatorConfig(cache_size=size, number_of_caches=number_of_caches)
+                    expected = simulate(file, cache_class=partial(SetAssociativeCache, ways=size), config=config)
+                    self.assertEqual(expected.PRIVATE_ACCESSES, row['Private-hits'], f"seed: {seed}, size: {size}")
+
+    def test_trace1(self):
+        rows = capacity_curve(trace1)
+        hits = [row['Private-hits'] for row in rows]
+        # expected every size until the cache size and more hits for larger caches
+        self.assertEqual(512, rows[9]['cache_size'])
+        self.assertEqual(sorted(hits), hits)
+        uids, distances = stack_distances(decode_text(trace1))
+        self.assertEqual(np.count_nonzero(distances >= 0), hits[-1])
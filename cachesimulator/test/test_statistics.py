@@ -0,0 +1,85 @@
+import logging
+import unittest
+from array import array
+from cachesimulator.simulator import simulate
+from cachesimulator.statistics import Statistic, Latency, histogram_percentile, HISTOGRAM_BUCKETS
+from data.trace_files import trace1, test_trace, trace_addre_1
+
+logger = logging.getLogger("cachesimulator.Logger")
+logger.setLevel(logging.WARNING)
+
+class TestStatistics(unittest.TestCase):
+
+    def test_percentile(self):
+        histogram = array('Q', [0] * (HISTOGRAM_BUCKETS + 1))
+        # latencies 1 to 100
+        for latency in range(1, 101):
+            histogram[latency] += 1
+        # expected
+        self.assertEqual(50, histogram_percentile(histogram, 50, 100))
+        self.assertEqual(90, histogram_percentile(histogram, 90, 100))
+        self.assertEqual(99, histogram_percentile(histogram, 99, 100))
+        self.assertEqual(100, histogram_percentile(histogram, 100, 100))
+
+    def test_empty(self):
+        statistic = Statistic()
+        # expected
+        self.assertEqual(0, statistic.key_values()['Rem-p99-latency'])
+        self.assertEqual(0, statistic.key_values()['Rem-max-latency'])
+
+    def test_histograms(self):
+        statistic = simulate(test_trace)
+        # expected a latency for every instruction of each type
+        self.assertEqual(statistic.PRIV_INSTRUCTIONS, sum(statistic.PRIV_HISTOGRAM))
+        self.assertEqual(statistic.REM_INSTRUCTIONS, sum(statistic.REM_HISTOGRAM))
+        self.assertEqual(statistic.OFF_CHIP_INSTRUCTIONS, sum(statistic.OFF_CHIP_HISTOGRAM))
+        self.assertEqual(statistic.PRIV_LATENCY, sum(latency * count for latency, count in enumerate(statistic.PRIV_HISTOGRAM)))
+
+    def test_trace1(self):
+        values = simulate(trace1).key_values()
+        # expected
+        self.assertEqual(2, values['Priv-p50-latency'])
+        self.assertEqual(14, values['Rem-p90-latency'])
+        self.assertEqual(19, values['Rem-p99-latency'])
+        self.assertEqual(19, values['Rem-max-latency'])
+        self.assertEqual(29, values['Off-chip-max-latency'])
+
+    def test_overflow(self):
+        statistic = simulate(test_trace, latency=Latency(MEMORY_ACCESS=2000))
+        values = statistic.key_values()
+        # expected every off chip access in the overflow bucket and reported by the longest
+        self.assertEqual(statistic.OFF_CHIP_INSTRUCTIONS, statistic.OFF_CHIP_HISTOGRAM[HISTOGRAM_BUCKETS])
+        self.assertEqual(values['Off-chip-max-latency'], values['Off-chip-p50-latency'])
+        self.assertLess(HISTOGRAM_BUCKETS, values['Off-chip-max-latency'])
+
+    def test_merge(self):
+        first = simulate(test_trace)
+        second = simulate(trace_addre_1, latency=Latency(PROCESSOR_HOP=10))
+        merged = Statistic().merge(first).merge(second)
+        # expected
+        self.assertEqual(sum(first.REM_HISTOGRAM) + sum(second.REM_HISTOGRAM), sum(merged.REM_HISTOGRAM))
+        self.assertEqual(max(first.REM_MAX_LATENCY, second.REM_MAX_LATENCY), merged.REM_MAX_LATENCY)
+
+    def test_instruction_cost(self):
+        statistic = Statistic(Latency(MEMORY_ACCESS=20))
+        statistic.add_instructions()
+        statistic.cache_probe()
+        statistic.directory_request()
+        statistic.memory_access()
+        statistic.processor_hop(2)
+        # expected the cost of every action so far
+        self.assertEqual(1 + 5 + 20 + 6, statistic.compute_current_latency())
+        statistic.off_chip_access()
+        statistic.remote_access()
+        statistic.end_instruction()
+        # expected remote takes precedence and the next instruction starts at 0
+        self.assertEqual(32, statistic.REM_LATENCY)
+        self.assertEqual(0, statistic.OFF_CHIP_INSTRUCTIONS)
+        self.assertEqual(0, statistic.compute_current_latency())
+
+    def test_no_access(self):
+        statistic = Statistic()
+        statistic.add_instructions()
+        statistic.cache_probe()
+        with self.assertRaises(Exception):
+            statistic.end_instruction()
@@ -0,0 +1,76 @@
+import csv
+import json
+import logging
+import os
+import tempfile
+import unittest
+from cachesimulator.config import SimulatorConfig
+from cachesimulator.simulator import simulate
+from cachesimulator.statistics import Latency
+from cachesimulator.sweep import expand_grid, sweep, save_table
+from data.trace_files import test_trace, trace_addre_1
+
+logger = logging.getLogger("cachesimulator.Logger")
+logger.setLevel(logging.WARNING)
+
+class TestSweep(unittest.TestCase):
+
+    def test_expand_grid(self):
+        points = expand_grid({'cache_size': [256, 512], 'optimize': [False, True], 'MEMORY_ACCESS': [15]})
+        # expected every combination in order
+        self.assertEqual(4, len(points))
+        self.assertEqual({'cache_size': 256, 'optimize': False, 'MEMORY_ACCESS': 15}, points[0])
+        self.assertEqual({'cache_size': 512, 'optimize': True, 'MEMORY_ACCESS': 15}, points[-1])
+        with self.assertRaises(Exception):
+            expand_grid({'cache_lines': [1]})
+
+    def test_unknown_latency(self):
+        with self.assertRaises(Exception):
+            Latency(MEMORY=30)
+        # expected the other latencies keep their defaults
+        latency = Latency(MEMORY_ACCESS=30)
+        self.assertEqual(30, latency.MEMORY_ACCESS)
+        self.assertEqual(Latency.PROCESSOR_HOP, latency.PROCESSOR_HOP)
+
+    def test_same_as_simulate(self):
+        grid = {'cache_size': [256, 512], 'line_size': [4, 8], 'optimize': [False, True]}
+        rows = sweep(trace_addre_1, grid, workers=1)
+        for row in rows:
+            config = SimulatorConfig(cache_size=row['cache_size'], line_size=row['line_size'])
+            expected = simulate(trace_addre_1, row['optimize'], config=config).key_values()
+            actual = {name: value for name, value in row.items() if name not in grid}
+            self.assertEqual(expected, actual, row)
+
+    def test_latency(self):
+        rows = sweep(test_trace, {'MEMORY_ACCESS': [15, 30]}, workers=1)
+        memory_accesses = simulate(test_trace).MEMORY_ACCESSES
+        # expected every memory access takes 15 cycles longer
+        self.assertEqual(298, rows[0]['Total-latency'])
+        self.assertEqual(298 + memory_accesses * 15, rows[1]['Total-latency'])
+
+    def test_workers(self):
+        grid = {'number_of_caches': [4, 8], 'optimize': [False, True], 'PROCESSOR_HOP': [3, 4]}
+        # expected
+        expected = sweep(test_trace, grid, workers=1)
+        # actual
+        actual = sweep(test_trace, grid, workers=2)
+        self.assertEqual(expected, actual)
+
+    def test_too_few_caches(self):
+        with self.assertRaises(Exception):
+            sweep(test_trace, {'number_of_caches': [2]}, workers=1)
+
+    def test_save_table(self):
+        rows = sweep(test_trace, {'cache_size': [256, 512]}, workers=1)
+        with tempfile.TemporaryDirectory() as directory:
+            csv_path = os.path.join(directory, 'sweep.csv')
+            json_path = os.path.join(directory, 'sweep.json')
+            save_table(rows, csv_path)
+            save_table(rows, json_path)
+            with open(csv_path) as f:
+                csv_rows = list(csv.DictReader(f))
+            with open(json_path) as f:
+                json_rows = json.load(f)
+        self.assertEqual(rows, json_rows)
+        self.assertEqual(['256', '512'], [row['cache_size'] for row in csv_rows])
+        self.assertEqual(str(rows[1]['Total-latency']), csv_rows[1]['Total-latency'])
@@ -1,8 +1,7 @@
-from main import main
+from cachesimulator.simulator import simulate
 import unittest
 import numpy as np
 import logging
-from cachesimulator.statistics import Statistic
 from data.trace_files import trace1, trace2, trace_addre_1, test_trace
 logger = logging.getLogger("cachesimulator.Logger")
 logger.setLevel(logging.WARNING)
@@ -11,12 +10,11 @@ class TestTrace(unittest.TestCase):
 
     def setUp(self):
         print('\n')
-        Statistic.reset()
 
     def test_val2_trace(self):
         logger.info('test_trace_test_2')
         file = trace_addre_1
-        main(file)
+        statistic = simulate(file)
 
         # -- Expected -- #
         # accesses
@@ -35,19 +33,19 @@ class TestTrace(unittest.TestCase):
         # expected_total_average_latency = 19.21  #.2sf
 
         # -- Actual -- #
-        actual_private_accesses = Statistic.PRIVATE_ACCESSES
-        actual_remote_accesses = Statistic.REMOTE_ACCESSES
-        actual_off_chip_accesses = Statistic.OFF_CHIP_ACCESS
+        actual_private_accesses = statistic.PRIVATE_ACCESSES
+        actual_remote_accesses = statistic.REMOTE_ACCESSES
+        actual_off_chip_accesses = statistic.OFF_CHIP_ACCESS
         actual_total_accesses = actual_private_accesses + actual_remote_accesses + actual_off_chip_accesses 
-        actual_r_writebacks = Statistic.REPLACEMENT_WRITEBACKS
-        actual_c_writebacks = Statistic.COHERENCE_WRITEBACKS
-        actual_invalidations_sent = Statistic.INVALIDATIONS_SENT
+        actual_r_writebacks = statistic.REPLACEMENT_WRITEBACKS
+        actual_c_writebacks = statistic.COHERENCE_WRITEBACKS
+        actual_invalidations_sent = statistic.INVALIDATIONS_SENT
         # latencies
-        # actual_priv_average_latency = Statistic.priv_average_latency()
-        # actual_rem_average_latency = Statistic.rem_average_latency()
-        # actual_off_chip_average_latency = Statistic.off_chip_latency()
-        actual_total_latency = Statistic.total_latency()
-        # actual_total_average_latency = np.round(Statistic.average_latency(),2)
+        # actual_priv_average_latency = statistic.priv_average_latency()
+        # actual_rem_average_latency = statistic.rem_average_latency()
+        # actual_off_chip_average_latency = statistic.off_chip_latency()
+        actual_total_latency = statistic.total_latency()
+        # actual_total_average_latency = np.round(statistic.average_latency(),2)
 
         self.assertEqual(expected_private_accesses,     actual_private_accesses)
         self.assertEqual(expected_remote_accesses,      actual_remote_accesses)
@@ -67,7 +65,7 @@ class TestTrace(unittest.TestCase):
         """
         logger.info('test_trace_test_1')
         file = test_trace
-        main(file)
+        statistic = simulate(file)
         # need to check the statistics object contains the correct info
         # expected_cache_probes = 2
         # expected_cache_access = 2
@@ -89,19 +87,19 @@ class TestTrace(unittest.TestCase):
         expected_total_average_latency = 19.87 #.2sf
 
         # -- Actual -- #
-        actual_private_accesses = Statistic.PRIVATE_ACCESSES
-        actual_remote_accesses = Statistic.REMOTE_ACCESSES
-        actual_off_chip_accesses = Statistic.OFF_CHIP_ACCESS
+        actual_private_accesses = statistic.PRIVATE_ACCESSES
+        actual_remote_accesses = statistic.REMOTE_ACCESSES
+        actual_off_chip_accesses = statistic.OFF_CHIP_ACCESS
         actual_total_accesses = actual_private_accesses + actual_remote_accesses + actual_off_chip_accesses 
-        actual_r_writebacks = Statistic.REPLACEMENT_WRITEBACKS
-        actual_c_writebacks = Statistic.COHERENCE_WRITEBACKS
-        actual_invalidations_sent = Statistic.INVALIDATIONS_SENT
+        actual_r_writebacks = statistic.REPLACEMENT_WRITEBACKS
+        actual_c_writebacks = statistic.COHERENCE_WRITEBACKS
+        actual_invalidations_sent = statistic.INVALIDATIONS_SENT
         # latencies
-        actual_priv_average_latency = Statistic.priv_average_latency()
-        actual_rem_average_latency = Statistic.rem_average_latency()
-        actual_off_chip_average_latency = Statistic.off_chip_latency()
-        actual_total_latency = Statistic.total_latency()
-        actual_total_average_latency = np.round(Statistic.average_latency(),2)
+        actual_priv_average_latency = statistic.priv_average_latency()
+        actual_rem_average_latency = statistic.rem_average_latency()
+        actual_off_chip_average_latency = statistic.off_chip_latency()
+        actual_total_latency = statistic.total_latency()
+        actual_total_average_latency = np.round(statistic.average_latency(),2)
 
         self.assertEqual(expected_private_accesses,     actual_private_accesses)
         self.assertEqual(expected_remote_accesses,      actual_remote_accesses)
@@ -123,7 +121,7 @@ class TestTrace(unittest.TestCase):
         """
         logger.info('test_trace1')
         file = trace1
-        main(file)
+        statistic = simulate(file)
 
         # -- Expected -- #
         # accesses
@@ -142,19 +140,19 @@ class TestTrace(unittest.TestCase):
         expected_total_average_latency = 3.72 #.2sf
 
         # -- Actual -- #
-        actual_private_accesses = Statistic.PRIVATE_ACCESSES
-        actual_remote_accesses = Statistic.REMOTE_ACCESSES
-        actual_off_chip_accesses = Statistic.OFF_CHIP_ACCESS
+        actual_private_accesses = statistic.PRIVATE_ACCESSES
+        actual_remote_accesses = statistic.REMOTE_ACCESSES
+        actual_off_chip_accesses = statistic.OFF_CHIP_ACCESS
         actual_total_accesses = actual_private_accesses + actual_remote_accesses + actual_off_chip_accesses 
-        actual_r_writebacks = Statistic.REPLACEMENT_WRITEBACKS
-        actual_c_writebacks = Statistic.COHERENCE_WRITEBACKS
-        actual_invalidations_sent = Statistic.INVALIDATIONS_SENT
+        actual_r_writebacks = statistic.REPLACEMENT_WRITEBACKS
+        actual_c_writebacks = statistic.COHERENCE_WRITEBACKS
+        actual_invalidations_sent = statistic.INVALIDATIONS_SENT
         # latencies
-        actual_priv_average_latency = Statistic.priv_average_latency()
-        actual_rem_average_latency = np.round(Statistic.rem_average_latency(),2)
-        actual_off_chip_average_latency = Statistic.off_chip_latency()
-        actual_total_latency = Statistic.total_latency()
-        actual_total_average_latency = np.round(Statistic.average_latency(),2)
+        actual_priv_average_latency = statistic.priv_average_latency()
+        actual_rem_average_latency = np.round(statistic.rem_average_latency(),2)
+        actual_off_chip_average_latency = statistic.off_chip_latency()
+        actual_total_latency = statistic.total_latency()
+        actual_total_average_latency = np.round(statistic.average_latency(),2)
 
         self.assertEqual(expected_private_accesses,     actual_private_accesses)
         self.assertEqual(expected_remote_accesses,      actual_remote_accesses)
@@ -176,7 +174,7 @@ class TestTrace(unittest.TestCase):
         """
         logger.info('test_trace2')
         file = trace2
-        main(file)
+        statistic = simulate(file)
 
         # -- Expected -- #
         # accesses
@@ -195,19 +193,19 @@ class TestTrace(unittest.TestCase):
         expected_total_average_latency = 5.17 #.2sf
 
         # -- Actual -- #
-        actual_private_accesses = Statistic.PRIVATE_ACCESSES
-        actual_remote_accesses = Statistic.REMOTE_ACCESSES
-        actual_off_chip_accesses = Statistic.OFF_CHIP_ACCESS
+        actual_private_accesses = statistic.PRIVATE_ACCESSES
+        actual_remote_accesses = statistic.REMOTE_ACCESSES
+        actual_off_chip_accesses = statistic.OFF_CHIP_ACCESS
         actual_total_accesses = actual_private_accesses + actual_remote_accesses + actual_off_chip_accesses 
-        actual_r_writebacks = Statistic.REPLACEMENT_WRITEBACKS
-        actual_c_writebacks = Statistic.COHERENCE_WRITEBACKS
-        actual_invalidations_sent = Statistic.INVALIDATIONS_SENT
+        actual_r_writebacks = statistic.REPLACEMENT_WRITEBACKS
+        actual_c_writebacks = statistic.COHERENCE_WRITEBACKS
+        actual_invalidations_sent = statistic.INVALIDATIONS_SENT
         # latencies
-        actual_priv_average_latency = Statistic.priv_average_latency()
-        actual_rem_average_latency = np.round(Statistic.rem_average_latency(),2)
-        actual_off_chip_average_latency = Statistic.off_chip_latency()
-        actual_total_latency = Statistic.total_latency()
-        actual_total_average_latency = np.round(Statistic.average_latency(),2)
+        actual_priv_average_latency = statistic.priv_average_latency()
+        actual_rem_average_latency = np.round(statistic.rem_average_latency(),2)
+        actual_off_chip_average_latency = statistic.off_chip_latency()
+        actual_total_latency = statistic.total_latency()
+        actual_total_average_latency = np.round(statistic.average_latency(),2)
 
         self.assertEqual(expected_private_accesses,     actual_private_accesses)
         self.assertEqual(expected_remote_accesses,      actual_remote_accesses)
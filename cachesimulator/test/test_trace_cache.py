@@ -0,0 +1,114 @@
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from main import main
+from cachesimulator.cache import get_address_parameters
+from cachesimulator.trace_cache import TraceCache, decode_trace, CACHE_EXTENSION
+from cachesimulator.trace_parser import parse
+from data.trace_files import test_trace, trace_addre_1
+
+logger = logging.getLogger("cachesimulator.Logger")
+logger.setLevel(logging.WARNING)
+
+class TestTraceCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache_directory = os.path.join(self.directory.name, 'cache')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def copy_trace(self, file):
+        copy = os.path.join(self.directory.name, os.path.basename(file))
+        shutil.copy(file, copy)
+        return copy
+
+    def test_decode_trace(self):
+        records = decode_trace(test_trace, line_size=4, cache_size=512)
+        entries = parse(test_trace)
+        # expected tag and index
+        for record, (uid, command, address) in zip(records, entries):
+            if (address < 0):
+                # (p, v, h) commands have no address
+                self.assertEqual(-1, record['tag'])
+                continue
+            tag, index, offset = get_address_parameters(address, 9, 2)
+            self.assertEqual(tag, record['tag'])
+            self.assertEqual(index, record['index'])
+            self.assertEqual(address >> 2, record['block'])
+
+    def test_load_hit(self):
+        trace_cache = TraceCache(self.cache_directory)
+        first = trace_cache.load(test_trace)
+        second = trace_cache.load(test_trace)
+        # expected
+        self.assertEqual(1, trace_cache.misses)
+        self.assertEqual(1, trace_cache.hits)
+        # actual
+        self.assertTrue(np.array_equal(first, second))
+
+    def test_geometry_changes_key(self):
+        trace_cache = TraceCache(self.cache_directory)
+        trace_cache.load(test_trace, line_size=4, cache_size=512)
+        trace_cache.load(test_trace, line_size=8, cache_size=512)
+        trace_cache.load(test_trace, line_size=4, cache_size=256)
+        # expected
+        self.assertEqual(3, trace_cache.misses)
+        self.assertEqual(3, len([name for name in os.listdir(self.cache_directory) if (name.endswith(CACHE_EXTENSION))]))
+
+    def test_content_changes_key(self):
+        trace_cache = TraceCache(self.cache_directory)
+        file = self.copy_trace(test_trace)
+        trace_cache.load(file)
+        with open(file, 'a') as f:
+            f.write('P0 R 12\n')
+        records = trace_cache.load(file)
+        # expected
+        self.assertEqual(2, trace_cache.misses)
+        self.assertEqual(len(parse(file)), len(records))
+
+    def test_digest_kept(self):
+        file = self.copy_trace(test_trace)
+        TraceCache(self.cache_directory).load(file)
+        # expected an unchanged trace not to be hashed again, even by a new cache
+        trace_cache = TraceCache(self.cache_directory)
+        trace_cache.load(file)
+        self.assertEqual(0, trace_cache.hashes)
+        self.assertEqual(1, trace_cache.hits)
+        # expected a changed trace to be hashed again
+        with open(file, 'a') as f:
+            f.write('P0 R 12\n')
+        trace_cache.load(file)
+        self.assertEqual(1, trace_cache.hashes)
+        self.assertEqual(1, trace_cache.misses)
+
+    def test_evict_least_recently_used(self):
+        trace_cache = TraceCache(self.cache_directory)
+        first = trace_cache.entry_path(test_trace)
+        second = trace_cache.entry_path(trace_addre_1)
+        trace_cache.load(test_trace)
+        trace_cache.load(trace_addre_1)
+        # make the first entry the least recently used
+        os.utime(first, (0, 0))
+        # budget only fits the second entry
+        trace_cache.budget = os.path.getsize(second)
+        trace_cache.evict()
+        # expected
+        self.assertFalse(os.path.exists(first))
+        self.assertTrue(os.path.exists(second))
+
+    def test_main_trace_cache(self):
+        trace_cache = TraceCache(self.cache_directory)
+        file = self.copy_trace(test_trace)
+        for run in range(2):
+            statistic = main(file, trace_cache=trace_cache)
+            # same statistics as parsing the trace
+            self.assertEqual(3, statistic.PRIVATE_ACCESSES)
+            self.assertEqual(7, statistic.REMOTE_ACCESSES)
+            self.assertEqual(5, statistic.OFF_CHIP_ACCESS)
+            self.assertEqual(298, statistic.total_latency())
+        self.assertEqual(1, trace_cache.hits)
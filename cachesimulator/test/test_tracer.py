@@ -0,0 +1,150 @@
+import logging
+import os
+import tempfile
+import unittest
+from cachesimulator.simulator import create_system, run_trace, simulate
+from cachesimulator.trace_parser import parse
+from cachesimulator.tracer import Tracer, LoggingSink, STATISTIC_EVENTS
+from data.trace_files import trace_addre_1, optimize_trace
+
+logger = logging.getLogger("cachesimulator.Logger")
+logger.setLevel(logging.WARNING)
+
+
+class RecordingSink:
+
+    def __init__(self):
+        self.events = []
+
+    def __call__(self, event, cache_id, other_id, address, cost):
+        self.events.append((event, cache_id, other_id, address, cost))
+
+
+class TestTracer(unittest.TestCase):
+
+    def test_disabled(self):
+        directory, caches = create_system()
+        sink = RecordingSink()
+        tracer = Tracer([sink])
+        statistic = run_trace(parse(trace_addre_1), caches, tracer)
+        # expected nothing hooked and nothing traced
+        self.assertEqual([], sink.events)
+        self.assertNotIn('cache_probe', vars(statistic))
+        self.assertNotIn('read', vars(caches[0]))
+        self.assertEqual(simulate(trace_addre_1).key_values(), statistic.key_values())
+
+    def test_enabled(self):
+        directory, caches = create_system()
+        sink = RecordingSink()
+        tracer = Tracer([sink])
+        tracer.enable()
+        statistic = run_trace(parse(trace_addre_1), caches, tracer)
+        # expected the same statistics, with the cost of every action traced
+        self.assertEqual(simulate(trace_addre_1).key_values(), statistic.key_values())
+        actions = [event for event in sink.events if (event[0] in STATISTIC_EVENTS)]
+        self.assertEqual(statistic.total_latency(), sum(event[4] for event in actions))
+        accesses = [event for event in sink.events if (event[0] in ('read', 'write'))]
+        self.assertEqual(statistic.INSTRUCTIONS, len(accesses))
+        self.assertEqual(statistic.total_latency(), sum(event[4] for event in accesses))
+        self.assertEqual(('read', 0, None, 1, 29), accesses[0])
+        probes = [event for event in sink.events if (event[0] == 'cache_probe')]
+        self.assertEqual(statistic.CACHE_PROBES, len(probes))
+
+    def test_remote_events(self):
+        directory, caches = create_system()
+        sink = RecordingSink()
+        tracer = Tracer([sink])
+        tracer.enable()
+        run_trace([[0, 'R', 1], [1, 'W', 1]], caches, tracer)
+        # expected P1 invalidating P0
+        self.assertIn(('invalidate_line', 1, 0, 1, 0), sink.events)
+        self.assertIn(('write_miss', 1, None, 1, 11), sink.events)
+        self.assertIn(('processor_hop', 1, None, 1, 3), sink.events)
+
+    def test_disable(self):
+        directory, caches = create_system()
+        tracer = Tracer([RecordingSink()])
+        tracer.attach(caches)
+        tracer.enable()
+        self.assertIn('cache_probe', vars(directory.statistic))
+        self.assertIn('read_miss', vars(directory))
+        tracer.disable()
+        # expected every hook removed
+        for name in STATISTIC_EVENTS:
+            self.assertNotIn(name, vars(directory.statistic))
+        self.assertNotIn('read_miss', vars(directory))
+        self.assertNotIn('invalidate_line', vars(caches[2]))
+
+    def test_toggle_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file = os.path.join(directory, 'trace.txt')
+            with open(file, 'w') as f:
+                f.write('P0 R 1\nv\nP1 R 1\nv\nP2 R 1\n')
+            sink = RecordingSink()
+            tracer = Tracer([sink], events=['read'])
+            tracer.enable()
+            with self.assertLogs(logger, logging.INFO) as logs:
+                simulate(file, tracer=tracer)
+        logger.setLevel(logging.WARNING)
+        # expected only the access between the v commands logged, the sink gets every access
+        self.assertEqual(['INFO:cachesimulator.Logger:read: cache 1, address 1, cost 19'], logs.output)
+        self.assertEqual(3, len(sink.events))
+
+    def test_events(self):
+        directory, caches = create_system()
+        sink = RecordingSink()
+        tracer = Tracer([sink], events=['invalidate_line', 'write_miss'])
+        tracer.enable()
+        run_trace([[0, 'R', 1], [1, 'W', 1]], caches, tracer)
+        # expected only the chosen events traced, the write miss before the invalidation it sends
+        self.assertEqual([('write_miss', 1, None, 1, 11), ('invalidate_line', 1, 0, 1, 0)], sink.events)
+        self.assertNotIn('cache_probe', vars(directory.statistic))
+
+    def test_order(self):
+        directory, caches = create_system()
+        sink = RecordingSink()
+        tracer = Tracer([sink], events=['read', 'read_miss', 'remote_read_miss', 'send_line', 'directory_access'])
+        tracer.enable()
+        run_trace([[0, 'W', 1], [1, 'R', 1]], caches, tracer)
+        # expected every event of the read before the events it caused
+        events = [event[0] for event in sink.events]
+        self.assertEqual(['directory_access', 'read', 'read_miss', 'directory_access', 'remote_read_miss', 'send_line'], events)
+        # expected the cost of an event to include the cost of the events it caused
+        read, read_miss, directory_access = sink.events[1:4]
+        self.assertEqual(('read', 1, None, 1), read[:4])
+        self.assertGreaterEqual(read[4], read_miss[4])
+        self.assertGreaterEqual(read_miss[4], directory_access[4])
+        self.assertNotEqual(0, directory_access[4])
+
+    def test_raising_method(self):
+        directory, caches = create_system()
+        sink = RecordingSink()
+        def read_miss(cache, address, stored_address):
+            raise Exception('read miss failed')
+        directory.read_miss = read_miss
+        tracer = Tracer([sink], events=['read', 'read_miss', 'write'])
+        tracer.enable()
+        with self.assertRaises(Exception):
+            run_trace([[0, 'R', 1]], caches, tracer)
+        # expected the events of the failed access ended, so the next access is traced on its own
+        self.assertEqual(0, tracer._depth)
+        self.assertEqual(['read', 'read_miss'], [event[0] for event in sink.events])
+        run_trace([[0, 'W', 1]], caches, tracer)
+        self.assertEqual(['read', 'read_miss', 'write'], [event[0] for event in sink.events])
+
+    def test_logging_sink(self):
+        directory, caches = create_system()
+        tracer = Tracer([LoggingSink(logging.WARNING)])
+        tracer.enable()
+        with self.assertLogs(logger, logging.WARNING) as logs:
+            run_trace([[0, 'R', 1], [1, 'W', 1]], caches, tracer)
+        self.assertIn('WARNING:cachesimulator.Logger:invalidate_line: cache 1 with cache 0, address 1, cost 0', logs.output)
+
+    def test_optimize(self):
+        sink = RecordingSink()
+        tracer = Tracer([sink])
+        tracer.enable()
+        statistic = simulate(optimize_trace, True, tracer=tracer)
+        # expected
+        self.assertEqual(simulate(optimize_trace, True).key_values(), statistic.key_values())
+        self.assertEqual(statistic.total_latency(), sum(event[4] for event in sink.events if (event[0] in STATISTIC_EVENTS)))
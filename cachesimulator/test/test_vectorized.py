@@ -0,0 +1,84 @@
+import logging
+import os
+import tempfile
+import unittest
+from functools import partial
+from cachesimulator.binary_trace import decode_text
+from cachesimulator.config import SimulatorConfig
+from cachesimulator.set_associative_cache import SetAssociativeCache
+from cachesimulator.simulator import simulate
+from cachesimulator.sparse_directory import SparseDirectory
+from cachesimulator.trace_cache import TraceCache
+from cachesimulator.statistics import Latency
+from cachesimulator.vectorized import run_vectorized, simulate_vectorized
+from cachesimulator.test.setup import run_statistics, run_main, write_random_trace
+from data.trace_files import trace1, test_trace, trace_addre_1, optimize_trace
+
+logger = logging.getLogger("cachesimulator.Logger")
+logger.setLevel(logging.WARNING)
+
+class TestVectorized(unittest.TestCase):
+
+    def assertSameStatistics(self, expected, actual, msg=None):
+        self.assertEqual(expected.key_values(), actual.key_values(), msg)
+        self.assertEqual(expected.debug_statistics(), actual.debug_statistics(), msg)
+        self.assertEqual(expected.PRIV_LATENCY, actual.PRIV_LATENCY, msg)
+        self.assertEqual(expected.REM_LATENCY, actual.REM_LATENCY, msg)
+        self.assertEqual(expected.OFF_CHIP_LATENCY, actual.OFF_CHIP_LATENCY, msg)
+        self.assertEqual(expected.REM_HISTOGRAM, actual.REM_HISTOGRAM, msg)
+
+    def test_traces(self):
+        for file in (test_trace, trace_addre_1, optimize_trace):
+            for optimize in (False, True):
+                expected = simulate(file, optimize)
+                actual = simulate_vectorized(file, optimize)
+                self.assertSameStatistics(expected, actual, f"{file} optimize: {optimize}")
+
+    def test_random_traces(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for number_of_caches in (2, 4, 8):
+                config = SimulatorConfig(cache_size=8, number_of_caches=number_of_caches)
+                for seed in range(3):
+                    file = write_random_trace(os.path.join(directory, 'random.txt'), 1000, seed,
+                                              num_caches=number_of_caches, num_indexes=8)
+                    for optimize in (False, True):
+                        expected = simulate(file, optimize, config=config)
+                        actual = simulate_vectorized(file, optimize, config=config)
+                        self.assertSameStatistics(expected, actual, f"caches: {number_of_caches} seed: {seed} optimize: {optimize}")
+
+    def test_latency(self):
+        latency = Latency(MEMORY_ACCESS=30, PROCESSOR_HOP=2)
+        expected = simulate(trace_addre_1, True, latency=latency)
+        actual = simulate_vectorized(trace_addre_1, True, latency=latency)
+        self.assertSameStatistics(expected, actual)
+
+    def test_trace1(self):
+        for optimize in (False, True):
+            expected = simulate(trace1, optimize)
+            actual = simulate_vectorized(trace1, optimize)
+            self.assertSameStatistics(expected, actual, f"optimize: {optimize}")
+
+    def test_empty(self):
+        columns = decode_text(test_trace)
+        statistic = run_vectorized(tuple(column[:0] for column in columns))
+        # expected
+        self.assertEqual(0, statistic.INSTRUCTIONS)
+        self.assertEqual(0, statistic.total_latency())
+
+    def test_main(self):
+        # expected
+        expected = run_statistics(trace1, optimize=True)
+        # actual
+        actual = run_main(trace1, optimize=True, vectorized=True)
+        self.assertEqual(expected, actual)
+
+    def test_unsupported(self):
+        # expected the options the engine does not simulate to be rejected
+        for options in ({'cache_class': partial(SetAssociativeCache, ways=2)}, {'directory_class': SparseDirectory}):
+            with self.assertRaises(Exception):
+                run_main(test_trace, vectorized=True, **options)
+        with tempfile.TemporaryDirectory() as directory:
+            with self.assertRaises(Exception):
+                run_main(test_trace, vectorized=True, trace_cache=TraceCache(directory))
+            with self.assertRaises(Exception):
+                run_main(test_trace, vectorized=True, event_log=os.path.join(directory, 'events.log'))
@@ -0,0 +1,74 @@
+import logging
+import os
+import tempfile
+import unittest
+import numpy as np
+from cachesimulator.binary_trace import load_binary, decode_text, stream_columns
+from cachesimulator.config import SimulatorConfig
+from cachesimulator.simulator import create_system, run_trace, simulate
+from cachesimulator.sharded import simulate_sharded
+from cachesimulator.vectorized import simulate_vectorized
+from cachesimulator.workloads import WORKLOADS, stream_workload, generate_workload, write_text, write_binary
+from main import main
+
+logger = logging.getLogger("cachesimulator.Logger")
+logger.setLevel(logging.WARNING)
+
+
+class TestWorkloads(unittest.TestCase):
+
+    def test_workloads(self):
+        config = SimulatorConfig(number_of_caches=4)
+        for name in WORKLOADS:
+            uids, commands, addresses = generate_workload(name, 1000, config)
+            # expected every access of a cache of the system
+            self.assertEqual(1000, len(uids))
+            self.assertTrue(np.all((uids >= 0) & (uids < 4)), name)
+            self.assertTrue(np.all(addresses >= 0), name)
+            self.assertTrue(set(commands.tolist()) <= {0, 1}, name)
+
+    def test_chunks(self):
+        # expected the same workload however it is chunked
+        expected = generate_workload('hot_set', 1000, seed=3)
+        chunks = list(stream_workload('hot_set', 1000, seed=3, chunk_size=1000))
+        self.assertEqual(1, len(chunks))
+        for column, other in zip(expected, chunks[0]):
+            self.assertTrue(np.array_equal(column, other))
+
+    def test_sharing(self):
+        config = SimulatorConfig(number_of_caches=4)
+        # expected every line of the producer invalidated in the readers
+        directory, caches = create_system(config)
+        producer = run_trace(stream_columns(*generate_workload('producer_consumer', 4000, config)), caches)
+        self.assertNotEqual(0, producer.INVALIDATIONS_SENT)
+        # expected streaming to share nothing
+        directory, caches = create_system(config)
+        streaming = run_trace(stream_columns(*generate_workload('streaming', 4000, config)), caches)
+        self.assertEqual(0, streaming.INVALIDATIONS_SENT)
+        self.assertEqual(0, streaming.COHERENCE_MISSES)
+
+    def test_write(self):
+        columns = generate_workload('false_sharing', 500)
+        with tempfile.TemporaryDirectory() as directory:
+            text_path = write_text([columns], os.path.join(directory, 'workload.txt'))
+            binary_path = write_binary([columns], os.path.join(directory, 'workload.npy'), 500)
+            # expected the same trace in both formats
+            for column, text, binary in zip(columns, decode_text(text_path), (load_binary(binary_path)[field] for field in ('uid', 'command', 'address'))):
+                self.assertTrue(np.array_equal(column, text))
+                self.assertTrue(np.array_equal(column, binary))
+            self.assertEqual(simulate(text_path).key_values(), simulate(binary_path).key_values())
+
+    def test_in_memory(self):
+        columns = generate_workload('migratory', 3000, seed=1)
+        with tempfile.TemporaryDirectory() as directory:
+            text_path = write_text([columns], os.path.join(directory, 'workload.txt'))
+            expected = simulate(text_path).key_values()
+            # expected the same statistics from the columns and from the chunks, as they are generated
+            self.assertEqual(expected, simulate(columns).key_values())
+            self.assertEqual(expected, simulate(stream_workload('migratory', 3000, seed=1, chunk_size=512)).key_values())
+            self.assertEqual(expected, simulate_vectorized(stream_workload('migratory', 3000, seed=1)).key_values())
+            self.assertEqual(expected, simulate_sharded(columns, shards=2, workers=1).key_values())
+            # expected main to simulate it without saving the statistics anywhere
+            self.assertEqual(expected, main(text_path).key_values())
+            self.assertEqual(expected, main(stream_workload('migratory', 3000, seed=1)).key_values())
+            self.assertEqual(['out_workload.txt', 'workload.txt'], sorted(os.listdir(directory)))
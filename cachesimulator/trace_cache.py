@@ -0,0 +1,202 @@
+from cachesimulator.config import CACHE_SIZE, LINE_SIZE
+from cachesimulator.binary_trace import decode_text, TRACE_DTYPE, CHUNK_SIZE
+from cachesimulator.trace_parser import COMMANDS
+import numpy as np
+import hashlib
+import tempfile
+import json
+import os
+
+# trace decoded for a cache geometry, tag and index are -1 for the (p, v, h) commands
+DECODED_DTYPE = np.dtype(TRACE_DTYPE.descr + [('tag', np.int64), ('index', np.int32), ('block', np.int64)])
+CACHE_EXTENSION = '.npy'
+# where decoded traces are kept and how many bytes they may take up in total
+CACHE_DIRECTORY = os.path.join(os.path.expanduser('~'), '.cache', 'cachesimulator')
+CACHE_BUDGET = 1 << 30
+# number of bytes hashed at a time
+HASH_BLOCK_SIZE = 1 << 24
+# digests of the traces kept in the cache directory, path -> size, mtime and digest
+DIGEST_INDEX = 'digests.json'
+
+
+class TraceCache():
+    """Keeps fully decoded traces on disk so repeated runs of the same trace skip
+        parsing and address decoding. Entries are keyed by the content hash of the
+        trace and the cache geometry, and the least recently used entries are
+        removed once the total size goes over the budget. The digest of a trace is
+        kept with its size and modification time, so a trace is only hashed again
+        once it changes.
+    """
+
+    def __init__(self, directory=CACHE_DIRECTORY, budget=CACHE_BUDGET):
+        self.directory = directory
+        self.budget = budget
+        self.hits = 0
+        self.misses = 0
+        # number of traces hashed, the others had a known digest
+        self.hashes = 0
+        os.makedirs(directory, exist_ok=True)
+        self._index_path = os.path.join(directory, DIGEST_INDEX)
+        self._digests = {}
+        if (os.path.exists(self._index_path)):
+            with open(self._index_path) as f:
+                self._digests = json.load(f)
+
+    def load(self, file_path, line_size=LINE_SIZE, cache_size=CACHE_SIZE):
+        """Gets the decoded trace, decoding it and storing it if it is not cached
+
+        Args:
+            file_path (string): path to the trace
+            line_size (int): number of words within a cache line
+            cache_size (int): number of lines within a cache
+
+        Returns:
+            np.memmap: The decoded trace with dtype DECODED_DTYPE
+        """
+        entry = self.entry_path(file_path, line_size, cache_size)
+        if (os.path.exists(entry)):
+            self.hits += 1
+            # mark the entry as recently used
+            os.utime(entry)
+            return np.load(entry, mmap_mode='r')
+
+        self.misses += 1
+        records = decode_trace(file_path, line_size, cache_size)
+        # write to a temporary file first so a half written entry is never loaded
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(descriptor, 'wb') as f:
+            np.save(f, records)
+        os.replace(temporary, entry)
+        self.evict(keep=entry)
+        return np.load(entry, mmap_mode='r')
+
+    def stream(self, file_path, line_size=LINE_SIZE, cache_size=CACHE_SIZE, chunk_size=CHUNK_SIZE):
+        """Replays the decoded trace
+
+        Args:
+            file_path (string): path to the trace
+            line_size (int): number of words within a cache line
+            cache_size (int): number of lines within a cache
+            chunk_size (int): number of entries turned into python objects at a time
+
+        Returns:
+            generator: The entries [cache.id, command, address, tag, index]
+        """
+        return stream_decoded(self.load(file_path, line_size, cache_size), chunk_size)
+
+    def entry_path(self, file_path, line_size=LINE_SIZE, cache_size=CACHE_SIZE):
+        """Gets the path of the entry for a trace and cache geometry
+
+        Returns:
+            string: path to the entry
+        """
+        key = f"{self.digest(file_path)}-{line_size}-{cache_size}"
+        return os.path.join(self.directory, key + CACHE_EXTENSION)
+
+    def digest(self, file_path):
+        """Gets the content hash of the trace, which is only hashed if its size or
+            modification time are not the ones of its known digest
+
+        Args:
+            file_path (string): path to the trace
+
+        Returns:
+            string: The hex digest of the content
+        """
+        status = os.stat(file_path)
+        path = os.path.abspath(file_path)
+        known = self._digests.get(path)
+        if (known is not None and known[:2] == [status.st_size, status.st_mtime_ns]):
+            return known[2]
+        self.hashes += 1
+        digest = hash_file(file_path)
+        self._digests[path] = [status.st_size, status.st_mtime_ns, digest]
+        # write to a temporary file first so a half written index is never loaded
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(descriptor, 'w') as f:
+            json.dump(self._digests, f)
+        os.replace(temporary, self._index_path)
+        return digest
+
+    def evict(self, keep=None):
+        """Removes the least recently used entries until the entries fit in the budget
+
+        Args:
+            keep (string): path to an entry which is never removed
+        """
+        entries = [os.path.join(self.directory, name) for name in os.listdir(self.directory)
+            if name.endswith(CACHE_EXTENSION)]
+        entries.sort(key=os.path.getmtime)
+        total = sum(os.path.getsize(entry) for entry in entries)
+        for entry in entries:
+            if (total <= self.budget):
+                break
+            if (entry != keep):
+                total -= os.path.getsize(entry)
+                os.remove(entry)
+
+    def clear(self):
+        """Removes every entry"""
+        for name in os.listdir(self.directory):
+            if name.endswith(CACHE_EXTENSION):
+                os.remove(os.path.join(self.directory, name))
+
+
+def decode_trace(file_path, line_size=LINE_SIZE, cache_size=CACHE_SIZE):
+    """Decodes the trace and the tag, index and block address of every access
+
+    Args:
+        file_path (string): path to the trace
+        line_size (int): number of words within a cache line
+        cache_size (int): number of lines within a cache
+
+    Returns:
+        np.ndarray: The decoded trace with dtype DECODED_DTYPE
+    """
+    uids, commands, addresses = decode_text(file_path)
+    offset_bits = int(np.log2(line_size))
+    index_bits = int(np.log2(cache_size))
+
+    records = np.empty(len(uids), dtype=DECODED_DTYPE)
+    records['uid'] = uids
+    records['command'] = commands
+    records['address'] = addresses
+    # the (p, v, h) commands have no address
+    control = (addresses < 0)
+    blocks = np.where(control, -1, addresses >> offset_bits)
+    records['block'] = blocks
+    records['tag'] = np.where(control, -1, addresses >> (offset_bits + index_bits))
+    records['index'] = np.where(control, -1, blocks & (cache_size - 1))
+    return records
+
+def stream_decoded(records, chunk_size=CHUNK_SIZE):
+    """Lazily turns the decoded trace into entries
+
+    Args:
+        records (np.ndarray): decoded trace with dtype DECODED_DTYPE
+        chunk_size (int): number of entries turned into python objects at a time
+
+    Yields:
+        list: [cache.id, command, address, tag, index]
+    """
+    for start in range(0, len(records), chunk_size):
+        chunk = records[start:start + chunk_size]
+        columns = (chunk['uid'].tolist(), chunk['command'].tolist(), chunk['address'].tolist(),
+            chunk['tag'].tolist(), chunk['index'].tolist())
+        for uid, command, address, tag, index in zip(*columns):
+            yield [uid, COMMANDS[command], address, tag, index]
+
+def hash_file(file_path):
+    """Hashes the content of a file
+
+    Args:
+        file_path (string): path to the file
+
+    Returns:
+        string: The hex digest of the content
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for data in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(data)
+    return digest.hexdigest()
@@ -1,13 +1,57 @@
-def parse(file):
-    """Parses the text file 
+import gzip
+import lzma
+import bz2
+import os
+
+# compressed traces are decompressed while they are read
+COMPRESSED_OPENERS = {'.gz': gzip.open, '.xz': lzma.open, '.bz2': bz2.open}
+
+# commands in the order of their opcode in the binary trace
+COMMANDS = ['R', 'W', 'p', 'h', 'v']
+COMMAND_CODES = {command: code for code, command in enumerate(COMMANDS)}
+
+def parse(file, stream=False):
+    """Parses the text file
 
     Args:
-        file ([type]): [description]
+        file (string): path to the trace file
+        stream (bool): If True a generator is returned which decodes the entries
+            lazily, so the whole trace is never held in memory
+
+    Returns:
+        list(list) or generator: The entries [cache.id, command, address]
     """
+    if (stream):
+        return stream_lines(stream_text(file))
     lines = read_text(file)
     lines = modify_lines(lines)
     return lines
 
+def parse_line(line):
+    """Decodes a single stripped line of the trace into
+        [cache.id, command as a method, address]
+
+    Args:
+        line (string): the line of the trace
+
+    Returns:
+        list: [cache.id, command, address], -1 is used for the id and address
+            of the (p, v, h) commands
+    """
+    words = line.split(' ')
+
+    if (len(words) == 3):
+        # expect a proper command to be given
+        uid = int(words[0][1:])    # get the number of p1 or p12
+        method = words[1]
+        if (method != 'R' and method != 'W'):
+            raise Exception('Unknown trace command {}, expected (R, W)'.format(method))
+        address = int(words[2])
+        return [uid, method, address]
+    if (words[0] != 'p' and words[0] != 'h' and words[0] != 'v'):
+        raise Exception('Unknown trace file input {}, expected (p, v, h)'.format(words[0]))
+    return [-1, words[0], -1]
+
 def modify_lines(lines):
     """Modifies the lines so:
         [cache.id, command as a method, address]
@@ -17,27 +61,84 @@ def modify_lines(lines):
     """
     parsed_lines = []
     for line in lines:
-        words = line.split(' ')
-
-        if (len(words) == 3):
-            # expect a proper command to be given
-            uid = int(words[0][1])    # get the last char of p1
-            method = words[1]
-            address = int(words[2])
-            line = [uid, method, address]    
-        else:
-            if (words[0] != 'p' and words[0] != 'h' and words[0] != 'v'):
-                raise Exception('Unknown trace file input {}, expected (p, v, h)'.format(words[0]))
-            line = [-1, words[0], -1]
-        parsed_lines.append(line)
+        parsed_lines.append(parse_line(line))
     return parsed_lines
 
+def stream_lines(lines):
+    """Lazily modifies the lines so each one is yielded as:
+        [cache.id, command as a method, address]
+
+    Args:
+        lines (iterable(string)): each line in the text
+
+    Yields:
+        list: [cache.id, command, address]
+    """
+    for line in lines:
+        yield parse_line(line)
+
 def read_text(file_path):
     """Reads the file into a list
 
     Args:
         file (string): path to the file to read
     """
-    with open(file_path, 'r') as f:
+    with open_trace(file_path, 'r') as f:
         lines = [line.strip() for line in f]
-    return lines
\ No newline at end of file
+    return lines
+
+def stream_text(file_path):
+    """Reads the file one line at a time
+
+    Args:
+        file_path (string): path to the file to read
+
+    Yields:
+        string: each stripped line of the file
+    """
+    with open_trace(file_path, 'r') as f:
+        for line in f:
+            yield line.strip()
+
+def open_trace(file_path, mode='r'):
+    """Opens a trace file, traces ending in .gz, .xz or .bz2 are
+        decompressed as they are read
+
+    Args:
+        file_path (string): path to the trace
+        mode (string): 'r' to read text or 'rb' to read bytes
+
+    Returns:
+        file: The opened trace
+    """
+    extension = os.path.splitext(file_path)[1]
+    if (extension in COMPRESSED_OPENERS):
+        # the compressed openers read bytes unless text is asked for
+        if ('b' not in mode):
+            mode += 't'
+        return COMPRESSED_OPENERS[extension](file_path, mode)
+    return open(file_path, mode)
+
+def is_compressed(file_path):
+    """Checks if the trace is decompressed as it is read
+
+    Args:
+        file_path (string): path to the trace
+
+    Returns:
+        bool: True if the trace is compressed
+    """
+    return os.path.splitext(file_path)[1] in COMPRESSED_OPENERS
+
+def strip_compression(file_path):
+    """Removes the compression extension from the path of a trace
+
+    Args:
+        file_path (string): path to the trace
+
+    Returns:
+        string: The path without the compression extension
+    """
+    if (is_compressed(file_path)):
+        return os.path.splitext(file_path)[0]
+    return file_path
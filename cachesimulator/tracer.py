@@ -0,0 +1,229 @@
+import logging
+
+logger = logging.getLogger('cachesimulator.Logger')
+
+# methods of a cache traced as events, the access sets the cache and address of the
+# events that follow, the remote operations are between the cache and the requester
+ACCESS_EVENTS = ['read', 'write']
+# remote operation -> position of the address and of the requesting cache in its arguments
+REMOTE_EVENTS = {
+    'remote_read_miss': (0, None),
+    'send_line': (1, 0),
+    'alert_last_sharer': (0, 1),
+    'invalidate_line': (0, 1),
+}
+# methods of a directory traced as events, called with the requesting cache and address
+DIRECTORY_EVENTS = ['read_miss', 'write_miss']
+# methods of a statistic traced as events
+STATISTIC_EVENTS = [
+    'cache_probe', 'cache_access', 'sram_access', 'directory_access', 'processor_hop',
+    'directory_request', 'memory_access', 'compulsory_miss', 'conflic_miss', 'capacity_miss',
+    'coherence_miss', 'write_miss_no_sharers', 'write_miss_data_needed', 'private_access',
+    'remote_access', 'off_chip_access', 'replacement_writeback', 'coherence_writeback',
+    'invalidation_sent', 'directory_eviction',
+]
+
+
+class Tracer:
+    """Sends the events of a simulation to sinks, a sink is called as
+        sink(event, cache_id, other_id, address, cost). While disabled nothing is
+        hooked, so the simulation runs exactly as without a tracer. Enabling it binds
+        a hook over each traced method of the caches, directory and statistic.
+        An event takes its place when its method is called and gets the clock cycles
+        of the actions done by it when it returns, so a read or write costs the
+        latency of the instruction. The events are sent once the outermost traced
+        method returns, in the order they were called, so every event comes before
+        the events it caused.
+    """
+
+    def __init__(self, sinks=None, events=None):
+        """
+        Args:
+            sinks (list(callable)): Where the events are sent, more can be added later
+            events (list(string)): The events to trace, every event if not given
+        """
+        self.sinks = [] if (sinks is None) else list(sinks)
+        self.events = events
+        self.enabled = False
+        self._caches = []
+        # cache and address of the access being simulated
+        self._cache_id = None
+        self._address = None
+        # events of the traced methods being run and of those they called, in call order
+        self._pending = []
+        self._depth = 0
+
+    def add_sink(self, sink):
+        self.sinks.append(sink)
+
+    def toggle_sink(self, sink):
+        """Adds the sink or removes it if it was added, the tracer is enabled while
+            it has sinks
+
+        Args:
+            sink (callable): The sink
+
+        Returns:
+            bool: True if the sink was added
+        """
+        added = sink not in self.sinks
+        if (added):
+            self.sinks.append(sink)
+            self.enable()
+        else:
+            self.sinks.remove(sink)
+            if (len(self.sinks) == 0):
+                self.disable()
+        return added
+
+    def attach(self, caches):
+        """Traces the system of the caches when enabled
+
+        Args:
+            caches (list(Cache)): The caches of the system, they share a directory
+        """
+        enabled = self.enabled
+        self.disable()
+        self._caches = caches
+        if (enabled):
+            self.enable()
+
+    def emit(self, event, cache_id=None, other_id=None, address=None, cost=0):
+        """Sends an event to every sink
+
+        Args:
+            event (string): name of the event, the name of the traced method
+            cache_id (int): cache doing or asking for the action
+            other_id (int): other cache of a remote operation
+            address (int): Address of the word
+            cost (int): clock cycles of the action
+        """
+        for sink in self.sinks:
+            sink(event, cache_id, other_id, address, cost)
+
+    def _begin(self, event, cache_id, other_id, address):
+        # the event takes its place in the trace before the events it causes
+        record = [event, cache_id, other_id, address, 0]
+        self._pending.append(record)
+        self._depth += 1
+        return record
+
+    def _end(self, record, cost):
+        record[4] = cost
+        self._depth -= 1
+        if (self._depth == 0):
+            pending = self._pending
+            self._pending = []
+            for event in pending:
+                self.emit(*event)
+
+    def enable(self):
+        if (self.enabled):
+            return
+        self.enabled = True
+        for cache in self._caches:
+            for name in ACCESS_EVENTS:
+                # the accesses are always hooked as they set the cache and address of the other events
+                setattr(cache, name, self._access_hook(cache, name, getattr(cache, name)))
+            for name, positions in REMOTE_EVENTS.items():
+                self._hook(cache, name, self._remote_hook, *positions)
+        if (len(self._caches) != 0):
+            for name in DIRECTORY_EVENTS:
+                self._hook(self._caches[0].directory, name, self._directory_hook)
+            statistic = self._caches[0].statistic
+            for name in STATISTIC_EVENTS:
+                self._hook(statistic, name, self._statistic_hook)
+
+    def disable(self):
+        if (not self.enabled):
+            return
+        self.enabled = False
+        for cache in self._caches:
+            for name in ACCESS_EVENTS + list(REMOTE_EVENTS):
+                vars(cache).pop(name, None)
+        if (len(self._caches) != 0):
+            for name in DIRECTORY_EVENTS:
+                vars(self._caches[0].directory).pop(name, None)
+            for name in STATISTIC_EVENTS:
+                vars(self._caches[0].statistic).pop(name, None)
+
+    def toggle(self):
+        if (self.enabled):
+            self.disable()
+        else:
+            self.enable()
+
+    def _hook(self, target, name, hook, *arguments):
+        # the hook is an instance attribute over the method, removed again by disable
+        method = getattr(target, name, None)
+        if (method is not None and (self.events is None or name in self.events)):
+            setattr(target, name, hook(target, name, method, *arguments))
+
+    def _access_hook(self, cache, name, method):
+        statistic = cache.statistic
+        if (self.events is not None and name not in self.events):
+            def context(address, *parameters):
+                self._cache_id = cache.id
+                self._address = address
+                return method(address, *parameters)
+            return context
+        def traced(address, *parameters):
+            self._cache_id = cache.id
+            self._address = address
+            record = self._begin(name, cache.id, None, address)
+            try:
+                return method(address, *parameters)
+            finally:
+                # ended even when the method raises, so the pending events stay balanced
+                self._end(record, statistic.compute_current_latency())
+        return traced
+
+    def _remote_hook(self, cache, name, method, address_position, requester_position):
+        statistic = cache.statistic
+        def traced(*arguments):
+            # a remote read miss is for the cache of the access being simulated
+            if (requester_position is None):
+                requester_id = self._cache_id
+            else:
+                requester_id = arguments[requester_position].id
+            record = self._begin(name, requester_id, cache.id, arguments[address_position])
+            start = statistic.compute_current_latency()
+            try:
+                return method(*arguments)
+            finally:
+                self._end(record, statistic.compute_current_latency() - start)
+        return traced
+
+    def _directory_hook(self, directory, name, method):
+        statistic = directory.statistic
+        def traced(cache, address, *arguments):
+            record = self._begin(name, cache.id, None, address)
+            start = statistic.compute_current_latency()
+            try:
+                return method(cache, address, *arguments)
+            finally:
+                self._end(record, statistic.compute_current_latency() - start)
+        return traced
+
+    def _statistic_hook(self, statistic, name, method):
+        def traced(*arguments):
+            record = self._begin(name, self._cache_id, None, self._address)
+            start = statistic.compute_current_latency()
+            try:
+                return method(*arguments)
+            finally:
+                self._end(record, statistic.compute_current_latency() - start)
+        return traced
+
+
+class LoggingSink:
+    """Logs every event of a tracer"""
+
+    def __init__(self, level=logging.INFO):
+        self.level = level
+
+    def __call__(self, event, cache_id, other_id, address, cost):
+        if (other_id is None):
+            logger.log(self.level, '%s: cache %s, address %s, cost %s', event, cache_id, address, cost)
+        else:
+            logger.log(self.level, '%s: cache %s with cache %s, address %s, cost %s', event, cache_id, other_id, address, cost)
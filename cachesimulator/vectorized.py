@@ -0,0 +1,229 @@
+from cachesimulator import MSI
+from cachesimulator.config import SimulatorConfig
+from cachesimulator.statistics import Statistic, HISTOGRAM_BUCKETS, PRIVATE, REMOTE, OFF_CHIP
+from cachesimulator.sweep import load_trace
+from cachesimulator.trace_parser import COMMAND_CODES
+from array import array
+import numpy as np
+import logging
+
+logger = logging.getLogger('cachesimulator.Logger')
+
+# counters of every access, the latency counters give the latency of the access
+LATENCY_COUNTERS = {
+    'CACHE_PROBES': 'CACHE_PROBE',
+    'CACHE_ACCESSES': 'CACHE_ACCESS',
+    'SRAM_ACCESSES': 'SRAM_ACCESS',
+    'DIRECTORY_ACCESSES': 'DIRECTORY_ACCESS',
+    'PROCESSOR_HOPS': 'PROCESSOR_HOP',
+    'MEMORY_ACCESSES': 'MEMORY_ACCESS',
+    'DIRECTORY_HOPS': 'DIRECTORY_HOP',
+}
+COUNTERS = list(LATENCY_COUNTERS) + [
+    'COMPULSORY_MISSES', 'CONFLICT_MISSES', 'COHERENCE_MISSES', 'REPLACEMENT_WRITEBACKS',
+    'COHERENCE_WRITEBACKS', 'INVALIDATIONS_SENT', 'WRITE_MISS_BUT_DATA_NEEDED',
+    'WRITE_MISS_BUT_NO_DATA_NEEDED_AND_NO_SHARERS', 'THREE_HOPS', 'TWO_HOPS', 'ONE_HOPS',
+]
+
+
+class VectorizedEngine:
+    """Simulates the direct mapped caches and the Directory with numpy arrays of the
+        tag, state and validity of every line. The sets of a cache only interact with
+        the same set of the other caches, so the k-th access of every set is simulated
+        at once as one step. The statistics are identical to the Cache and Directory.
+    """
+
+    def __init__(self, config=None, optimize=False, latency=None):
+        """
+        Args:
+            config (SimulatorConfig): Geometry of the system, the defaults if not given
+            optimize (bool): Use MESI rather than MSI
+            latency (Latency): Clock cycles of each action, the defaults if not given
+        """
+        self.config = SimulatorConfig() if (config is None) else config
+        self.optimize = optimize
+        self.latency = latency
+        caches = self.config.number_of_caches
+        sets = self.config.cache_size
+        self.tags = np.full((caches, sets), -1, dtype=np.int64)
+        self.states = np.full((caches, sets), MSI.INVALID, dtype=np.int8)
+        self.valid = np.zeros((caches, sets), dtype=bool)
+        self._ids = np.arange(caches)[:, None]
+        # ring distance from the cache of each column to the cache of each row
+        distances = (np.arange(caches)[:, None] - np.arange(caches)[None, :]) % caches
+        self._distances = distances if (optimize) else distances.T
+
+    def run(self, columns):
+        """Simulates the accesses of the trace, (p, v, h) are dropped
+
+        Args:
+            columns (tuple(np.ndarray)): uids, commands and addresses of the trace
+
+        Returns:
+            Statistic: The statistics of the simulation
+        """
+        uids, commands, addresses = columns
+        selected = np.flatnonzero((commands == COMMAND_CODES['R']) | (commands == COMMAND_CODES['W']))
+        caches = uids[selected].astype(np.intp)
+        writes = commands[selected] == COMMAND_CODES['W']
+        addresses = addresses[selected].astype(np.int64)
+        tags = addresses >> (self.config.offset_bits + self.config.index_bits)
+        indexes = (addresses >> self.config.offset_bits) & (self.config.cache_size - 1)
+
+        # accesses of every set in trace order
+        order = np.argsort(indexes, kind='stable')
+        counts = np.bincount(indexes, minlength=self.config.cache_size)
+        starts = np.cumsum(counts) - counts
+        # busiest sets first, so the sets with a k-th access are the first ones
+        busiest = np.argsort(-counts, kind='stable')
+        remaining = -counts[busiest]
+
+        self._counts = {name: np.zeros(len(selected), dtype=np.int64) for name in COUNTERS}
+        # type of access of every instruction
+        self._types = np.zeros(len(selected), dtype=np.int8)
+        steps = counts.max() if (len(selected) != 0) else 0
+        for k in range(steps):
+            active = busiest[:np.searchsorted(remaining, -k)]
+            positions = order[starts[active] + k]
+            self._step(positions, caches[positions], tags[positions], writes[positions], active)
+        return self._statistic(len(selected))
+
+    def _step(self, positions, caches, tags, writes, sets):
+        """Simulates one access of each set
+
+        Args:
+            positions (np.ndarray): position of each access in the trace
+            caches (np.ndarray): cache issuing each access
+            tags (np.ndarray): tag of each address
+            writes (np.ndarray): True for writes, False for reads
+            sets (np.ndarray): set of each access, all different
+        """
+        columns = np.arange(len(sets))
+        line_tags = self.tags[:, sets]
+        states = self.states[:, sets]
+        valid = self.valid[:, sets]
+        own_tags = line_tags[caches, columns]
+        own_states = states[caches, columns]
+        own_valid = valid[caches, columns]
+        reads = ~writes
+
+        # the line of the issuing cache, as in Cache.read and Cache.write
+        match = (own_tags == tags) & own_valid
+        tag_miss = ~match
+        write_hit = (own_states == MSI.MODIFIED) | (self.optimize & (own_states == MSI.EXCLUSIVE))
+        hit = match & np.where(writes, write_hit, own_states != MSI.INVALID)
+        miss = ~hit
+        upgrade = writes & match & (own_states == MSI.SHARED)
+        need_data = miss & ~upgrade
+
+        # the other caches holding the address, as in Directory._get_sharers
+        present = valid & (states != MSI.INVALID) & (self._ids != caches)
+        sharers = present & (line_tags == tags)
+        sharer_count = sharers.sum(axis=0)
+        shared = miss & (sharer_count != 0)
+        furthest = np.where(sharers, self._distances[:, caches], 0).max(axis=0)
+        modified_sharers = (sharers & (states == MSI.MODIFIED)).sum(axis=0)
+
+        counts = {
+            'CACHE_PROBES': 1 + miss + shared,
+            'CACHE_ACCESSES': 1 + (reads & shared) + (writes & shared & need_data & (sharer_count == 1)),
+            'SRAM_ACCESSES': 0,
+            'DIRECTORY_ACCESSES': miss,
+            'PROCESSOR_HOPS': np.where(shared, furthest, 0),
+            'MEMORY_ACCESSES': need_data & ~shared,
+            'DIRECTORY_HOPS': 2 * miss,
+            'COMPULSORY_MISSES': tag_miss & ~own_valid,
+            'CONFLICT_MISSES': reads & tag_miss & own_valid,
+            'COHERENCE_MISSES': match & (own_states == MSI.INVALID),
+            'REPLACEMENT_WRITEBACKS': tag_miss & (own_states == MSI.MODIFIED),
+            'COHERENCE_WRITEBACKS': np.where(reads & miss, modified_sharers, 0),
+            'INVALIDATIONS_SENT': np.where(writes & shared, sharer_count, 0),
+            'WRITE_MISS_BUT_DATA_NEEDED': writes & need_data,
+            'WRITE_MISS_BUT_NO_DATA_NEEDED_AND_NO_SHARERS': upgrade & ~shared,
+            'THREE_HOPS': shared & (furthest == 3),
+            'TWO_HOPS': shared & (furthest == 2),
+            'ONE_HOPS': shared & (furthest != 3) & (furthest != 2),
+        }
+        for name, value in counts.items():
+            self._counts[name][positions] = value
+        self._types[positions] = np.where(hit, PRIVATE, np.where(need_data & ~shared, OFF_CHIP, REMOTE))
+
+        if (self.optimize):
+            # the only other cache holding the replaced line becomes exclusive, it never
+            # holds the new address so it is not one of the sharers
+            last_sharers = present & (line_tags == own_tags) & (tag_miss & own_valid)
+            alerted = np.flatnonzero(last_sharers.sum(axis=0) == 1)
+            states[last_sharers[:, alerted].argmax(axis=0), alerted] = MSI.EXCLUSIVE
+        # remote read misses share the line, write misses invalidate it
+        states[sharers & (reads & miss)] = MSI.SHARED
+        states[sharers & (writes & miss)] = MSI.INVALID
+
+        # the issuing cache gets the line, read hits leave it as it is
+        filled = np.flatnonzero(miss | writes)
+        exclusive = self.optimize & (sharer_count == 0)
+        fill_states = np.where(writes, MSI.MODIFIED, np.where(exclusive, MSI.EXCLUSIVE, MSI.SHARED))
+        line_tags[caches[filled], filled] = tags[filled]
+        states[caches[filled], filled] = fill_states[filled]
+        valid[caches[filled], filled] = True
+
+        self.tags[:, sets] = line_tags
+        self.states[:, sets] = states
+        self.valid[:, sets] = valid
+
+    def _statistic(self, instructions):
+        """Gets the statistics of the simulated accesses
+
+        Returns:
+            Statistic: The statistics at the end of the last instruction
+        """
+        statistic = Statistic(self.latency)
+        statistic.INSTRUCTIONS = instructions
+        latencies = np.zeros(instructions, dtype=np.int64)
+        for name, latency in LATENCY_COUNTERS.items():
+            latencies += self._counts[name] * getattr(statistic.latency, latency)
+        for name in COUNTERS:
+            setattr(statistic, name, int(self._counts[name].sum()))
+
+        (statistic.PRIV_INSTRUCTIONS, statistic.PRIV_LATENCY, statistic.PRIV_HISTOGRAM,
+            statistic.PRIV_MAX_LATENCY) = _summarise(latencies[self._types == PRIVATE])
+        (statistic.REM_INSTRUCTIONS, statistic.REM_LATENCY, statistic.REM_HISTOGRAM,
+            statistic.REM_MAX_LATENCY) = _summarise(latencies[self._types == REMOTE])
+        (statistic.OFF_CHIP_INSTRUCTIONS, statistic.OFF_CHIP_LATENCY, statistic.OFF_CHIP_HISTOGRAM,
+            statistic.OFF_CHIP_MAX_LATENCY) = _summarise(latencies[self._types == OFF_CHIP])
+        statistic.PRIVATE_ACCESSES = statistic.PRIV_INSTRUCTIONS
+        statistic.REMOTE_ACCESSES = statistic.REM_INSTRUCTIONS
+        statistic.OFF_CHIP_ACCESS = statistic.OFF_CHIP_INSTRUCTIONS
+        return statistic
+
+
+def _summarise(latencies):
+    """Gets the instructions, summed latency, latency histogram and longest latency
+        of the accesses of one type, as Statistic.end_instruction keeps them
+    """
+    histogram = np.bincount(np.minimum(latencies, HISTOGRAM_BUCKETS), minlength=HISTOGRAM_BUCKETS + 1)
+    return len(latencies), int(latencies.sum()), array('Q', histogram.tolist()), int(latencies.max(initial=0))
+
+
+def run_vectorized(columns, optimize=False, config=None, latency=None):
+    """Simulates decoded trace columns with the VectorizedEngine
+
+    Returns:
+        Statistic: The statistics of the simulation
+    """
+    return VectorizedEngine(config, optimize, latency).run(columns)
+
+
+def simulate_vectorized(trace_file, optimize=False, config=None, latency=None):
+    """Simulates the trace with the VectorizedEngine, the statistics are identical to
+        simulate with the Cache and Directory. The (p, v, h) commands are dropped.
+
+    Args:
+        trace_file (string): Path to a text, compressed or binary trace, or a trace in memory
+        optimize (bool): Use MESI rather than MSI
+        config (SimulatorConfig): Geometry of the system, the defaults if not given
+        latency (Latency): Clock cycles of each action, the defaults if not given
+
+    Returns:
+        Statistic: The statistics of the simulation
+    """
+    return run_vectorized(load_trace(trace_file), optimize, config, latency)
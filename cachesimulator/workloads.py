@@ -0,0 +1,163 @@
+from cachesimulator.binary_trace import TRACE_DTYPE, CHUNK_SIZE, concatenate_columns
+from cachesimulator.trace_parser import COMMANDS, COMMAND_CODES
+from cachesimulator.config import SimulatorConfig
+import numpy as np
+import logging
+
+logger = logging.getLogger('cachesimulator.Logger')
+
+READ = COMMAND_CODES['R']
+WRITE = COMMAND_CODES['W']
+
+
+def _commands(rng, length, write_ratio):
+    return np.where(rng.random(length) < write_ratio, WRITE, READ).astype(np.int8)
+
+
+def streaming(positions, config, rng, write_ratio=0.25, region_lines=1 << 20):
+    """Every processor in turn walks through its own region one word after the other,
+        so lines are only reused within a line and never shared
+    """
+    number_of_caches = config.number_of_caches
+    uids = positions % number_of_caches
+    addresses = uids * (region_lines * config.line_size) + (positions // number_of_caches) % (region_lines * config.line_size)
+    return uids, _commands(rng, len(positions), write_ratio), addresses
+
+
+def uniform(positions, config, rng, write_ratio=0.3, footprint=4):
+    """Random processors access random words of a footprint a number of times
+        larger than all the caches together
+    """
+    words = footprint * config.number_of_caches * config.cache_size * config.line_size
+    uids = rng.integers(config.number_of_caches, size=len(positions))
+    addresses = rng.integers(words, size=len(positions))
+    return uids, _commands(rng, len(positions), write_ratio), addresses
+
+
+def hot_set(positions, config, rng, write_ratio=0.3, hot_lines=None, hot_ratio=0.9, footprint=4):
+    """Most accesses go to a small set of lines shared by every processor, the rest
+        are uniform over a large footprint
+    """
+    if (hot_lines is None):
+        hot_lines = config.cache_size // 4
+    uids, commands, addresses = uniform(positions, config, rng, write_ratio, footprint)
+    hot = rng.random(len(positions)) < hot_ratio
+    addresses[hot] = rng.integers(hot_lines * config.line_size, size=np.count_nonzero(hot))
+    return uids, commands, addresses
+
+
+def producer_consumer(positions, config, rng, buffer_lines=64):
+    """P0 writes a buffer one line after the other and every other processor reads
+        each line after it is written, so each line moves from the writer to the readers
+    """
+    number_of_caches = config.number_of_caches
+    uids = positions % number_of_caches
+    commands = np.where(uids == 0, WRITE, READ).astype(np.int8)
+    lines = (positions // number_of_caches) % buffer_lines
+    return uids, commands, lines * config.line_size
+
+
+def migratory(positions, config, rng, objects=16, burst=4):
+    """Each object is read then written by one processor at a time for a burst of
+        accesses before it moves on to the next processor
+    """
+    number_of_caches = config.number_of_caches
+    turns = positions // burst
+    uids = turns % number_of_caches
+    commands = np.where(positions % 2 == 0, READ, WRITE).astype(np.int8)
+    addresses = ((turns // number_of_caches) % objects) * config.line_size
+    return uids, commands, addresses
+
+
+def false_sharing(positions, config, rng, write_ratio=0.5, lines=8):
+    """Every processor accesses only its own word of a few lines, so the lines are
+        shared although the words never are
+    """
+    uids = rng.integers(config.number_of_caches, size=len(positions))
+    words = uids % config.line_size
+    addresses = rng.integers(lines, size=len(positions)) * config.line_size + words
+    return uids, _commands(rng, len(positions), write_ratio), addresses
+
+
+# name -> function(positions, config, rng, **parameters) -> (uids, commands, addresses)
+WORKLOADS = {
+    'streaming': streaming,
+    'uniform': uniform,
+    'hot_set': hot_set,
+    'producer_consumer': producer_consumer,
+    'migratory': migratory,
+    'false_sharing': false_sharing,
+}
+
+
+def stream_workload(name, accesses, config=None, seed=0, chunk_size=CHUNK_SIZE, **parameters):
+    """Generates the accesses of a synthetic workload a chunk at a time, so a
+        workload of any length is never held in memory
+
+    Args:
+        name (string): the workload, one of WORKLOADS
+        accesses (int): number of accesses
+        config (SimulatorConfig): Geometry of the system, the defaults if not given
+        seed (int): seed of the random accesses, the same seed gives the same workload
+        chunk_size (int): number of accesses generated at a time
+        parameters: parameters of the workload function
+
+    Yields:
+        tuple(np.ndarray): uids, commands and addresses of each chunk
+    """
+    if (name not in WORKLOADS):
+        raise Exception('Unknown workload {}, expected one of ({})'.format(name, ', '.join(WORKLOADS)))
+    if (config is None):
+        config = SimulatorConfig()
+    workload = WORKLOADS[name]
+    rng = np.random.default_rng(seed)
+    for start in range(0, accesses, chunk_size):
+        positions = np.arange(start, min(start + chunk_size, accesses), dtype=np.int64)
+        uids, commands, addresses = workload(positions, config, rng, **parameters)
+        yield (uids.astype(TRACE_DTYPE['uid']), commands.astype(TRACE_DTYPE['command']),
+               addresses.astype(TRACE_DTYPE['address']))
+
+
+def generate_workload(name, accesses, config=None, seed=0, **parameters):
+    """Generates the accesses of a synthetic workload into column arrays
+
+    Returns:
+        tuple(np.ndarray): uids, commands and addresses, see stream_workload
+    """
+    return concatenate_columns(list(stream_workload(name, accesses, config, seed, **parameters)))
+
+
+def write_text(chunks, file_path):
+    """Writes column chunks as a text trace
+
+    Args:
+        chunks (iterable(tuple(np.ndarray))): uids, commands and addresses
+        file_path (string): path of the trace, overwritten
+    """
+    with open(file_path, 'w') as f:
+        for uids, commands, addresses in chunks:
+            f.writelines([f"P{uid} {COMMANDS[command]} {address}\n"
+                          for uid, command, address in zip(uids.tolist(), commands.tolist(), addresses.tolist())])
+    return file_path
+
+
+def write_binary(chunks, file_path, length):
+    """Writes column chunks as a binary trace
+
+    Args:
+        chunks (iterable(tuple(np.ndarray))): uids, commands and addresses
+        file_path (string): path of the trace, overwritten
+        length (int): number of entries of the chunks together
+    """
+    records = np.lib.format.open_memmap(file_path, mode='w+', dtype=TRACE_DTYPE, shape=(length,))
+    position = 0
+    for uids, commands, addresses in chunks:
+        end = position + len(uids)
+        chunk = records[position:end]
+        chunk['uid'] = uids
+        chunk['command'] = commands
+        chunk['address'] = addresses
+        position = end
+    records.flush()
+    del records
+    return file_path
@@ -1,78 +1,155 @@
-from cachesimulator.trace_parser import parse
-from cachesimulator.config import NUMBER_OF_CACHES
+from cachesimulator.simulator import create_system, read_trace, run_trace
+from cachesimulator.sharded import simulate_sharded
+from cachesimulator.vectorized import simulate_vectorized
+from cachesimulator.sweep import load_trace
+from cachesimulator.binary_trace import stream_columns, stream_chunks, is_columns, is_path
+from cachesimulator.event_log import EventLog
+from cachesimulator.profiler import Profiler
+from cachesimulator.trace_cache import TraceCache, stream_decoded
 from cachesimulator.directory import Directory
 from cachesimulator.cache import Cache
-from cachesimulator.statistics import Statistic, save_statistics
-from cachesimulator.optimizer import Optimizer
+from cachesimulator.statistics import save_statistics
+from cachesimulator.workloads import stream_workload
 from data.trace_files import trace1, trace2, test_trace
 import sys
+import os
 import logging
 
 logger = logging.getLogger('cachesimulator.Logger')
 logger.setLevel(logging.WARNING)
 
 
-def main(trace_file, optimize=False):
-    # get the parsed text
-    parsed_text = parse(trace_file)
-    # create the directory
-    directory = Directory()
-    # create the caches
-    caches = [Cache(x, directory=directory) for x in range(NUMBER_OF_CACHES)]
-    # append the caches to the directory
-    for c in caches:
-        directory.append_sharer(c)
+def main(trace_file, optimize=False, trace_cache=None, cache_class=Cache, directory_class=Directory, config=None, shards=None,
+         vectorized=False, event_log=None, profile=False, profile_stats=None, profile_memory=False):
+    # measure the phases of the run when profiling, a cProfile dump or a measure of the
+    # memory implies profiling
+    profiler = Profiler(enabled=(profile or profile_stats is not None or profile_memory), stats_path=profile_stats)
+    # a path may be a pathlib.Path, anything else is a trace in memory
+    if (is_path(trace_file)):
+        trace_file = os.fspath(trace_file)
+    # run the simulation, every run has its own statistics
+    if (vectorized):
+        # step every cache set at once with numpy, same statistics as Cache and Directory
+        if (cache_class is not Cache or directory_class is not Directory):
+            raise Exception('The vectorized engine only simulates direct mapped Cache with a full map Directory')
+        if (trace_cache is not None or event_log is not None):
+            raise Exception('A vectorized simulation can not use a trace cache or an event log')
+        with profiler.phase('simulation', profile=True):
+            statistic = simulate_vectorized(trace_file, optimize=optimize, config=config)
+    elif (shards is not None):
+        # split the cache sets into shards simulated in parallel, same statistics
+        if (trace_cache is not None or event_log is not None):
+            raise Exception('A sharded simulation can not use a trace cache or an event log')
+        with profiler.phase('simulation', profile=True):
+            statistic = simulate_sharded(trace_file, optimize=optimize, shards=shards, cache_class=cache_class,
+                                         directory_class=directory_class, config=config)
+    else:
+        # record every coherence message of the run in a binary log
+        log = EventLog(event_log) if (event_log is not None) else None
+        tracer = log.tracer() if (log is not None) else None
+        if (profiler.enabled):
+            statistic = profile_simulation(profiler, trace_file, optimize, trace_cache, cache_class, directory_class, config, tracer,
+                                           memory=profile_memory)
+        else:
+            directory, caches = create_system(config, optimize, cache_class, directory_class)
+            statistic = run_trace(read_trace(trace_file, trace_cache, caches), caches, tracer)
+        if (log is not None):
+            log.close()
+    with profiler.phase('output'):
+        print()
+        print(statistic.key_statistics())
+        # print(statistic.debug_statistics())
+        # save statistics to file, a trace in memory has no file to save them next to
+        if (is_path(trace_file)):
+            save_statistics(trace_file, statistic)
+    if (profiler.enabled):
+        print()
+        print(profiler.report(statistic.INSTRUCTIONS))
+    return statistic
 
-    # set the optimizer
-    Optimizer.OPTIMIZE = optimize
-    # run the main code
-    for entry in parsed_text:
-        cache_id, command, address = entry
-        cache = caches[cache_id]
 
-        # check the command
-        if (command == 'R'):
-            Statistic.add_instructions()
-            cache.read(address)
-            # logger.info(Statistic.debug_statistics())
+def decode_entries(trace_file, trace_cache, caches):
+    """Decodes the whole trace into arrays, so the parsing is measured on its own and
+        the trace can be replayed
 
-            Statistic.end_instruction()
-            # logger.info(Statistic.key_statistics())
-            # input()
-        elif(command == 'W'):
-            Statistic.add_instructions()
-            cache.write(address)
-            # logger.info(Statistic.debug_statistics())
+    Args:
+        trace_file (string): Path to the trace or a trace in memory, see read_trace
+        trace_cache (TraceCache): Decoded traces kept on disk, not used if None
+        caches (list(Cache)): The caches, needed for the geometry of a trace cache
 
-            Statistic.end_instruction()
-            # logger.info(Statistic.key_statistics())
-            # input()
-        # deal with other stuff
-        elif(command == 'v'):
-            # print('switch line by line reading')
-            if (logger.level != logging.INFO):
-                logger.setLevel(logging.INFO)
-            else:
-                logger.setLevel(logging.WARNING)
-        elif(command == 'h'):
-            print(f"Hit Rate: {Statistic.hit_rate()}")
-        elif(command == 'p'):
-            for c in caches:
-                contents = c.cache_contents()
-                print(f"Cache {c} contents:\n{contents}")
-    print()
-    print(Statistic.key_statistics())
-    # print(Statistic.debug_statistics())
-    # save statistics to file
-    save_statistics(trace_file)
+    Returns:
+        callable: Gets a new generator of the entries, None for chunks of a trace in
+            memory which can only be read once
+    """
+    if (not is_path(trace_file)):
+        # a trace in memory has nothing to parse
+        return (lambda: stream_chunks(trace_file)) if (is_columns(trace_file)) else None
+    if (trace_cache is not None):
+        records = trace_cache.load(trace_file, line_size=caches[0].config.line_size, cache_size=caches[0].sets)
+        return lambda: stream_decoded(records)
+    columns = load_trace(trace_file)
+    return lambda: stream_columns(*columns)
+
+
+def profile_simulation(profiler, trace_file, optimize, trace_cache, cache_class, directory_class, config, tracer, memory=False):
+    """Simulates the trace timing the construction, parse and simulation on their own
+
+    Args:
+        memory (bool): Also measure the peak memory of each phase. tracemalloc slows the
+            run down several times, so this re-runs the whole trace under it before the
+            timed run, which is not done for chunks of a trace in memory as they can
+            only be read once
+
+    Returns:
+        Statistic: The statistics of the timed run
+    """
+    if (memory and (is_path(trace_file) or is_columns(trace_file))):
+        with profiler.memory('construction'):
+            directory, caches = create_system(config, optimize, cache_class, directory_class)
+        with profiler.memory('parse'):
+            entries = decode_entries(trace_file, trace_cache, caches)
+        with profiler.memory('simulation'):
+            run_trace(entries(), caches)
+        profiler.stop()
+        del directory, caches, entries
+    with profiler.phase('construction'):
+        directory, caches = create_system(config, optimize, cache_class, directory_class)
+    with profiler.phase('parse'):
+        entries = decode_entries(trace_file, trace_cache, caches)
+    with profiler.phase('simulation', profile=True):
+        entries = entries() if (entries is not None) else read_trace(trace_file, trace_cache, caches)
+        return run_trace(entries, caches, tracer)
 
 
 if __name__ == '__main__':
 
-    args = sys.argv[1:]
-    # first arg should be trace file
+    # --profile reports the time of the phases of the run, --profile-stats=path also
+    # dumps a cProfile of the simulation and --profile-memory also reports their peak
+    # memory, measured by re-running the whole trace under tracemalloc first
+    options = [arg for arg in sys.argv[1:] if (arg.startswith('--'))]
+    args = [arg for arg in sys.argv[1:] if (not arg.startswith('--'))]
+    profile = '--profile' in options
+    profile_memory = '--profile-memory' in options
+    profile_stats = None
+    for option in options:
+        if (option.startswith('--profile-stats=')):
+            profile_stats = option[len('--profile-stats='):]
+    # first arg should be trace file, or workload:<name>:<accesses>[:<seed>] to simulate
+    # a generated workload without writing it to disk
     trace_file = args[0]
+    if (trace_file.startswith('workload:')):
+        name, accesses, *seed = trace_file.split(':')[1:]
+        trace_file = stream_workload(name, int(accesses), seed=int(seed[0]) if (len(seed) != 0) else 0)
     # global OPTIMIZE
     optimize = (( args[1]) == "True")
+    # third arg keeps the decoded trace on disk for the next run
+    trace_cache = TraceCache() if (len(args) > 2 and args[2] == "True") else None
+    # fourth arg simulates the trace in that many shards
+    shards = int(args[3]) if (len(args) > 3 and args[3] != "None") else None
+    # fifth arg simulates the trace with the vectorized engine
+    vectorized = (len(args) > 4 and args[4] == "True")
+    # sixth arg is the path of a binary log of the coherence messages
+    event_log = args[5] if (len(args) > 5 and args[5] != "None") else None
 
-    main(trace_file, optimize=optimize)
+    main(trace_file, optimize=optimize, trace_cache=trace_cache, shards=shards, vectorized=vectorized, event_log=event_log,
+         profile=profile, profile_stats=profile_stats, profile_memory=profile_memory)
@@ -1,13 +1,25 @@
 #!/bin/bash
 optimise="False"
-while getopts :f:o flag
+trace_cache="False"
+shards="None"
+vectorized="False"
+event_log="None"
+profile=""
+while getopts :f:ocs:ve:pP:m flag
 do
     case "${flag}" in
         f) file=$OPTARG;;
         o) optimise="True";;
+        c) trace_cache="True";;
+        s) shards=$OPTARG;;
+        v) vectorized="True";;
+        e) event_log=$OPTARG;;
+        p) profile="$profile --profile";;
+        P) profile="$profile --profile-stats=$OPTARG";;
+        m) profile="$profile --profile-memory";;
     esac
 done
 # echo "file: $file"
 # echo "optimise: $optimise"
 
-python main.py $file $optimise
+python main.py $file $optimise $trace_cache $shards $vectorized $event_log $profile